@@ -1,9 +1,9 @@
 # app.py
-import pandas as pd
-import pickle
-import mlflow.sklearn
 from fastapi import FastAPI
 from pydantic import BaseModel
+from src.forest_scorer import compile_forest
+from src.preprocessing import FusedPreprocessor
+from src.model_cache import load_production
 
 # ── App setup ─────────────────────────────────────────────────
 app = FastAPI(
@@ -12,12 +12,12 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# ── Load scalers ──────────────────────────────────────────────
-std_scaler = pickle.load(open("models/standard_scaler.pkl", "rb"))
-mm_scaler  = pickle.load(open("models/minmax_scaler.pkl",  "rb"))
+# ── Load model + scalers (local cache first, MLflow only on a miss) ──
+model, std_scaler, mm_scaler, manifest = load_production()
+model = compile_forest(model) or model
 
-# ── Load model from MLflow ────────────────────────────────────
-model = mlflow.sklearn.load_model("models:/HeartDiseaseModel/1")
+# Scalers fused into one affine transform
+preprocessor = FusedPreprocessor(std_scaler, mm_scaler)
 
 # ── Input schema ──────────────────────────────────────────────
 class PatientData(BaseModel):
@@ -35,27 +35,20 @@ class PatientData(BaseModel):
 
 # ── Helper: preprocess input ──────────────────────────────────
 def preprocess_input(data: PatientData):
-    df = pd.DataFrame([{
-        "age":                data.age,
-        "sex":                data.sex,
-        "chest pain type":    data.chest_pain_type,
-        "resting bp s":       data.resting_bp_s,
-        "cholesterol":        data.cholesterol,
-        "fasting blood sugar":data.fasting_blood_sugar,
-        "resting ecg":        data.resting_ecg,
-        "max heart rate":     data.max_heart_rate,
-        "exercise angina":    data.exercise_angina,
-        "oldpeak":            data.oldpeak,
-        "ST slope":           data.st_slope
-    }])
-
-    # Apply same scaling as training
-    df[["resting bp s", "cholesterol", "max heart rate", "age"]] = \
-        std_scaler.transform(df[["resting bp s", "cholesterol", "max heart rate", "age"]])
-    
-    df[["oldpeak"]] = mm_scaler.transform(df[["oldpeak"]])
-
-    return df
+    # Same scaling as training, applied in place on a preallocated row
+    return preprocessor.row([
+        data.age,
+        data.sex,
+        data.chest_pain_type,
+        data.resting_bp_s,
+        data.cholesterol,
+        data.fasting_blood_sugar,
+        data.resting_ecg,
+        data.max_heart_rate,
+        data.exercise_angina,
+        data.oldpeak,
+        data.st_slope
+    ])
 
 # ── Routes ────────────────────────────────────────────────────
 @app.get("/")
@@ -71,10 +64,11 @@ def health():
 
 @app.post("/predict")
 def predict(patient: PatientData):
-    df = preprocess_input(patient)
-    
-    prediction  = model.predict(df)[0]
-    probability = model.predict_proba(df)[0][1]
+    X = preprocess_input(patient)
+
+    proba       = model.predict_proba(X)[0]
+    prediction  = model.classes_[proba.argmax()]
+    probability = proba[1]
 
     return {
         "prediction":  int(prediction),
@@ -4,38 +4,26 @@ st.set_page_config(page_title="Heart Disease ModelOps", page_icon="🫀", layout
 import pandas as pd
 import numpy as np
 import pickle
+import io
 import os
-import sys
-import subprocess
-import json
+import time
 from datetime import datetime
 import plotly.graph_objects as go
+from src.forest_scorer import compile_forest
+from src.preprocessing import FusedPreprocessor
+from src.model_cache import load_production
+from src.history_store import HistoryStore
+from src.inference_client import InferenceClient
+from src.job_runner import JobRunner
+from src.user_store import UserStore
+from src.pdf_reports import ReportRenderer, REPORT_FIELDS
+
+# One user index per server process; it rereads users.json only when the file changes
+@st.cache_resource
+def get_user_store():
+    return UserStore()
 
-USERS_FILE = "users.json"
-
-def load_users():
-    if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_users(users):
-    with open(USERS_FILE, "w") as f:
-        json.dump(users, f, indent=2)
-
-def check_password(username, password):
-    users = load_users()
-    if username not in users:
-        return False
-    return users[username]["password"] == password
-
-def register_user(username, name, password):
-    users = load_users()
-    if username in users:
-        return False, "Username already exists"
-    users[username] = {"name": name, "password": password}
-    save_users(users)
-    return True, "Account created successfully"
+users = get_user_store()
 
 if "logged_in" not in st.session_state:
     st.session_state["logged_in"] = False
@@ -71,11 +59,10 @@ if not st.session_state["logged_in"]:
                 u, p = login_user.strip(), login_pass.strip()
                 if not u or not p:
                     st.error("Please enter both fields")
-                elif check_password(u, p):
-                    users = load_users()
+                elif (user := users.authenticate(u, p)) is not None:
                     st.session_state["logged_in"] = True
                     st.session_state["username"] = u
-                    st.session_state["name"] = users[u]["name"]
+                    st.session_state["name"] = user["name"]
                     st.rerun()
                 else:
                     st.error("❌ Invalid username or password")
@@ -93,7 +80,7 @@ if not st.session_state["logged_in"]:
                 elif p != cp:
                     st.error("❌ Passwords do not match")
                 else:
-                    success, message = register_user(u, n, p)
+                    success, message = users.register(u, n, p)
                     st.success("✅ Account created! Go to Sign In.") if success else st.error(f"❌ {message}")
     st.stop()
 
@@ -146,27 +133,74 @@ div[data-testid="stTabs"] button { font-family:'Space Mono',monospace !important
 @st.cache_resource
 def load_artifacts():
     try:
-        import mlflow.sklearn
-        model = mlflow.sklearn.load_model("models:/HeartDiseaseModel/1")
-        std_scaler = pickle.load(open("models/standard_scaler.pkl","rb"))
-        mm_scaler  = pickle.load(open("models/minmax_scaler.pkl","rb"))
-        return model, std_scaler, mm_scaler, True
+        model, std_scaler, mm_scaler, _ = load_production()
+        model = compile_forest(model) or model
+        return model, FusedPreprocessor(std_scaler, mm_scaler), True
     except:
-        try:
-            import glob
-            pkl_files = glob.glob("mlruns/**/model.pkl", recursive=True)
-            if pkl_files:
-                model = pickle.load(open(pkl_files[0],"rb"))
-                std_scaler = pickle.load(open("models/standard_scaler.pkl","rb"))
-                mm_scaler  = pickle.load(open("models/minmax_scaler.pkl","rb"))
-                return model, std_scaler, mm_scaler, True
-        except:
-            pass
-    return None, None, None, False
-
-model, std_scaler, mm_scaler, model_loaded = load_artifacts()
+        pass
+    return None, None, False
+
+def score_locally(values):
+    model, preprocessor, loaded = load_artifacts()
+    if not loaded:
+        raise RuntimeError("Model not loaded")
+    proba = model.predict_proba(preprocessor.row(values))[0]
+    return int(model.classes_[proba.argmax()]), float(proba[list(model.classes_).index(1)])
+
+# With INFERENCE_URL set, predictions go to the shared API and this process only loads
+# a model if it has to fall back
+@st.cache_resource
+def get_inference_client():
+    return InferenceClient.from_env(fallback=score_locally)
+
+inference = get_inference_client()
+if inference is None:
+    model, preprocessor, model_loaded = load_artifacts()
+else:
+    model_loaded = True
+
+# One history store (and writer thread) per server process, shared by every session
+@st.cache_resource
+def get_history_store():
+    return HistoryStore()
+
+history = get_history_store()
+HISTORY_PAGE_ROWS = 1000   # rows shown in the records table; counts and charts cover everything
+
+# Drift and retrain jobs run in one warm worker process per server, shared by every session
+@st.cache_resource
+def get_job_runner():
+    return JobRunner()
+
+jobs = get_job_runner()
+
+# Report PDFs render in worker processes, and only when a download is requested
+@st.cache_resource
+def get_report_renderer():
+    return ReportRenderer()
+
+reports = get_report_renderer()
+
+# Set by show_job while a job is active; the page reruns once it has fully rendered
+poll_jobs = False
+
+def show_job(job_id):
+    """Progress bar and live log for a background job; keeps the page polling until it finishes"""
+    global poll_jobs
+    job = jobs.status(job_id) if job_id else None
+    if job is None:
+        return None, ""
+    output = jobs.log(job_id)
+    active = job["status"] in ("queued", "running")
+    label  = "Waiting for the job worker..." if job["status"] == "queued" else f"{job['status'].capitalize()} · {job['elapsed']:.0f}s"
+    st.progress(job["progress"], text=label)
+    if output:
+        st.markdown(f"<div class='log-box'>{output}</div>", unsafe_allow_html=True)
+    poll_jobs = poll_jobs or active
+    return job, output
+
 status_color = "#3FB950" if model_loaded else "#E63946"
-status_text  = "● LOADED" if model_loaded else "● NOT FOUND"
+status_text  = ("● REMOTE" if inference else "● LOADED") if model_loaded else "● NOT FOUND"
 
 # ── TOP NAV ───────────────────────────────────────────────────
 name = st.session_state.get("name", "")
@@ -309,19 +343,18 @@ elif page == "🔬 Predict":
                     <div style='opacity:0.7;margin-top:0.2rem;'>🪪 ID: {p_id}</div>
                 </div>""", unsafe_allow_html=True)
 
-                input_df = pd.DataFrame([{
-                    "age":age,"sex":sex,"chest pain type":chest_pain,
-                    "resting bp s":resting_bp,"cholesterol":cholesterol,
-                    "fasting blood sugar":fasting_bs,"resting ecg":resting_ecg,
-                    "max heart rate":max_hr,"exercise angina":exercise_angina,
-                    "oldpeak":oldpeak,"ST slope":st_slope
-                }])
-                input_df[["resting bp s","cholesterol","max heart rate","age"]] = \
-                    std_scaler.transform(input_df[["resting bp s","cholesterol","max heart rate","age"]])
-                input_df[["oldpeak"]] = mm_scaler.transform(input_df[["oldpeak"]])
-
-                pred  = model.predict(input_df)[0]
-                prob  = model.predict_proba(input_df)[0][1]
+                values = [
+                    age, sex, chest_pain, resting_bp, cholesterol, fasting_bs,
+                    resting_ecg, max_hr, exercise_angina, oldpeak, st_slope
+                ]
+                try:
+                    if inference is not None:
+                        pred, prob, _ = inference.predict(values)
+                    else:
+                        pred, prob = score_locally(values)
+                except Exception as e:
+                    st.error(f"Prediction failed: {e}")
+                    st.stop()
                 risk  = "High" if prob>0.7 else "Medium" if prob>0.4 else "Low"
                 rcolor = {"High":"#E63946","Medium":"#D29922","Low":"#3FB950"}[risk]
 
@@ -368,65 +401,9 @@ elif page == "🔬 Predict":
                     </div>
                 </div>""", unsafe_allow_html=True)
 
-                # ── PDF Report ────────────────────────────
-                try:
-                    from fpdf import FPDF
-                    pdf = FPDF()
-                    pdf.add_page()
-                    pdf.set_fill_color(230, 57, 70)
-                    pdf.rect(0, 0, 210, 25, 'F')
-                    pdf.set_font("Arial", "B", 16)
-                    pdf.set_text_color(255, 255, 255)
-                    pdf.cell(0, 15, "Heart Disease Prediction Report", ln=True, align="C")
-                    pdf.set_text_color(0, 0, 0)
-                    pdf.set_font("Arial", size=11)
-                    pdf.ln(8)
-                    pdf.set_font("Arial","B",11)
-                    pdf.cell(0,8,"PATIENT INFORMATION",ln=True)
-                    pdf.set_font("Arial",size=10)
-                    pdf.cell(0,7,f"Patient Name : {p_name}",ln=True)
-                    pdf.cell(0,7,f"Patient ID   : {p_id}",ln=True)
-                    pdf.cell(0,7,f"Age          : {age} years",ln=True)
-                    pdf.cell(0,7,f"Sex          : {'Male' if sex==1 else 'Female'}",ln=True)
-                    pdf.cell(0,7,f"Doctor       : {st.session_state.get('username','')}",ln=True)
-                    pdf.cell(0,7,f"Date         : {datetime.now().strftime('%Y-%m-%d %H:%M')}",ln=True)
-                    pdf.ln(5)
-                    pdf.set_font("Arial","B",11)
-                    pdf.cell(0,8,"CLINICAL VITALS",ln=True)
-                    pdf.set_font("Arial",size=10)
-                    pdf.cell(0,7,f"Cholesterol  : {cholesterol} mg/dl",ln=True)
-                    pdf.cell(0,7,f"Resting BP   : {resting_bp} mmHg",ln=True)
-                    pdf.cell(0,7,f"Max Heart Rate: {max_hr} bpm",ln=True)
-                    pdf.cell(0,7,f"Oldpeak      : {oldpeak}",ln=True)
-                    pdf.ln(5)
-                    pdf.set_font("Arial","B",12)
-                    result_text = "HEART DISEASE DETECTED" if pred==1 else "NO HEART DISEASE"
-                    pdf.set_fill_color(230,57,70) if pred==1 else pdf.set_fill_color(63,185,80)
-                    pdf.set_text_color(255,255,255)
-                    pdf.cell(0,12,f"RESULT: {result_text}",ln=True,fill=True,align="C")
-                    pdf.set_text_color(0,0,0)
-                    pdf.set_font("Arial",size=10)
-                    pdf.ln(3)
-                    pdf.cell(0,7,f"Probability  : {prob:.1%}",ln=True)
-                    pdf.cell(0,7,f"Risk Level   : {risk}",ln=True)
-                    pdf.ln(8)
-                    pdf.set_font("Arial","I",8)
-                    pdf.set_text_color(128,128,128)
-                    pdf.cell(0,6,"Generated by ModelOps Framework for Heart Disease Prediction",ln=True,align="C")
-                    pdf_bytes = bytes(pdf.output(dest="S").encode("latin-1"))
-                    st.download_button(
-                        label="📄 Download PDF Report",
-                        data=pdf_bytes,
-                        file_name=f"report_{p_id}_{datetime.now().strftime('%Y%m%d')}.pdf",
-                        mime="application/pdf"
-                    )
-                except Exception as e:
-                    st.warning(f"PDF generation failed: {e}")
-
                 # ── Save to history ───────────────────────
-                history_file = "prediction_history.csv"
-                new_record = pd.DataFrame([{
-                    "Date":         datetime.now().strftime("%Y-%m-%d %H:%M"),
+                record = {
+                    "Date":         datetime.now().replace(second=0, microsecond=0),
                     "Patient Name": p_name,
                     "Patient ID":   p_id,
                     "Doctor":       st.session_state.get("username","unknown"),
@@ -437,15 +414,14 @@ elif page == "🔬 Predict":
                     "Max HR":       max_hr,
                     "Chest Pain":   ["Typical","Atypical","Non-Anginal","Asymptomatic"][chest_pain],
                     "Result":       "Heart Disease" if pred==1 else "No Disease",
-                    "Probability":  f"{prob:.1%}",
+                    "Probability":  prob,
                     "Risk":         risk
-                }])
-                if os.path.exists(history_file):
-                    new_record.to_csv(history_file, mode='a', header=False, index=False)
-                else:
-                    new_record.to_csv(history_file, mode='w', header=True, index=False)
+                }
+                history.append(record)
                 st.success("✅ Saved to history")
-        else:
+                # The PDF is only rendered if someone asks for it
+                st.session_state["last_report"] = {**record, "Oldpeak": oldpeak}
+        elif "last_report" not in st.session_state:
             st.markdown("""
             <div style='border:1px dashed rgba(128,128,128,0.3);border-radius:10px;
                         padding:3rem 1rem;text-align:center;opacity:0.6;'>
@@ -454,6 +430,21 @@ elif page == "🔬 Predict":
                 and clinical vitals,<br>then click Analyze</div>
             </div>""", unsafe_allow_html=True)
 
+        report = st.session_state.get("last_report")
+        if report is not None:
+            if st.button("📄 Prepare PDF Report", key="pdf_btn"):
+                try:
+                    with st.spinner("Rendering report..."):
+                        pdf_bytes = reports.render(report).result(timeout=30)
+                    st.download_button(
+                        label=f"⬇️ Download PDF Report — {report['Patient Name']}",
+                        data=pdf_bytes,
+                        file_name=f"report_{report['Patient ID']}_{report['Date']:%Y%m%d}.pdf",
+                        mime="application/pdf"
+                    )
+                except Exception as e:
+                    st.warning(f"PDF generation failed: {e}")
+
 # ══════════════════════════════════════════════════════════════
 # PAGE 3: DRIFT DETECTION
 # ══════════════════════════════════════════════════════════════
@@ -464,17 +455,19 @@ elif page == "📊 Drift Detection":
         st.markdown("<p class='section-header'>Run Drift Detection</p>", unsafe_allow_html=True)
         st.markdown("<div style='border:1px solid rgba(128,128,128,0.2);border-radius:8px;padding:1.2rem;margin-bottom:1rem;font-size:0.85rem;line-height:1.7;background:rgba(128,128,128,0.03);'><b>How it works:</b><br>1. Compares reference vs current data<br>2. Evidently AI statistical tests per column<br>3. Flags drift if >20% columns show shift<br>4. Generates full visual HTML report</div>", unsafe_allow_html=True)
         if st.button("🔍 Run Drift Detection Now"):
-            with st.spinner("Running Evidently drift analysis..."):
-                try:
-                    result = subprocess.run([sys.executable,"src/drift_detector.py"],capture_output=True,text=True,timeout=60)
-                    output = result.stdout + result.stderr
-                    st.markdown(f"<div class='log-box'>{output}</div>", unsafe_allow_html=True)
-                    if "DRIFT DETECTED" in output:
-                        st.error("⚠️ Drift Detected — Retraining Recommended")
-                    else:
-                        st.success("✅ No Drift — Model is Stable")
-                except Exception as e:
-                    st.error(f"Error: {e}")
+            _, accepted = jobs.submit("drift")
+            if not accepted:
+                st.warning("A drift detection job is already running — showing its progress")
+        job, output = show_job(jobs.latest("drift"))
+        if job is not None and job["status"] == "succeeded":
+            if "DRIFT DETECTED" in output:
+                st.error("⚠️ Drift Detected — Retraining Recommended")
+            else:
+                st.success("✅ No Drift — Model is Stable")
+        elif job is not None and job["status"] in ("failed", "timeout"):
+            st.error(f"Drift detection {job['status']}")
+        elif job is not None:
+            st.info("⏳ Drift detection in progress — results appear here when it finishes")
     with col2:
         st.markdown("<p class='section-header'>Drift Report</p>", unsafe_allow_html=True)
         if os.path.exists("reports/drift_report.html"):
@@ -502,21 +495,22 @@ elif page == "🔁 Retrain Pipeline":
             st.markdown(f"<div class='pipeline-step'><span class='step-number'>{num}</span><span style='font-size:0.85rem'>{desc}</span></div>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("🚀 Run Full Retraining Pipeline"):
-            with st.spinner("Running automated retraining pipeline..."):
-                try:
-                    result = subprocess.run([sys.executable,"src/retrain_pipeline.py"],capture_output=True,text=True,timeout=120)
-                    st.session_state["pipeline_output"] = result.stdout + result.stderr
-                except Exception as e:
-                    st.session_state["pipeline_output"] = f"Error: {e}"
+            _, accepted = jobs.submit("retrain")
+            if not accepted:
+                st.warning("A retraining job is already running — showing its progress")
     with col2:
         st.markdown("<p class='section-header'>Pipeline Output</p>", unsafe_allow_html=True)
-        if "pipeline_output" in st.session_state:
-            output = st.session_state["pipeline_output"]
-            st.markdown(f"<div class='log-box'>{output}</div>", unsafe_allow_html=True)
-            if "PIPELINE COMPLETE" in output:
+        job_id = jobs.latest("retrain")
+        if job_id:
+            job, output = show_job(job_id)
+            if job["status"] == "succeeded" and "PIPELINE COMPLETE" in output:
                 st.success("✅ Pipeline Completed Successfully")
-            elif "Error" in output or "Traceback" in output:
-                st.error("❌ Pipeline encountered an error")
+            elif job["status"] == "succeeded":
+                st.info("Pipeline finished — no retraining needed")
+            elif job["status"] in ("failed", "timeout"):
+                st.error(f"❌ Pipeline {job['status']}")
+            else:
+                st.info("⏳ Pipeline in progress — output updates here as it runs")
         else:
             st.markdown("<div style='border:1px dashed rgba(128,128,128,0.3);border-radius:10px;padding:3rem 1rem;text-align:center;opacity:0.6;'><div style='font-size:2rem;margin-bottom:1rem'>🔁</div><div style='font-size:0.85rem'>Click the button to run<br>the full pipeline</div></div>", unsafe_allow_html=True)
         st.markdown("<br><div style='border:1px solid rgba(128,128,128,0.2);border-radius:8px;padding:1rem;background:rgba(128,128,128,0.03);'><p style='font-family:Space Mono,monospace;font-size:0.7rem;opacity:0.6;margin:0 0 0.5rem 0;'>AUTO-TRIGGER CONDITIONS</p><div style='font-size:0.82rem;line-height:1.8;'><div>📅 Every Monday at midnight (cron)</div><div>🔀 Every push to master branch</div><div>📊 When drift exceeds 20% threshold</div></div></div>", unsafe_allow_html=True)
@@ -527,15 +521,14 @@ elif page == "🔁 Retrain Pipeline":
 elif page == "📋 History":
     st.markdown("<div class='hero'><p class='hero-title'>Prediction <span>History</span></p><p class='hero-sub'>Complete audit trail of all heart disease predictions made by doctors</p></div>", unsafe_allow_html=True)
 
-    history_file = "prediction_history.csv"
-
-    if os.path.exists(history_file):
-        df_history = pd.read_csv(history_file)
+    history.flush()   # include this session's latest prediction
+    counts = history.summary()
 
-        total      = len(df_history)
-        disease    = len(df_history[df_history["Result"] == "Heart Disease"])
-        no_disease = len(df_history[df_history["Result"] == "No Disease"])
-        high_risk  = len(df_history[df_history["Risk"]   == "High"])
+    if counts["total"] > 0:
+        total      = counts["total"]
+        disease    = counts["disease"]
+        no_disease = counts["no_disease"]
+        high_risk  = counts["high"]
 
         c1,c2,c3,c4 = st.columns(4)
         with c1: st.markdown(f"<div class='metric-card'><p class='metric-value' style='color:#58A6FF'>{total}</p><p class='metric-label'>Total Predictions</p></div>", unsafe_allow_html=True)
@@ -563,7 +556,7 @@ elif page == "📋 History":
             st.plotly_chart(fig_pie, use_container_width=True)
 
         with ch2:
-            risk_counts = df_history['Risk'].value_counts().reindex(['High','Medium','Low'], fill_value=0)
+            risk_counts = pd.Series({'High': counts['high'], 'Medium': counts['medium'], 'Low': counts['low']})
             fig_risk = go.Figure(go.Bar(
                 x=risk_counts.index, y=risk_counts.values,
                 marker_color=['#E63946','#D29922','#3FB950'],
@@ -578,13 +571,8 @@ elif page == "📋 History":
             st.plotly_chart(fig_risk, use_container_width=True)
 
         with ch3:
-            if 'Age' in df_history.columns and len(df_history) > 0:
-                df_history['Age Group'] = pd.cut(
-                    df_history['Age'].astype(int),
-                    bins=[0,40,50,60,70,100],
-                    labels=['<40','40-50','50-60','60-70','70+']
-                )
-                age_counts = df_history[df_history['Result']=='Heart Disease']['Age Group'].value_counts().sort_index()
+            age_counts = history.age_groups('Heart Disease')
+            if age_counts.sum() > 0:
                 fig_age = go.Figure(go.Bar(
                     x=age_counts.index.astype(str), y=age_counts.values,
                     marker_color='#E63946', text=age_counts.values, textposition='outside'
@@ -605,29 +593,44 @@ elif page == "📋 History":
         with sf1:
             search = st.text_input("🔍 Search by Patient Name or ID", placeholder="Type name or ID...")
         with sf2:
-            doctors = ["All Doctors"] + list(df_history["Doctor"].unique())
+            doctors = ["All Doctors"] + history.doctors()
             selected_doctor = st.selectbox("Filter by Doctor", doctors)
 
-        df_display = df_history.copy()
+        df_display = history.query(
+            doctor=None if selected_doctor == "All Doctors" else selected_doctor,
+            search=search or None,
+            limit=HISTORY_PAGE_ROWS
+        )
         if search:
-            df_display = df_display[
-                df_display['Patient Name'].str.contains(search, case=False, na=False) |
-                df_display['Patient ID'].str.contains(search, case=False, na=False)
-            ]
             st.markdown(f"<div style='font-size:0.8rem;opacity:0.7;margin-bottom:0.5rem;'>Found {len(df_display)} result(s)</div>", unsafe_allow_html=True)
-        if selected_doctor != "All Doctors":
-            df_display = df_display[df_display["Doctor"] == selected_doctor]
+        if len(df_display) == HISTORY_PAGE_ROWS:
+            st.markdown(f"<div style='font-size:0.8rem;opacity:0.7;margin-bottom:0.5rem;'>Showing the latest {HISTORY_PAGE_ROWS} records — download the CSV for the full history</div>", unsafe_allow_html=True)
 
-        st.dataframe(df_display, use_container_width=True)
+        st.dataframe(df_display.style.format({"Probability": "{:.1%}", "Date": "{:%Y-%m-%d %H:%M}"}, na_rep=""), use_container_width=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
-        csv = df_history.to_csv(index=False)
-        st.download_button(
-            label="⬇️ Download Full History as CSV",
-            data=csv,
-            file_name=f"prediction_history_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+        # The full export reads every row, so it is only built on request
+        if st.button("📦 Prepare Full History CSV"):
+            st.download_button(
+                label="⬇️ Download Full History as CSV",
+                data=history.query().to_csv(index=False),
+                file_name=f"prediction_history_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv"
+            )
+        # One PDF per record in the current doctor/search filter, rendered in parallel
+        if st.button("🗂️ Prepare PDF Reports (zip)"):
+            selected = history.query(doctor=None if selected_doctor == "All Doctors" else selected_doctor,
+                                     search=search or None, columns=REPORT_FIELDS)
+            with st.spinner(f"Rendering {len(selected):,} reports..."):
+                buffer = io.BytesIO()
+                stats  = reports.export_zip(selected.astype(object).where(selected.notna(), "").to_dict("records"), buffer)
+            st.markdown(f"<div style='font-size:0.8rem;opacity:0.7;margin-bottom:0.5rem;'>{stats['pages']:,} reports in {stats['seconds']:.1f}s ({stats['pages_per_sec']:,.0f} pages/sec)</div>", unsafe_allow_html=True)
+            st.download_button(
+                label="⬇️ Download PDF Reports",
+                data=buffer.getvalue(),
+                file_name=f"prediction_reports_{datetime.now().strftime('%Y%m%d')}.zip",
+                mime="application/zip"
+            )
     else:
         st.markdown("""
         <div style='border:1px dashed rgba(128,128,128,0.3);border-radius:10px;
@@ -636,4 +639,10 @@ elif page == "📋 History":
             <div style='font-size:0.9rem;font-weight:600;margin-bottom:0.5rem'>No Predictions Yet</div>
             <div style='font-size:0.82rem;'>Go to 🔬 Predict page, enter patient name,<br>
             ID and vitals, then click Analyze.</div>
-        </div>""", unsafe_allow_html=True)
\ No newline at end of file
+        </div>""", unsafe_allow_html=True)
+
+# ── Job polling ───────────────────────────────────────────────
+# Last, so every column renders before the page refreshes
+if poll_jobs:
+    time.sleep(1)
+    st.rerun()
@@ -1,70 +1,103 @@
-import pandas as pd
+"""
+Train/test metrics for every saved model.
+
+    cd scripts
+    python evaluate_models.py            # results/model_performance.csv only
+    python evaluate_models.py --plots    # also render the test-set confusion matrices
+
+Models are evaluated in a process pool. Each split is scored with one predict call and
+all metrics are derived from its confusion matrix; plots are an optional second stage.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import joblib
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
-import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from fold_store import load_fold
 
-# File paths
-X_train_path = '..\\data\\X_train_data.csv'
-y_train_path = '..\\data\\y_train_data.csv'
-X_test_path = '..\\data\\X_test_data.csv'
-y_test_path = '..\\data\\y_test_data.csv'
+results_dir = os.path.join('..', 'results')
+models_dir = os.path.join('..', 'models')
 
 model_paths = {
-    'KNN': '..\\models\\knn_model.pkl',
-    'Naive Bayes': '..\\models\\naive_bayes_model.pkl',
-    'Logistic Regression': '..\\models\\logistic_regression_model.pkl',
-    'Decision Tree': '..\\models\\decision_tree_model.pkl',
-    'Random Forest': '..\\models\\random_forest_model.pkl',
-    'ANN': '..\\models\\ann_model.pkl',
-    'SVM': '..\\models\\svm_model.pkl'
+    'KNN': os.path.join(models_dir, 'knn_model.pkl'),
+    'Naive Bayes': os.path.join(models_dir, 'naive_bayes_model.pkl'),
+    'Logistic Regression': os.path.join(models_dir, 'logistic_regression_model.pkl'),
+    'Decision Tree': os.path.join(models_dir, 'decision_tree_model.pkl'),
+    'Random Forest': os.path.join(models_dir, 'random_forest_model.pkl'),
+    'ANN': os.path.join(models_dir, 'ann_model.pkl'),
+    'SVM': os.path.join(models_dir, 'svm_model.pkl')
 }
 
-# Load Data
-X_train = pd.read_csv(X_train_path)
-y_train = pd.read_csv(y_train_path).squeeze()
-X_test = pd.read_csv(X_test_path)
-y_test = pd.read_csv(y_test_path).squeeze()
+columns = ["Model", "Train Accuracy", "Test Accuracy", "Train Precision", "Test Precision",
+           "Train Recall", "Test Recall", "Train F1 Score", "Test F1 Score"]
+
+
+def confusion(y_true, y_pred, n_classes=2):
+    """Confusion matrix in a single bincount (rows = true class, columns = predicted)"""
+    y_true = np.asarray(y_true, dtype=np.int64)
+    y_pred = np.asarray(y_pred, dtype=np.int64)
+    return np.bincount(y_true * n_classes + y_pred, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
 
-results = []
 
-# Measure performance for each model
-for model_name, model_path in model_paths.items():
-    model = joblib.load(model_path)  # Load model
+def metrics_from_confusion(cm):
+    """Accuracy and support-weighted precision/recall/F1, as sklearn's average='weighted'"""
+    tp = np.diag(cm).astype(np.float64)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    weights = support / support.sum()
+    return tp.sum() / cm.sum(), precision @ weights, recall @ weights, f1 @ weights
 
-    # Get Train and Test predictions
-    y_train_pred = model.predict(X_train)
-    y_test_pred = model.predict(X_test)
 
-    # Calculate Performance Metrics
-    train_accuracy = accuracy_score(y_train, y_train_pred)
-    test_accuracy = accuracy_score(y_test, y_test_pred)
+def evaluate_model(model_name, model_path):
+    model = joblib.load(model_path)
+    X_train, X_test, y_train, y_test = load_fold(0)
 
-    train_precision = precision_score(y_train, y_train_pred, average='weighted')
-    test_precision = precision_score(y_test, y_test_pred, average='weighted')
+    train_cm = confusion(y_train, model.predict(X_train))
+    test_cm = confusion(y_test, model.predict(X_test))
+    train_accuracy, train_precision, train_recall, train_f1 = metrics_from_confusion(train_cm)
+    test_accuracy, test_precision, test_recall, test_f1 = metrics_from_confusion(test_cm)
 
-    train_recall = recall_score(y_train, y_train_pred, average='weighted')
-    test_recall = recall_score(y_test, y_test_pred, average='weighted')
+    row = [model_name, train_accuracy, test_accuracy, train_precision,
+           test_precision, train_recall, test_recall, train_f1, test_f1]
+    return row, test_cm
 
-    train_f1 = f1_score(y_train, y_train_pred, average='weighted')
-    test_f1 = f1_score(y_test, y_test_pred, average='weighted')
 
-    # Add to results
-    results.append([model_name, train_accuracy, test_accuracy, train_precision,
-                    test_precision, train_recall, test_recall, train_f1, test_f1])
+def plot_confusion_matrix(model_name, cm):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import ConfusionMatrixDisplay
 
-    # Confusion Matrix for Test Set
-    cm = confusion_matrix(y_test, y_test_pred)
     disp = ConfusionMatrixDisplay(confusion_matrix=cm, display_labels=['0', '1'])
     disp.plot(cmap='Blues')
     plt.title(f"Confusion Matrix - {model_name} (Test Set)")
-    plt.savefig(f"..\\results\\confusion_matrix_{model_name.lower().replace(' ', '_')}.png")
+    plt.savefig(os.path.join(results_dir, f"confusion_matrix_{model_name.lower().replace(' ', '_')}.png"))
     plt.close()
 
-# Save results to CSV
-columns = ["Model", "Train Accuracy", "Test Accuracy", "Train Precision", "Test Precision",
-           "Train Recall", "Test Recall", "Train F1 Score", "Test F1 Score"]
-results_df = pd.DataFrame(results, columns=columns)
-results_df.to_csv("..\\results\\model_performance.csv", index=False)
 
-print(results_df)
\ No newline at end of file
+def evaluate_all(workers=None, plots=False):
+    load_fold(0)   # build the fold store once, before the workers open it
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        evaluated = list(pool.map(evaluate_model, model_paths.keys(), model_paths.values()))
+
+        results_df = pd.DataFrame([row for row, _ in evaluated], columns=columns)
+        results_df.to_csv(os.path.join(results_dir, 'model_performance.csv'), index=False)
+
+        if plots:
+            list(pool.map(plot_confusion_matrix, results_df['Model'], [cm for _, cm in evaluated]))
+    return results_df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Evaluate all saved models on fold 0")
+    parser.add_argument('--plots', action='store_true', help="Render test-set confusion matrices to results/")
+    parser.add_argument('--workers', type=int, default=None, help="Processes (default: one per CPU)")
+    args = parser.parse_args()
+    print(evaluate_all(args.workers, args.plots))
@@ -1,7 +1,7 @@
 import joblib
 import pandas as pd
+from fold_store import load_fold
 
-X_train_data_path = '..\\data\\X_train_data.csv'
 model_save_path = '..\\models\\decision_tree_model.pkl'
 
 
@@ -14,6 +14,6 @@ def feature_importance(X_train, dt_model):
 
 
 if __name__ == '__main__':
-    X_train = pd.read_csv(X_train_data_path)
+    X_train, _, _, _ = load_fold(0)
     dt_model = joblib.load(model_save_path)
     print(feature_importance(X_train, dt_model))
\ No newline at end of file
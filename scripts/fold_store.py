@@ -0,0 +1,110 @@
+"""
+On-disk cache of the cleaned dataset and its StratifiedKFold splits.
+
+The store is rebuilt only when the content hash of data/cleaned_heart_statlog.csv
+(or the split settings) changes. Rows are saved grouped by fold, and the grouped
+array is stored twice back to back, so for every fold both the test rows and the
+training rows are one contiguous slice. Arrays are opened with mmap_mode='r'; a fold
+is a pair of views into the mapped file, and no fold is ever copied.
+
+    from fold_store import load_fold
+    X_train, X_test, y_train, y_test = load_fold(0)
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+cleaned_data_path = os.path.join('..', 'data', 'cleaned_heart_statlog.csv')
+fold_store_dir = os.path.join('..', 'data', 'fold_store')
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FoldStore:
+    def __init__(self, directory=fold_store_dir):
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.columns = self.meta['columns']
+        self.bounds = self.meta['fold_bounds']   # [start, stop) of each fold in the grouped rows
+        self.n_rows = self.meta['n_rows']
+        self.n_splits = self.meta['n_splits']
+        self.X = np.load(os.path.join(directory, 'X.npy'), mmap_mode='r')
+        self.y = np.load(os.path.join(directory, 'y.npy'), mmap_mode='r')
+
+    @staticmethod
+    def build(source=cleaned_data_path, directory=fold_store_dir, target_column='target',
+              n_splits=5, random_state=42, source_hash=None):
+        df = pd.read_csv(source)
+        X = df.drop(columns=[target_column])
+        y = df[target_column].to_numpy(dtype=np.int64)
+
+        skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        test_indices = [test_index for _, test_index in skf.split(X, y)]
+        order = np.concatenate(test_indices)
+        sizes = [len(t) for t in test_indices]
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        os.makedirs(directory, exist_ok=True)
+        grouped_X = X.to_numpy(dtype=np.float64)[order]
+        np.save(os.path.join(directory, 'X.npy'), np.concatenate([grouped_X, grouped_X]))
+        np.save(os.path.join(directory, 'y.npy'), np.concatenate([y[order], y[order]]))
+        meta = {
+            'source_hash': source_hash or _file_hash(source),
+            'target': target_column,
+            'n_splits': n_splits,
+            'random_state': random_state,
+            'n_rows': len(df),
+            'columns': list(X.columns),
+            'fold_bounds': [[int(s), int(s + n)] for s, n in zip(starts, sizes)],
+            # Original row numbers in grouped order, to map fold rows back to the CSV
+            'order': order.tolist()
+        }
+        # meta.json last: a store without it is incomplete and gets rebuilt
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def open(cls, source=cleaned_data_path, directory=fold_store_dir, n_splits=5, random_state=42):
+        """Open the store, rebuilding it first if the source file or split settings changed"""
+        source_hash = _file_hash(source)
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if (meta['source_hash'], meta['n_splits'], meta['random_state']) == (source_hash, n_splits, random_state):
+                return cls(directory)
+        cls.build(source, directory, n_splits=n_splits, random_state=random_state, source_hash=source_hash)
+        return cls(directory)
+
+    def fold_arrays(self, k):
+        """(X_train, X_test, y_train, y_test) as read-only views into the mapped arrays"""
+        start, stop = self.bounds[k]
+        train = slice(stop, stop + self.n_rows - (stop - start))
+        return self.X[train], self.X[start:stop], self.y[train], self.y[start:stop]
+
+    def fold(self, k):
+        """fold_arrays wrapped as DataFrames/Series with the original column names"""
+        X_train, X_test, y_train, y_test = self.fold_arrays(k)
+        target = self.meta['target']
+        return (pd.DataFrame(X_train, columns=self.columns, copy=False),
+                pd.DataFrame(X_test, columns=self.columns, copy=False),
+                pd.Series(y_train, name=target, copy=False),
+                pd.Series(y_test, name=target, copy=False))
+
+    def folds(self):
+        for k in range(self.n_splits):
+            yield self.fold(k)
+
+
+def load_fold(k=0, **kwargs):
+    return FoldStore.open(**kwargs).fold(k)
@@ -0,0 +1,73 @@
+"""
+Times incremental updates of the linear and naive Bayes models against full refits.
+
+    cd scripts
+    python incremental_update.py              # 5 batches
+    python incremental_update.py --batches 10
+
+The training fold (fold 0 of the fold store) arrives in batches. After each batch the
+naive Bayes model and a log-loss SGDClassifier standing in for logistic regression
+take the new rows through partial_fit. Both are compared with a fresh naive Bayes /
+LogisticRegression fitted on every row so far, on wall-clock time and test-fold F1.
+Hyperparameters come from results/best_params_*.json.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import f1_score
+
+import train_logistic_regression
+import train_naive_bayes
+from fold_store import load_fold
+from tune_models import local_path
+
+
+def _best_params(trainer):
+    with open(local_path(trainer.best_params_save_path)) as f:
+        params = json.load(f)
+    # JSON turns class_weight's integer class labels into strings
+    if isinstance(params.get('class_weight'), dict):
+        params['class_weight'] = {int(k): v for k, v in params['class_weight'].items()}
+    return params
+
+
+def _timed(fit):
+    start = time.perf_counter()
+    model = fit()
+    return model, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batches', type=int, default=5)
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test = load_fold(0)
+    X_train, X_test, y_train = np.asarray(X_train), np.asarray(X_test), np.asarray(y_train)
+    nb_base = clone(train_naive_bayes.ESTIMATOR).set_params(**_best_params(train_naive_bayes))
+    lr_params = _best_params(train_logistic_regression)
+    lr_base = clone(train_logistic_regression.ESTIMATOR).set_params(**lr_params)
+    bounds = np.linspace(0, len(X_train), args.batches + 1).astype(int)
+
+    nb = lr = None
+    print(f"{'model':<20} {'rows':>6} {'full s':>8} {'incr s':>8} {'full f1':>8} {'incr f1':>8}")
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        X_new, y_new = X_train[start:stop], y_train[start:stop]
+        X_seen, y_seen = X_train[:stop], y_train[:stop]
+
+        nb_full, nb_full_s = _timed(lambda: clone(nb_base).fit(X_seen, y_seen))
+        nb, nb_s = _timed(lambda: clone(nb_base).fit(X_new, y_new) if nb is None
+                          else train_naive_bayes.update_naive_bayes(X_new, y_new, nb))
+        lr_full, lr_full_s = _timed(lambda: clone(lr_base).fit(X_seen, y_seen))
+        lr, lr_s = _timed(lambda: train_logistic_regression.sgd_from_params(lr_params, y_new).fit(X_new, y_new)
+                          if lr is None else train_logistic_regression.update_linear_model(X_new, y_new, lr))
+
+        for name, full, full_s, incr, incr_s in [('naive_bayes', nb_full, nb_full_s, nb, nb_s),
+                                                  ('logistic_regression', lr_full, lr_full_s, lr, lr_s)]:
+            print(f"{name:<20} {stop:>6} {full_s:>8.4f} {incr_s:>8.4f} "
+                  f"{f1_score(y_test, full.predict(X_test)):>8.4f} "
+                  f"{f1_score(y_test, incr.predict(X_test)):>8.4f}")
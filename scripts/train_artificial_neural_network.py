@@ -1,9 +1,8 @@
 import pandas as pd
 from sklearn.neural_network import MLPClassifier
 import joblib
+from fold_store import load_fold
 
-X_train_data_path = '..\\data\\X_train_data.csv'
-y_train_data_path = '..\\data\\y_train_data.csv'
 model_save_path = '..\\models\\ann_model.pkl'
 
 def train_ann(X_train, y_train):
@@ -14,8 +13,7 @@ def train_ann(X_train, y_train):
 
 if __name__ == '__main__':
     #Load dataset
-    X_train = pd.read_csv(X_train_data_path)
-    y_train = pd.read_csv(y_train_data_path)
+    X_train, _, y_train, _ = load_fold(0)
 
     #Train model
     ann_model = train_ann(X_train, y_train)
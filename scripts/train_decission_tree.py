@@ -4,29 +4,30 @@ import json
 from sklearn.tree import DecisionTreeClassifier, plot_tree
 from sklearn.model_selection import GridSearchCV
 import matplotlib.pyplot as plt
+from fold_store import load_fold
 
 # File paths
-X_train_data_path = '..\\data\\X_train_data.csv'
-y_train_data_path = '..\\data\\y_train_data.csv'
 model_save_path = '..\\models\\decision_tree_model.pkl'
 best_params_save_path = '..\\results\\best_params_decision_tree.json'
 
+# Search space, shared with tune_models.py
+PARAM_GRID = {
+    'criterion': ["gini", "entropy"],
+    'max_depth': [3, 5, 10, 15, 20],
+    'min_samples_leaf': [5, 10, 20, 30, 40],
+    'min_samples_split': [5, 10, 20, 30, 40],
+    'max_features': [None, 'sqrt', 'log2'],
+    'ccp_alpha': [0.0, 0.0001, 0.001, 0.05]
+}
+ESTIMATOR = DecisionTreeClassifier(random_state=42)
+
 def load_data():
-    X_train = pd.read_csv(X_train_data_path)
-    y_train = pd.read_csv(y_train_data_path).squeeze()
+    # Fold 0 of the cached StratifiedKFold split (see fold_store.py)
+    X_train, _, y_train, _ = load_fold(0)
     return X_train, y_train
 
 def grid_search(X_train, y_train):
-    param_grid = {
-        'criterion': ["gini", "entropy"],
-        'max_depth': [3, 5, 10, 15, 20],
-        'min_samples_leaf': [5, 10, 20, 30, 40],
-        'min_samples_split': [5, 10, 20, 30, 40],
-        'max_features': [None, 'sqrt', 'log2'],
-        'ccp_alpha': [0.0, 0.0001, 0.001, 0.05]
-    }
-    dt = DecisionTreeClassifier(random_state=42)
-    grid_search = GridSearchCV(dt, param_grid, cv=5, scoring='f1', n_jobs=-1)
+    grid_search = GridSearchCV(ESTIMATOR, PARAM_GRID, cv=5, scoring='f1', n_jobs=-1)
     grid_search.fit(X_train, y_train)
     print("Best hyperparameters: ", grid_search.best_params_)
 
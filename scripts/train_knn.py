@@ -3,26 +3,28 @@ import pandas as pd
 import joblib
 import json
 from sklearn.model_selection import GridSearchCV
+import os
+from fold_store import load_fold
 
-
-X_train_data_path = '..\\data\\X_train_data.csv'
-y_train_data_path = '..\\data\\y_train_data.csv'
 model_save_path = '..\\models\\knn_model.pkl'
 best_params_save_path = '..\\results\\best_params_knn.json'
+index_save_dir = os.path.join('..', 'models', 'knn_index')
+
+# Search space, shared with tune_models.py
+PARAM_GRID = {
+    'n_neighbors': [9, 11, 15, 20],
+    'weights': ['uniform'],
+    'metric': ['euclidean', 'manhattan']
+}
+ESTIMATOR = KNeighborsClassifier()
 
 def load_data():
-    X_train = pd.read_csv(X_train_data_path)
-    y_train = pd.read_csv(y_train_data_path).squeeze()
+    # Fold 0 of the cached StratifiedKFold split (see fold_store.py)
+    X_train, _, y_train, _ = load_fold(0)
     return X_train, y_train
 
 def grid_search(X_train, y_train):
-    param_grid = {
-        'n_neighbors': [9, 11, 15, 20],
-        'weights': ['uniform'],
-        'metric': ['euclidean', 'manhattan']
-    }
-    knn = KNeighborsClassifier()
-    grid_search = GridSearchCV(knn, param_grid, cv=5, scoring='f1', n_jobs=-1)
+    grid_search = GridSearchCV(ESTIMATOR, PARAM_GRID, cv=5, scoring='f1', n_jobs=-1)
     grid_search.fit(X_train, y_train)
     print("Best hyperparameters: ", grid_search.best_params_)
 
@@ -50,3 +52,9 @@ if __name__ == '__main__':
 
     # Modeli eğit
     knn_model = train_knn(X_train, y_train, best_params)
+
+    # Memory-mapped IVF index the API scores with instead of a brute-force scan
+    # (needs the repo root on the path: PYTHONPATH=.. python train_knn.py)
+    from src.knn_index import build_knn_index
+    index = build_knn_index(knn_model, index_save_dir)
+    print(f"KNN index saved to {index_save_dir} ({len(index.centroids)} cells)")
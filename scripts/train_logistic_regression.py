@@ -1,5 +1,8 @@
+import os
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.utils.class_weight import compute_class_weight
 import joblib
 import pandas as pd
 import joblib
@@ -7,26 +10,28 @@ import json
 from sklearn.tree import DecisionTreeClassifier, plot_tree
 from sklearn.model_selection import GridSearchCV
 import matplotlib.pyplot as plt
+from fold_store import load_fold
 
-X_train_data_path = '..\\data\\X_train_data.csv'
-y_train_data_path = '..\\data\\y_train_data.csv'
-model_save_path = '..\\models\\logistic_regression_model.pkl'
-best_params_save_path = '..\\results\\best_params_logistic_regression.json'
+model_save_path = os.path.join('..', 'models', 'logistic_regression_model.pkl')
+best_params_save_path = os.path.join('..', 'results', 'best_params_logistic_regression.json')
+sgd_model_save_path = os.path.join('..', 'models', 'logistic_regression_sgd_model.pkl')
+
+# Search space, shared with tune_models.py
+PARAM_GRID = {
+    'C': [0.01, 0.1, 1, 10, 100],
+    'penalty': ['l1', 'l2'],
+    'solver': ['liblinear'],
+    'class_weight': [None, 'balanced', {0: 1, 1: 1.5}]
+}
+ESTIMATOR = LogisticRegression(random_state=42)
 
 def load_data():
-    X_train = pd.read_csv(X_train_data_path)
-    y_train = pd.read_csv(y_train_data_path).squeeze()
+    # Fold 0 of the cached StratifiedKFold split (see fold_store.py)
+    X_train, _, y_train, _ = load_fold(0)
     return X_train, y_train
 
 def grid_search(X_train, y_train):
-    param_grid = {
-        'C': [0.01, 0.1, 1, 10, 100],
-        'penalty': ['l1', 'l2'],
-        'solver': ['liblinear'],
-        'class_weight': [None, 'balanced', {0: 1, 1: 1.5}]
-    }
-    dt = LogisticRegression(random_state=42)
-    grid_search = GridSearchCV(dt, param_grid, cv=5, scoring='f1', n_jobs=-1)
+    grid_search = GridSearchCV(ESTIMATOR, PARAM_GRID, cv=5, scoring='f1', n_jobs=-1)
     grid_search.fit(X_train, y_train)
     print("Best hyperparameters: ", grid_search.best_params_)
 
@@ -45,6 +50,35 @@ def train_logistic_regression(X_train, y_train, best_params):
 
     return log_reg
 
+def sgd_from_params(best_params, y_train):
+    # LogisticRegression has no partial_fit; SGDClassifier with log loss fits the same model
+    # by stochastic gradient descent and can take new rows as they arrive. C maps to
+    # alpha = 1 / (C * n_rows); partial_fit rejects class_weight='balanced', so those
+    # weights are fixed from the initial training labels
+    class_weight = best_params.get('class_weight')
+    if class_weight == 'balanced':
+        classes = np.unique(y_train)
+        class_weight = dict(zip(classes, compute_class_weight('balanced', classes=classes, y=y_train)))
+    return SGDClassifier(loss='log_loss', penalty=best_params.get('penalty', 'l2'),
+                         alpha=1 / (best_params.get('C', 1.0) * len(y_train)),
+                         class_weight=class_weight, random_state=42)
+
+def train_sgd(X_train, y_train, best_params):
+    sgd_model = sgd_from_params(best_params, y_train)
+    sgd_model.fit(X_train, y_train)
+    joblib.dump(sgd_model, sgd_model_save_path)
+    print(f"SGD model saved to {sgd_model_save_path}")
+    return sgd_model
+
+def update_linear_model(X_new, y_new, model=None):
+    # One SGD pass over the new rows only; the model is a log-loss SGDClassifier built
+    # by sgd_from_params and saved apart from the LogisticRegression above
+    sgd_model = model if model is not None else joblib.load(sgd_model_save_path)
+    sgd_model.partial_fit(X_new, y_new, classes=np.array([0, 1]))
+    if model is None:
+        joblib.dump(sgd_model, sgd_model_save_path)
+    return sgd_model
+
 if __name__ == '__main__':
     # Veriyi yükle
     X_train, y_train = load_data()
@@ -55,5 +89,8 @@ if __name__ == '__main__':
     # Modeli eğit
     log_reg_model = train_logistic_regression(X_train, y_train, best_params)
 
+    # update_linear_model grows this SGD counterpart with new rows
+    train_sgd(X_train, y_train, best_params)
+
     print(pd.DataFrame({'feature': X_train.columns, 'coefficient': log_reg_model.coef_[0]}).sort_values(
         by='coefficient', ascending=False))
\ No newline at end of file
@@ -1,27 +1,29 @@
+import os
 import pandas as pd
 import joblib
 import json
 from sklearn.naive_bayes import GaussianNB
 from sklearn.model_selection import GridSearchCV
 from sklearn.inspection import permutation_importance
+from fold_store import load_fold
 
 # File paths
-X_train_data_path = '..\\data\\X_train_data.csv'
-y_train_data_path = '..\\data\\y_train_data.csv'
-model_save_path = '..\\models\\naive_bayes_model.pkl'
-best_params_save_path = '..\\results\\best_params_naive_bayes.json'
+model_save_path = os.path.join('..', 'models', 'naive_bayes_model.pkl')
+best_params_save_path = os.path.join('..', 'results', 'best_params_naive_bayes.json')
+
+# Search space, shared with tune_models.py
+PARAM_GRID = {
+    'var_smoothing': [1e-9, 1e-8, 1e-7, 1e-6]
+}
+ESTIMATOR = GaussianNB()
 
 def load_data():
-    X_train = pd.read_csv(X_train_data_path)
-    y_train = pd.read_csv(y_train_data_path).squeeze()
+    # Fold 0 of the cached StratifiedKFold split (see fold_store.py)
+    X_train, _, y_train, _ = load_fold(0)
     return X_train, y_train
 
 def grid_search(X_train, y_train):
-    param_grid = {
-        'var_smoothing': [1e-9, 1e-8, 1e-7, 1e-6]
-    }
-    nb = GaussianNB()
-    grid_search = GridSearchCV(nb, param_grid, cv=5, scoring='f1', n_jobs=-1)
+    grid_search = GridSearchCV(ESTIMATOR, PARAM_GRID, cv=5, scoring='f1', n_jobs=-1)
     grid_search.fit(X_train, y_train)
     print("Best hyperparameters: ", grid_search.best_params_)
 
@@ -38,6 +40,16 @@ def train_naive_bayes(X_train, y_train, best_params):
     print(f"Model saved to {model_save_path}")
     return nb_model
 
+def update_naive_bayes(X_new, y_new, model=None):
+    # GaussianNB keeps per-class running means and variances, so those match a refit on
+    # all rows seen so far. The smoothing term does not: epsilon_ (var_smoothing times the
+    # largest feature variance) is recomputed from each batch alone, not from all rows
+    nb_model = model if model is not None else joblib.load(model_save_path)
+    nb_model.partial_fit(X_new, y_new)
+    if model is None:
+        joblib.dump(nb_model, model_save_path)
+    return nb_model
+
 if __name__ == '__main__':
     # Veriyi yükle
     X_train, y_train = load_data()
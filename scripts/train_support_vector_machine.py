@@ -4,27 +4,28 @@ import json
 from sklearn.svm import SVC
 from sklearn.model_selection import GridSearchCV
 from sklearn.inspection import permutation_importance
+from fold_store import load_fold
 
 # File paths
-X_train_data_path = '..\\data\\X_train_data.csv'
-y_train_data_path = '..\\data\\y_train_data.csv'
 model_save_path = '..\\models\\svm_model.pkl'
 best_params_save_path = '..\\results\\best_params_svm.json'
 
+# Search space, shared with tune_models.py
+PARAM_GRID = {
+    'C': [0.1, 1, 10, 100],
+    'kernel': ['linear', 'rbf'],
+    'gamma': ['scale', 'auto', 0.01, 0.1, 1],
+    'class_weight': [None, 'balanced', {0: 1, 1: 1.5}]
+}
+ESTIMATOR = SVC(probability=True, random_state=42)  # probability=True, eşik ayarı için gerekli
+
 def load_data():
-    X_train = pd.read_csv(X_train_data_path)
-    y_train = pd.read_csv(y_train_data_path).squeeze()
+    # Fold 0 of the cached StratifiedKFold split (see fold_store.py)
+    X_train, _, y_train, _ = load_fold(0)
     return X_train, y_train
 
 def grid_search(X_train, y_train):
-    param_grid = {
-        'C': [0.1, 1, 10, 100],
-        'kernel': ['linear', 'rbf'],
-        'gamma': ['scale', 'auto', 0.01, 0.1, 1],
-        'class_weight': [None, 'balanced', {0: 1, 1: 1.5}]
-    }
-    svm = SVC(probability=True, random_state=42)  # probability=True, eşik ayarı için gerekli
-    grid_search = GridSearchCV(svm, param_grid, cv=5, scoring='f1', n_jobs=-1)
+    grid_search = GridSearchCV(ESTIMATOR, PARAM_GRID, cv=5, scoring='f1', n_jobs=-1)
     grid_search.fit(X_train, y_train)
     print("Best hyperparameters: ", grid_search.best_params_)
 
@@ -0,0 +1,105 @@
+"""
+Tunes every model family in one run.
+
+    cd scripts
+    python tune_models.py                 # successive halving, all families in parallel
+    python tune_models.py --compare       # also time the exhaustive GridSearchCV of each trainer
+    python tune_models.py --models knn svm --workers 2
+
+Each family's search runs in its own process and memory-maps the training fold from
+the fold store (fold_store.py), so the CSVs are never re-parsed.
+Search spaces, estimators and output paths come from the train_*.py modules, so
+results/best_params_*.json and models/*.pkl are written exactly where the individual
+trainers write them.
+"""
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import pandas as pd
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV, ParameterGrid
+
+from fold_store import load_fold
+
+# Model family -> trainer module
+TRAINERS = {
+    'knn':                 'train_knn',
+    'decision_tree':       'train_decission_tree',
+    'random_forest':       'train_random_forest',
+    'logistic_regression': 'train_logistic_regression',
+    'svm':                 'train_support_vector_machine',
+    'naive_bayes':         'train_naive_bayes',
+}
+
+
+def local_path(path):
+    """Trainer paths are written Windows-style; make them work on any OS"""
+    return os.path.join(*path.split('\\'))
+
+
+def halving_search(name):
+    """Successive halving over the trainer's grid; writes its best params and refitted model"""
+    trainer = importlib.import_module(TRAINERS[name])
+    X_train, _, y_train, _ = load_fold(0)
+    start = time.perf_counter()
+    search = HalvingGridSearchCV(trainer.ESTIMATOR, trainer.PARAM_GRID, cv=5, scoring='f1',
+                                 factor=3, random_state=42, n_jobs=1)
+    search.fit(X_train, y_train)
+    elapsed = time.perf_counter() - start
+
+    with open(local_path(trainer.best_params_save_path), 'w') as f:
+        json.dump(search.best_params_, f, indent=4)
+    joblib.dump(search.best_estimator_, local_path(trainer.model_save_path))
+    return {'model': name, 'candidates': len(ParameterGrid(trainer.PARAM_GRID)),
+            'halving_seconds': round(elapsed, 2), 'halving_f1': round(search.best_score_, 4),
+            'best_params': search.best_params_}
+
+
+def exhaustive_search(name, X_train, y_train):
+    """The trainer's original GridSearchCV, timed only — nothing is written"""
+    trainer = importlib.import_module(TRAINERS[name])
+    start = time.perf_counter()
+    search = GridSearchCV(trainer.ESTIMATOR, trainer.PARAM_GRID, cv=5, scoring='f1', n_jobs=-1)
+    search.fit(X_train, y_train)
+    return {'grid_seconds': round(time.perf_counter() - start, 2), 'grid_f1': round(search.best_score_, 4)}
+
+
+def tune_all(models, workers):
+    load_fold(0)   # builds the fold store once, before the workers open it
+    results = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(halving_search, name): name for name in models}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['model']] = result
+            print(f"{result['model']:<20} f1={result['halving_f1']:.4f}  {result['halving_seconds']:>7.2f} s  "
+                  f"{result['best_params']}")
+    print(f"Halving search, all families: {time.perf_counter() - start:.2f} s wall-clock")
+    return [results[name] for name in models]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tune all model families with successive halving")
+    parser.add_argument('--models', nargs='+', choices=list(TRAINERS), default=list(TRAINERS))
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Families searched in parallel")
+    parser.add_argument('--compare', action='store_true', help="Also time each trainer's exhaustive grid search")
+    args = parser.parse_args()
+
+    results = tune_all(args.models, args.workers)
+
+    if args.compare:
+        X_train, _, y_train, _ = load_fold(0)
+        # Same order and parallelism as running the trainers one after another today
+        start = time.perf_counter()
+        for result in results:
+            result.update(exhaustive_search(result['model'], X_train, y_train))
+        grid_total = time.perf_counter() - start
+        table = pd.DataFrame(results).drop(columns='best_params').set_index('model')
+        print(table.to_string())
+        print(f"Exhaustive grids, sequential: {grid_total:.2f} s wall-clock")
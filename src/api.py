@@ -1,11 +1,49 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import pickle
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+import json
+import time
 import numpy as np
 import pandas as pd
 import os
-import glob
+
+from src.batching import MicroBatcher
+from src.preprocessing import FEATURES
+from src.model_watcher import METRIC_NAMES, ModelHolder, ModelWatcher, ServingModel
+from src.model_cache import load_production, write_cache
+from src.result_cache import ResultCache, cache_from_env
+from src.metrics import Counter, Gauge, Histogram, render
+from src.drift_engine import load_reference_sketch
+from src.drift_monitor import DriftMonitor
+from src.model_router import ModelRouter
+
+_boot_start = time.perf_counter()
+
+# ── Micro-batching (opt-in) ───────────────────────────────────
+MICROBATCH_ENABLED     = os.environ.get("MICROBATCH_ENABLED", "0").lower() in ("1", "true", "yes")
+MICROBATCH_MAX_SIZE    = int(os.environ.get("MICROBATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("MICROBATCH_MAX_WAIT_MS", "2"))
+
+# ── Model serving ─────────────────────────────────────────────
+# FAST_SCORER=0 scores with the sklearn estimator instead of the flattened NumPy forest
+FAST_SCORER          = os.environ.get("FAST_SCORER", "1").lower() not in ("0", "false", "no")
+# Seconds between polls for a newly promoted Production model; 0 disables hot reload
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", "30"))
+# Versioned on-disk copy of the production model; later boots load it without importing mlflow
+MODEL_CACHE_DIR      = os.environ.get("MODEL_CACHE_DIR", "model_cache")
+
+# ── Live drift monitoring ─────────────────────────────────────
+# Seconds between drift evaluations of recent /predict traffic; 0 disables the monitor
+DRIFT_INTERVAL       = float(os.environ.get("DRIFT_INTERVAL", "30"))
+DRIFT_SLIDING_SIZE   = int(os.environ.get("DRIFT_SLIDING_SIZE", "5000"))
+DRIFT_TUMBLING_SIZE  = int(os.environ.get("DRIFT_TUMBLING_SIZE", "1000"))
+DRIFT_REFERENCE_PATH = os.environ.get("DRIFT_REFERENCE_PATH", "data/heart.csv")
+
+# ── Comparison models (scripts/train_*.py) ────────────────────
+# Comma-separated names from model_router.MODEL_FILES, "all", or empty to disable
+SERVED_MODELS        = os.environ.get("SERVED_MODELS", "all")
 
 app = FastAPI(
     title="Heart Disease Prediction API",
@@ -20,32 +58,87 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ── Metrics ───────────────────────────────────────────────────
+REQUESTS      = Counter("heart_api_requests_total", "HTTP requests by route and status", ["route", "method", "status"])
+REQUEST_TIME  = Histogram("heart_api_request_seconds", "End-to-end request latency", ["route"])
+STAGE_TIME    = Histogram("heart_api_stage_seconds", "Latency of each inference stage", ["stage"])
+PREDICTIONS   = Counter("heart_api_predictions_total", "Predictions served by class", ["prediction"])
+RISK_LEVELS   = Counter("heart_api_risk_levels_total", "Predictions served by risk level", ["risk_level"])
+MODEL_INFO    = Gauge("heart_api_model_info", "Model version currently served", ["version", "source", "scorer"])
+MODEL_LOAD    = Gauge("heart_api_model_load_seconds", "Time to load and warm up the served model")
+CACHE_EVENTS  = Gauge("heart_api_result_cache", "Result cache counters", ["event"])
+DRIFT_SHARE   = Gauge("heart_api_drift_share", "Share of drifted features in live traffic", ["window"])
+ROUTED_TIME   = Histogram("heart_api_routed_seconds", "Latency of /models scoring calls", ["model"])
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    request.state.start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status   = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        REQUEST_TIME.observe(time.perf_counter() - request.state.start, route=route)
+        REQUESTS.inc(route=route, method=request.method, status=status)
+
 def load_model():
+    start = time.perf_counter()
     try:
-        import mlflow.sklearn
-        mlflow.set_tracking_uri("http://localhost:5000")
-        model = mlflow.sklearn.load_model("models:/HeartDiseaseModel/1")
-        return model
-    except:
-        pass
+        model, std, mm, manifest = load_production(MODEL_CACHE_DIR)
+    except Exception as e:
+        print(f"❌ Model not loaded: {e}")
+        return None
+    serving = ServingModel(model, manifest["version"], manifest["source"], std, mm, fast=FAST_SCORER,
+                           metrics=manifest.get("metrics"))
+    serving.warm_up()
+    serving.load_seconds = time.perf_counter() - start
+    print(f"⏱  Time to first prediction: {(time.perf_counter() - _boot_start)*1000:.0f} ms "
+          f"(model {serving.version})")
+    return serving
+
+def cache_swapped_model(serving):
+    if MODEL_CACHE_DIR:
+        write_cache(serving.model, serving.version, serving.source, MODEL_CACHE_DIR, serving.metrics)
+
+# Repeat requests keyed on (model version, features); RESULT_CACHE_SIZE=0 disables
+result_cache = cache_from_env()
+
+# Active model version; handlers read holder.current once so a swap never splits a request
+holder  = ModelHolder(load_model())
+watcher = ModelWatcher(holder, MODEL_WATCH_INTERVAL, fast=FAST_SCORER, on_swap=cache_swapped_model) if MODEL_WATCH_INTERVAL > 0 else None
+
+def load_drift_monitor():
+    if DRIFT_INTERVAL <= 0:
+        return None
     try:
-        pkl_files = glob.glob("mlruns/**/model.pkl", recursive=True)
-        if pkl_files:
-            return pickle.load(open(pkl_files[0], "rb"))
-    except:
-        pass
-    return None
-
-def load_scalers():
+        sketch = load_reference_sketch(DRIFT_REFERENCE_PATH)
+    except Exception as e:
+        print(f"⚠️  Drift monitor disabled: {e}")
+        return None
+    return DriftMonitor(sketch, FEATURES, DRIFT_SLIDING_SIZE, DRIFT_TUMBLING_SIZE, DRIFT_INTERVAL)
+
+# Every scored feature vector is copied into the monitor's ring buffer; drift is computed off the request path
+drift_monitor = load_drift_monitor()
+
+def load_router():
+    names = [n.strip() for n in SERVED_MODELS.split(",") if n.strip()]
+    if not names:
+        return None
     try:
-        std = pickle.load(open("models/standard_scaler.pkl", "rb"))
-        mm  = pickle.load(open("models/minmax_scaler.pkl",  "rb"))
-        return std, mm
-    except:
-        return None, None
+        return ModelRouter(None if names == ["all"] else names, fast=FAST_SCORER)
+    except Exception as e:
+        print(f"⚠️  Model router disabled: {e}")
+        return None
+
+# The scripts/ models, addressable by name under /models
+router = load_router()
 
-model = load_model()
-std_scaler, mm_scaler = load_scalers()
+# PatientData fields in FEATURES order
+FIELDS = ["age", "sex", "chest_pain_type", "resting_bp", "cholesterol",
+          "fasting_blood_sugar", "resting_ecg", "max_heart_rate",
+          "exercise_angina", "oldpeak", "st_slope"]
 
 class PatientData(BaseModel):
     age: float
@@ -62,44 +155,260 @@ class PatientData(BaseModel):
 
 @app.get("/")
 def root():
-    return {"message": "Heart Disease Prediction API", "status": "running", "model_loaded": model is not None}
+    return {"message": "Heart Disease Prediction API", "status": "running", "model_loaded": holder.current is not None}
 
 @app.get("/health")
 def health():
-    return {"status": "healthy", "model_loaded": model is not None, "scalers_loaded": std_scaler is not None}
+    serving = holder.current
+    return {
+        "status": "healthy",
+        "model_loaded": serving is not None,
+        "scalers_loaded": serving is not None and serving.scalers_loaded,
+        "result_cache": result_cache.stats() if result_cache else None
+    }
 
-@app.post("/predict")
-def predict(patient: PatientData):
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    input_df = pd.DataFrame([{
-        "age": patient.age, "sex": patient.sex,
-        "chest pain type": patient.chest_pain_type,
-        "resting bp s": patient.resting_bp,
-        "cholesterol": patient.cholesterol,
-        "fasting blood sugar": patient.fasting_blood_sugar,
-        "resting ecg": patient.resting_ecg,
-        "max heart rate": patient.max_heart_rate,
-        "exercise angina": patient.exercise_angina,
-        "oldpeak": patient.oldpeak,
-        "ST slope": patient.st_slope
-    }])
-    if std_scaler:
-        input_df[["resting bp s","cholesterol","max heart rate","age"]] = \
-            std_scaler.transform(input_df[["resting bp s","cholesterol","max heart rate","age"]])
-    if mm_scaler:
-        input_df[["oldpeak"]] = mm_scaler.transform(input_df[["oldpeak"]])
-    prediction  = int(model.predict(input_df)[0])
-    probability = float(model.predict_proba(input_df)[0][1])
+def build_features(patients, preprocessor):
+    """Fill the preprocessor's per-thread buffer with all patients and scale it in place"""
+    with STAGE_TIME.time(stage="build"):
+        X = preprocessor.buffer(len(patients))
+        for i, p in enumerate(patients):
+            X[i] = [getattr(p, f) for f in FIELDS]
+    with STAGE_TIME.time(stage="scale"):
+        return preprocessor.transform(X)
+
+def score(X, scorer):
+    """Single predict_proba over the scaled rows; labels are taken from the probabilities"""
+    if hasattr(scorer, "feature_names_in_"):
+        # sklearn estimators were fitted on a DataFrame and expect its column names
+        X = pd.DataFrame(X, columns=FEATURES)
+    with STAGE_TIME.time(stage="predict_proba"):
+        proba = scorer.predict_proba(X)
+    with STAGE_TIME.time(stage="predict"):
+        predictions = scorer.classes_[proba.argmax(axis=1)]
+    return predictions, proba[:, list(scorer.classes_).index(1)]
+
+def format_result(prediction, probability):
+    prediction  = int(prediction)
+    probability = float(probability)
     risk        = "High" if probability > 0.7 else "Medium" if probability > 0.4 else "Low"
     return {
         "prediction": prediction,
         "diagnosis": "Heart Disease Detected" if prediction==1 else "No Heart Disease",
         "probability": round(probability, 4),
+        "probability_exact": probability,
         "risk_level": risk,
         "confidence": f"{probability*100:.1f}%" if prediction==1 else f"{(1-probability)*100:.1f}%"
     }
 
+def parse_batch(body, content_type):
+    """Accept either a JSON array of patients or NDJSON (one patient per line)"""
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            records = [json.loads(line) for line in body.decode().splitlines() if line.strip()]
+        else:
+            records = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON of patients")
+    patients = []
+    for i, record in enumerate(records):
+        try:
+            patients.append(PatientData(**record))
+        except (ValidationError, TypeError) as e:
+            raise HTTPException(status_code=422, detail=f"Row {i}: {e}")
+    return patients
+
+def score_uncached(patients, serving):
+    predictions, probabilities = score(build_features(patients, serving.preprocessor), serving.scorer)
+    with STAGE_TIME.time(stage="format"):
+        return [format_result(p, pr) for p, pr in zip(predictions, probabilities)]
+
+def record_results(results):
+    for r in results:
+        PREDICTIONS.inc(prediction=r["prediction"])
+        RISK_LEVELS.inc(risk_level=r["risk_level"])
+    return results
+
+def score_patients(patients, serving=None):
+    """Serve repeats from the result cache and score only the misses, in one call"""
+    serving = serving or holder.current
+    if drift_monitor is not None:
+        for p in patients:
+            drift_monitor.push([getattr(p, f) for f in FIELDS])
+    if result_cache is None:
+        return record_results(score_uncached(patients, serving))
+    with STAGE_TIME.time(stage="cache_lookup"):
+        keys    = [ResultCache.make_key(serving.version, [getattr(p, f) for f in FIELDS]) for p in patients]
+        results = [result_cache.get(k) for k in keys]
+        missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        for i, result in zip(missing, score_uncached([patients[i] for i in missing], serving)):
+            results[i] = result
+            result_cache.put(keys[i], result)
+    return record_results(results)
+
+batcher = MicroBatcher(score_patients, MICROBATCH_MAX_SIZE, MICROBATCH_MAX_WAIT_MS) if MICROBATCH_ENABLED else None
+
+@app.on_event("startup")
+async def start_background_tasks():
+    if batcher:
+        await batcher.start()
+    if watcher:
+        watcher.start()
+    if drift_monitor:
+        drift_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    if batcher:
+        await batcher.stop()
+    if watcher:
+        watcher.stop()
+    if drift_monitor:
+        drift_monitor.stop()
+    if router:
+        router.close()
+
+@app.post("/predict")
+async def predict(patient: PatientData, request: Request):
+    # Routing, body read and validation all happen before the handler runs
+    STAGE_TIME.observe(time.perf_counter() - request.state.start, stage="parse")
+    serving = holder.current
+    if serving is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    if batcher:
+        result = await batcher.submit(patient)
+    else:
+        result = (await run_in_threadpool(score_patients, [patient], serving))[0]
+    with STAGE_TIME.time(stage="serialize"):
+        return JSONResponse(content=result)
+
+@app.get("/predict/batching")
+def batching_stats():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+@app.post("/predict/batch")
+async def predict_batch(request: Request):
+    serving = holder.current
+    if serving is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    body = await request.body()
+    with STAGE_TIME.time(stage="parse"):
+        patients = parse_batch(body, request.headers.get("content-type", ""))
+    if not patients:
+        return {"count": 0, "results": []}
+
+    start = time.perf_counter()
+    results = await run_in_threadpool(score_patients, patients, serving)
+    elapsed = time.perf_counter() - start
+
+    with STAGE_TIME.time(stage="serialize"):
+        return JSONResponse(
+            content={"count": len(results), "results": results},
+            headers={
+                "X-Batch-Size":           str(len(results)),
+                "X-Inference-Time-Ms":    f"{elapsed*1000:.2f}",
+                "X-Throughput-Rows-Per-Sec": f"{len(results)/elapsed:.1f}" if elapsed > 0 else "inf"
+            }
+        )
+
+def raw_features(patients):
+    return np.array([[getattr(p, f) for f in FIELDS] for p in patients], dtype=np.float64)
+
+def routed_results(probabilities):
+    return [format_result(int(p >= 0.5), p) for p in probabilities]
+
+def require_router():
+    if router is None:
+        raise HTTPException(status_code=503, detail="No comparison models loaded (SERVED_MODELS)")
+    return router
+
+@app.get("/models")
+def list_models():
+    """Served comparison models with their memory footprint and predict latency"""
+    return {"models": require_router().stats()}
+
+@app.post("/models/compare")
+async def compare_models(request: Request, models: str = None):
+    """Score a batch against several models at once, side by side plus their soft-voting ensemble"""
+    routed   = require_router()
+    body     = await request.body()
+    patients = parse_batch(body, request.headers.get("content-type", ""))
+    if not patients:
+        return {"count": 0, "models": {}, "ensemble": []}
+    names = models.split(",") if models else None
+
+    def fan_out():
+        outputs = routed.fan_out(raw_features(patients), names)
+        return outputs, routed.ensemble(None, outputs=outputs)
+
+    start = time.perf_counter()
+    try:
+        outputs, ensemble = await run_in_threadpool(fan_out)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    ROUTED_TIME.observe(time.perf_counter() - start, model="compare")
+    return {
+        "count":    len(patients),
+        "models":   {name: routed_results(proba) for name, proba in outputs.items()},
+        "ensemble": routed_results(ensemble)
+    }
+
+@app.post("/models/{model_name}/predict")
+def predict_with_model(model_name: str, patient: PatientData):
+    """Score one patient with a named comparison model, or `ensemble` for soft voting over all of them"""
+    routed = require_router()
+    X      = raw_features([patient])
+    start  = time.perf_counter()
+    try:
+        proba = routed.ensemble(X) if model_name == "ensemble" else routed.predict_proba(model_name, X)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    ROUTED_TIME.observe(time.perf_counter() - start, model=model_name)
+    return {"model": model_name, **routed_results(proba)[0]}
+
+@app.get("/metrics")
+def metrics():
+    serving = holder.current
+    MODEL_INFO.reset()
+    if serving is not None:
+        MODEL_INFO.set(1, version=serving.version, source=serving.source, scorer=type(serving.scorer).__name__)
+        if serving.load_seconds is not None:
+            MODEL_LOAD.set(round(serving.load_seconds, 6))
+    if result_cache is not None:
+        for event, value in result_cache.stats().items():
+            if event in ("size", "hits", "shared_hits", "misses", "evictions", "expired"):
+                CACHE_EVENTS.set(value, event=event)
+    if drift_monitor is not None:
+        latest = {"sliding": drift_monitor.sliding, "tumbling": drift_monitor.tumbling[-1] if drift_monitor.tumbling else None}
+        for window, summary in latest.items():
+            if summary is not None:
+                DRIFT_SHARE.set(summary["share_of_drifted_columns"], window=window)
+    metric_list = [REQUESTS, REQUEST_TIME, STAGE_TIME, PREDICTIONS, RISK_LEVELS, MODEL_INFO, MODEL_LOAD, CACHE_EVENTS, DRIFT_SHARE, ROUTED_TIME]
+    return PlainTextResponse(render(metric_list), media_type="text/plain; version=0.0.4")
+
+@app.get("/drift")
+def drift():
+    if drift_monitor is None:
+        return {"enabled": False}
+    return {"enabled": True, **drift_monitor.status()}
+
+@app.get("/model/version")
+def model_version():
+    serving = holder.current
+    if serving is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return {**serving.info(), "hot_reload": watcher.status() if watcher else None}
+
 @app.get("/model/info")
 def model_info():
-    return {"model_type": type(model).__name__ if model else "Not loaded", "accuracy": "86.97%", "roc_auc": "94.50%", "f1_score": "87.84%"}
+    serving = holder.current
+    metrics = serving.metrics if serving else {}
+    # Metrics logged with the served model's training run; any that aren't known are left out
+    return {"model_type": type(serving.model).__name__ if serving else "Not loaded",
+            "scorer": type(serving.scorer).__name__ if serving else "Not loaded",
+            "version": serving.version if serving else None,
+            **{name: metrics[name] for name in METRIC_NAMES if name in metrics}}
@@ -0,0 +1,96 @@
+# src/batching.py
+import asyncio
+
+from src.metrics import Histogram
+
+
+class MicroBatcher:
+    """
+    Merges concurrent single-row requests into one scoring call.
+
+    Callers `await submit(item)`; a background task drains the queue until it holds
+    `max_batch_size` items or `max_wait_ms` has passed since the first one arrived,
+    runs `score_fn(items)` in a worker thread and resolves each caller's future with
+    its own entry of the returned list.
+    """
+
+    def __init__(self, score_fn, max_batch_size=32, max_wait_ms=2.0):
+        self.score_fn       = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait       = max_wait_ms / 1000.0
+        self.queue_depth    = Histogram("heart_batcher_queue_depth", "Queued requests seen by each submit",
+                                        buckets=[0, 1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.batch_size     = Histogram("heart_batcher_batch_size", "Requests merged into each scoring call",
+                                        buckets=[1, 2, 4, 8, 16, 32, 64, 128])
+        self.batch_latency  = Histogram("heart_batcher_batch_ms", "Milliseconds per scoring call",
+                                        buckets=[0.5, 1, 2, 5, 10, 25, 50, 100])
+        self._queue  = None
+        self._wakeup = None
+        self._task   = None
+
+    async def start(self):
+        self._queue  = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._task   = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self.queue_depth.observe(self._queue.qsize())
+        self._queue.put_nowait((item, future))
+        self._wakeup.set()
+        return await future
+
+    async def _collect(self):
+        loop  = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.batch_size.observe(len(batch))
+            start = loop.time()
+            try:
+                results = await asyncio.to_thread(self.score_fn, [item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batch_latency.observe((loop.time() - start) * 1000)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms":    self.max_wait * 1000,
+            "queued":         self._queue.qsize() if self._queue else 0,
+            "queue_depth":    self.queue_depth.snapshot(),
+            "batch_size":     self.batch_size.snapshot(),
+            "batch_latency_ms": self.batch_latency.snapshot()
+        }
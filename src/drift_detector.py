@@ -1,36 +1,40 @@
 # src/drift_detector.py
 import pandas as pd
-from evidently.report import Report
-from evidently.metric_preset import DataDriftPreset
-from evidently.metrics import DatasetDriftMetric
 import os
 
+from src.drift_engine import load_reference_sketch, share_of_drifted_columns
+
 def check_drift(
     reference_path="data/heart.csv",
     current_path="data/current_data.csv",
-    threshold=0.2
+    threshold=0.2,
+    html_report=False
 ):
-    # ── Load data ─────────────────────────────────────────────
-    reference = pd.read_csv(reference_path)
-    current   = pd.read_csv(current_path)
+    # ── Load data (reference comes from its persisted sketch) ─
+    sketch  = load_reference_sketch(reference_path)
+    current = pd.read_csv(current_path)
 
-    print(f"Reference data shape : {reference.shape}")
+    print(f"Reference data shape : ({sketch.n_rows}, {len(sketch.columns)})")
     print(f"Current data shape   : {current.shape}")
 
-    # ── Full visual drift report ───────────────────────────────
-    os.makedirs("reports", exist_ok=True)
-    report = Report(metrics=[DataDriftPreset()])
-    report.run(reference_data=reference, current_data=current)
-    report.save_html("reports/drift_report.html")
-    print("✅ Drift report saved to reports/drift_report.html")
-
     # ── Programmatic drift check ───────────────────────────────
-    drift_check = Report(metrics=[DatasetDriftMetric()])
-    drift_check.run(reference_data=reference, current_data=current)
-    result = drift_check.as_dict()
+    results = sketch.compare(current)
+    for name, r in results.items():
+        flag = "DRIFT" if r["drifted"] else "ok"
+        print(f"  {name:20s} {r['test']:10s} p={r['p_value']:.4f} psi={r['psi']:.4f} {flag}")
+
+    drifted_columns = share_of_drifted_columns(results)
+
+    # ── Full visual drift report (only when asked) ─────────────
+    if html_report:
+        from evidently.report import Report
+        from evidently.metric_preset import DataDriftPreset
+        os.makedirs("reports", exist_ok=True)
+        report = Report(metrics=[DataDriftPreset()])
+        report.run(reference_data=pd.read_csv(reference_path), current_data=current)
+        report.save_html("reports/drift_report.html")
+        print("✅ Drift report saved to reports/drift_report.html")
 
-    drifted_columns = result["metrics"][0]["result"]["share_of_drifted_columns"]
-    
     # ── Manual threshold check ────────────────────────────────
     drift_detected = drifted_columns >= threshold
 
@@ -41,7 +45,7 @@ def check_drift(
     return drift_detected
 
 
-if __name__ == "__main__":
+def main():
     # ── Simulate drift by shifting age and cholesterol ────────
     print("Creating simulated current data with drift...")
     
@@ -57,9 +61,14 @@ if __name__ == "__main__":
     print("✅ current_data.csv created with simulated drift")
 
     # ── Run drift detection ───────────────────────────────────
-    drift = check_drift()
+    drift = check_drift(html_report=True)
     
     if drift:
         print("\n🔁 Drift detected — retraining should be triggered")
     else:
-        print("\n✅ Model is stable — no retraining needed")
\ No newline at end of file
+        print("\n✅ Model is stable — no retraining needed")
+    return drift
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# src/drift_engine.py
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# ── Config ────────────────────────────────────────────────────
+SKETCH_PATH     = "models/reference_sketch.json"
+N_QUANTILES     = 100     # fine bins per numeric column (KS is evaluated on their edges)
+N_PSI_BINS      = 10      # fine bins are merged into this many equal-mass bins for PSI
+MAX_CATEGORIES  = 10      # integer columns with at most this many values are categorical
+P_VALUE         = 0.05    # KS / chi-square threshold for small current samples
+PSI_THRESHOLD   = 0.1     # used instead of p-values once the current sample is large
+LARGE_SAMPLE    = 1000    # same switch-over point Evidently uses for its default tests
+EPS             = 1e-6
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _psi(expected, actual):
+    expected = np.clip(expected, EPS, None)
+    actual   = np.clip(actual,   EPS, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class ReferenceSketch:
+    """
+    Per-column summary of the reference data, built once and reused for every check.
+
+    Numeric columns keep quantile bin edges and the reference counts in those bins;
+    categorical columns keep value counts. That is all KS, PSI and chi-square need,
+    so a drift check never has to reread the reference file.
+    """
+
+    def __init__(self, columns, n_rows, source_hash=None):
+        self.columns     = columns       # name -> {"kind": ..., ...}
+        self.n_rows      = n_rows
+        self.source_hash = source_hash
+
+    @classmethod
+    def build(cls, reference, source_hash=None):
+        columns = {}
+        for name in reference.columns:
+            values = reference[name].dropna()
+            is_int = pd.api.types.is_integer_dtype(values) or pd.api.types.is_bool_dtype(values)
+            if not pd.api.types.is_numeric_dtype(values) or (is_int and values.nunique() <= MAX_CATEGORIES):
+                counts = values.value_counts()
+                counts.index = counts.index.astype(str)
+                columns[name] = {"kind": "categorical",
+                                 "categories": counts.index.tolist(),
+                                 "counts": counts.to_numpy().tolist()}
+            else:
+                arr    = values.to_numpy(dtype=np.float64)
+                edges  = np.unique(np.quantile(arr, np.linspace(0, 1, N_QUANTILES + 1)))
+                counts = np.bincount(np.searchsorted(edges, arr, side="right"), minlength=len(edges) + 1)
+                columns[name] = {"kind": "numeric", "edges": edges.tolist(), "counts": counts.tolist()}
+        return cls(columns, len(reference), source_hash)
+
+    def save(self, path=SKETCH_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"n_rows": self.n_rows, "source_hash": self.source_hash, "columns": self.columns}, f)
+
+    @classmethod
+    def load(cls, path=SKETCH_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["columns"], data["n_rows"], data.get("source_hash"))
+
+    # ── Per-column tests ──────────────────────────────────────
+    def _numeric(self, spec, values):
+        edges   = np.asarray(spec["edges"])
+        ref     = np.asarray(spec["counts"], dtype=np.float64)
+        cur     = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(ref)).astype(np.float64)
+        n, m    = ref.sum(), cur.sum()
+        ref_cdf = np.cumsum(ref) / n
+        cur_cdf = np.cumsum(cur) / m
+
+        ks_stat = float(np.max(np.abs(ref_cdf - cur_cdf)))
+        ks_p    = float(stats.kstwobign.sf(ks_stat * np.sqrt(n * m / (n + m))))
+
+        # Merge fine bins into ~equal reference-mass bins for PSI
+        starts = np.searchsorted(ref_cdf, np.linspace(0, 1, N_PSI_BINS, endpoint=False)[1:], side="right")
+        starts = np.unique(np.concatenate([[0], np.minimum(starts, len(ref) - 1)]))
+        psi    = _psi(np.add.reduceat(ref, starts) / n, np.add.reduceat(cur, starts) / m)
+        return {"test": "ks", "statistic": ks_stat, "p_value": ks_p, "psi": psi}
+
+    def _categorical(self, spec, values):
+        if values.dtype.kind == "f" and np.all(values == np.round(values)):
+            values = values.astype(np.int64)   # 1.0 must match the reference category "1"
+        cur_counts = pd.Series(values).value_counts()
+        cur_counts.index = cur_counts.index.astype(str)
+        categories = list(spec["categories"]) + [c for c in cur_counts.index if c not in spec["categories"]]
+        ref = np.array(list(spec["counts"]) + [0] * (len(categories) - len(spec["categories"])), dtype=np.float64)
+        cur = cur_counts.reindex(categories, fill_value=0).to_numpy(dtype=np.float64)
+        n, m = ref.sum(), cur.sum()
+
+        expected = np.clip(ref / n, EPS, None)
+        expected = expected / expected.sum() * m
+        chi2, p  = stats.chisquare(cur, expected)
+        return {"test": "chi_square", "statistic": float(chi2), "p_value": float(p), "psi": _psi(ref / n, cur / m)}
+
+    def compare(self, current):
+        """Drift results per column for a current DataFrame, in one pass over its columns"""
+        large   = len(current) > LARGE_SAMPLE
+        results = {}
+        for name, spec in self.columns.items():
+            if name not in current.columns:
+                continue
+            values = current[name].dropna()
+            if values.empty:
+                continue
+            if spec["kind"] == "numeric":
+                result = self._numeric(spec, values.to_numpy(dtype=np.float64))
+            else:
+                result = self._categorical(spec, values.to_numpy())
+            result["drifted"] = result["psi"] >= PSI_THRESHOLD if large else result["p_value"] < P_VALUE
+            results[name] = result
+        return results
+
+
+def load_reference_sketch(reference_path, sketch_path=SKETCH_PATH):
+    """Reuse the persisted sketch while the reference file is unchanged, otherwise rebuild it"""
+    source_hash = _file_hash(reference_path)
+    if os.path.exists(sketch_path):
+        sketch = ReferenceSketch.load(sketch_path)
+        if sketch.source_hash == source_hash:
+            return sketch
+    sketch = ReferenceSketch.build(pd.read_csv(reference_path), source_hash)
+    sketch.save(sketch_path)
+    return sketch
+
+
+def share_of_drifted_columns(results):
+    return sum(r["drifted"] for r in results.values()) / len(results) if results else 0.0
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # ── Benchmark: sketch engine vs the two Evidently reports ──
+    n_rows    = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    reference = pd.read_csv("data/heart.csv")
+    current   = reference.sample(n_rows, replace=True, random_state=42).reset_index(drop=True)
+    current["age"] = current["age"] + 20
+
+    start  = time.perf_counter()
+    sketch = ReferenceSketch.build(reference)
+    print(f"Sketch build         : {time.perf_counter() - start:.3f} s (once per reference file)")
+
+    start   = time.perf_counter()
+    results = sketch.compare(current)
+    print(f"Sketch drift check   : {time.perf_counter() - start:.3f} s on {n_rows:,} rows "
+          f"→ {share_of_drifted_columns(results):.0%} drifted")
+
+    try:
+        from evidently.report import Report
+        from evidently.metric_preset import DataDriftPreset
+        from evidently.metrics import DatasetDriftMetric
+    except ImportError:
+        print("Evidently not installed — skipping baseline")
+    else:
+        start = time.perf_counter()
+        Report(metrics=[DataDriftPreset()]).run(reference_data=reference, current_data=current)
+        check = Report(metrics=[DatasetDriftMetric()])
+        check.run(reference_data=reference, current_data=current)
+        share = check.as_dict()["metrics"][0]["result"]["share_of_drifted_columns"]
+        print(f"Evidently (2 reports): {time.perf_counter() - start:.3f} s → {share:.0%} drifted")
@@ -0,0 +1,107 @@
+# src/drift_monitor.py
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.drift_engine import share_of_drifted_columns
+
+
+class DriftMonitor:
+    """
+    Live drift tracking over the feature vectors the API actually scores.
+
+    `push` copies one row into a preallocated float32 ring buffer under a short
+    lock — O(1), no allocation. A background thread periodically compares
+    the most recent `sliding_size` rows and each completed, non-overlapping
+    block of `tumbling_size` rows against the training reference sketch.
+    """
+
+    def __init__(self, sketch, features, sliding_size=5000, tumbling_size=1000,
+                 interval=30.0, min_rows=100, history=24):
+        self.sketch        = sketch
+        self.features      = list(features)
+        self.sliding_size  = sliding_size
+        self.tumbling_size = tumbling_size
+        self.interval      = interval
+        self.min_rows      = min_rows
+        self.capacity      = 2 * max(sliding_size, tumbling_size)
+        self._buf          = np.zeros((self.capacity, len(self.features)), dtype=np.float32)
+        self._count        = 0
+        self._lock         = threading.Lock()
+        self._next_window  = 0
+        self.sliding       = None
+        self.tumbling      = deque(maxlen=history)
+        self._stopped      = threading.Event()
+        self._thread       = None
+
+    def push(self, values):
+        with self._lock:
+            self._buf[self._count % self.capacity] = values
+            self._count += 1
+
+    def _rows(self, start, stop):
+        """Copy rows [start, stop) of the stream out of the ring buffer"""
+        with self._lock:
+            if start < self._count - self.capacity:
+                return None   # already overwritten
+            return self._buf[np.arange(start, stop) % self.capacity]
+
+    def _summarise(self, rows, start):
+        results = self.sketch.compare(pd.DataFrame(rows, columns=self.features))
+        return {
+            "start":  start,
+            "rows":   len(rows),
+            "share_of_drifted_columns": round(share_of_drifted_columns(results), 4),
+            "drifted_columns": [name for name, r in results.items() if r["drifted"]],
+            "psi":    {name: round(r["psi"], 4) for name, r in results.items()},
+            "computed_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        }
+
+    def evaluate(self):
+        count = self._count
+        n     = min(count, self.sliding_size)
+        if n >= self.min_rows:
+            rows = self._rows(count - n, count)
+            if rows is not None:
+                summary = self._summarise(rows, count - n)
+                with self._lock:
+                    self.sliding = summary
+
+        while count - self._next_window >= self.tumbling_size:
+            start = self._next_window
+            self._next_window += self.tumbling_size
+            rows = self._rows(start, start + self.tumbling_size)
+            if rows is not None:
+                summary = self._summarise(rows, start)
+                with self._lock:
+                    self.tumbling.append(summary)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                print(f"Drift monitor error: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="drift-monitor")
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def status(self):
+        # Snapshot under the lock: the monitor thread appends to `tumbling` while requests read it
+        with self._lock:
+            count, sliding, tumbling = self._count, self.sliding, list(self.tumbling)
+        return {
+            "rows_seen":     count,
+            "sliding_size":  self.sliding_size,
+            "tumbling_size": self.tumbling_size,
+            "interval_seconds": self.interval,
+            "sliding":       sliding,
+            "tumbling":      tumbling
+        }
@@ -0,0 +1,112 @@
+# src/forest_scorer.py
+import numpy as np
+
+
+class CompiledForest:
+    """
+    A fitted random forest flattened into NumPy arrays.
+
+    Every node of every tree lives in one set of arrays (feature, threshold, left,
+    right, leaf value), with child indices already offset into the shared arrays.
+    Leaves point at themselves, so all trees can be walked together for a fixed
+    number of steps without checking which rows have finished.
+    """
+
+    def __init__(self, forest):
+        trees   = [est.tree_ for est in forest.estimators_]
+        counts  = np.array([t.node_count for t in trees])
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes   = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            leaf_value = tree.value[:, 0, :]
+            totals     = leaf_value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            value.append(leaf_value / totals)
+
+        self.feature   = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold)
+        self.left      = np.concatenate(left).astype(np.intp)
+        self.right     = np.concatenate(right).astype(np.intp)
+        self.value     = np.concatenate(value)
+        self.roots     = offsets.astype(np.intp)
+        self.depth     = max(t.max_depth for t in trees)
+        self.classes_  = forest.classes_
+        self.n_features_in_ = forest.n_features_in_
+
+    def predict_proba(self, X, block_size=4096):
+        # sklearn casts inputs to float32 before comparing against the float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.shape[0] <= block_size:
+            return self._predict_block(X)
+        # Large inputs go in row blocks so the (rows x trees) node matrix stays small
+        out = np.empty((X.shape[0], self.value.shape[1]))
+        for start in range(0, X.shape[0], block_size):
+            out[start:start + block_size] = self._predict_block(X[start:start + block_size])
+        return out
+
+    def _predict_block(self, X):
+        rows  = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes   = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def compile_forest(model):
+    """Return a CompiledForest for a single-output forest classifier, otherwise None"""
+    from sklearn.ensemble._forest import ForestClassifier
+    if not isinstance(model, ForestClassifier) or getattr(model, "n_outputs_", 1) != 1:
+        return None
+    return CompiledForest(model)
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+
+    # ── Parity against sklearn on data/heart.csv ──────────────
+    df = pd.read_csv("data/heart.csv")
+    X  = df.drop("target", axis=1)
+    y  = df["target"]
+
+    forest = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42, min_samples_split=2)
+    forest.fit(X, y)
+    compiled = compile_forest(forest)
+
+    expected = forest.predict_proba(X)
+    actual   = compiled.predict_proba(X.to_numpy())
+    assert np.allclose(expected, actual), "compiled forest disagrees with predict_proba"
+    assert (forest.predict(X) == compiled.predict(X.to_numpy())).all()
+    print(f"✅ Parity on {len(X)} rows (max abs diff {np.abs(expected - actual).max():.2e})")
+
+    # ── Per-row latency ───────────────────────────────────────
+    n_rows  = 500
+    rows_df = [X.iloc[[i]] for i in range(n_rows)]
+    rows_np = [X.iloc[[i]].to_numpy() for i in range(n_rows)]
+
+    start = time.perf_counter()
+    for row in rows_df:
+        forest.predict_proba(row)
+    sklearn_ms = (time.perf_counter() - start) / n_rows * 1000
+
+    start = time.perf_counter()
+    for row in rows_np:
+        compiled.predict_proba(row)
+    compiled_ms = (time.perf_counter() - start) / n_rows * 1000
+
+    print(f"sklearn predict_proba : {sklearn_ms:.3f} ms/row")
+    print(f"compiled forest       : {compiled_ms:.3f} ms/row")
+    print(f"Speed-up              : {sklearn_ms / compiled_ms:.1f}x")
@@ -0,0 +1,379 @@
+# src/history_store.py
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+HISTORY_DB   = os.environ.get("HISTORY_DB", "prediction_history.db")
+LEGACY_CSV   = "prediction_history.csv"
+FLUSH_ROWS   = 256     # rows per write transaction at most
+FLUSH_WAIT_S = 0.2     # how long the writer waits to fill a batch once a row arrives
+
+SCHEMA_VERSION = 2      # PRAGMA user_version; 0/1 = text columns as in the old CSV
+
+# CSV header -> column, in the order the History page shows them
+COLUMNS = {
+    "Date":         "ts",
+    "Patient Name": "patient_name",
+    "Patient ID":   "patient_id",
+    "Doctor":       "doctor",
+    "Age":          "age",
+    "Sex":          "sex",
+    "Cholesterol":  "cholesterol",
+    "BP":           "bp",
+    "Max HR":       "max_hr",
+    "Chest Pain":   "chest_pain",
+    "Result":       "result",
+    "Probability":  "probability",
+    "Risk":         "risk",
+}
+
+# Categorical columns are stored as their index in these lists
+CATEGORIES = {
+    "sex":        ["Female", "Male"],
+    "chest_pain": ["Typical", "Atypical", "Non-Anginal", "Asymptomatic"],
+    "result":     ["No Disease", "Heart Disease"],
+    "risk":       ["Low", "Medium", "High"],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts           INTEGER NOT NULL,      -- seconds since 1970-01-01, local wall-clock time
+    patient_name TEXT,
+    patient_id   TEXT,
+    doctor       TEXT,
+    age          INTEGER,
+    sex          INTEGER,               -- CATEGORIES codes
+    cholesterol  REAL,
+    bp           REAL,
+    max_hr       REAL,
+    chest_pain   INTEGER,
+    result       INTEGER,
+    probability  REAL,                  -- 0-1
+    risk         INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_doctor_ts ON predictions (doctor, ts);
+CREATE INDEX IF NOT EXISTS idx_predictions_ts        ON predictions (ts);
+CREATE INDEX IF NOT EXISTS idx_predictions_risk      ON predictions (risk, ts);
+
+-- Dashboard counts, kept current by the trigger below in the same transaction as the insert
+CREATE TABLE IF NOT EXISTS aggregates (
+    doctor    TEXT NOT NULL,
+    result    INTEGER NOT NULL,         -- -1 when unknown
+    risk      INTEGER NOT NULL,
+    age_group TEXT NOT NULL,
+    count     INTEGER NOT NULL,
+    PRIMARY KEY (doctor, result, risk, age_group)
+);
+CREATE TRIGGER IF NOT EXISTS predictions_aggregate AFTER INSERT ON predictions BEGIN
+    INSERT INTO aggregates (doctor, result, risk, age_group, count)
+    VALUES (COALESCE(NEW.doctor, ''), COALESCE(NEW.result, -1), COALESCE(NEW.risk, -1), {age_group}, 1)
+    ON CONFLICT (doctor, result, risk, age_group) DO UPDATE SET count = count + 1;
+END;
+"""
+
+# Same bins as the History page's pd.cut(bins=[0,40,50,60,70,100]); '' when out of range
+AGE_GROUPS = ["<40", "40-50", "50-60", "60-70", "70+"]
+AGE_GROUP_SQL = ("CASE WHEN {age} > 0 AND {age} <= 40 THEN '<40' WHEN {age} > 40 AND {age} <= 50 THEN '40-50' "
+                 "WHEN {age} > 50 AND {age} <= 60 THEN '50-60' WHEN {age} > 60 AND {age} <= 70 THEN '60-70' "
+                 "WHEN {age} > 70 AND {age} <= 100 THEN '70+' ELSE '' END")
+SCHEMA = SCHEMA.replace("{age_group}", AGE_GROUP_SQL.format(age="NEW.age"))
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _seconds(value):
+    """Datetime or date string -> integer seconds since the epoch (wall-clock, no timezone); None if unreadable"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    if not isinstance(value, datetime) or pd.isna(value):
+        return None
+    return int((value.replace(tzinfo=None) - EPOCH).total_seconds())
+
+
+def _number(value, cast=float):
+    try:
+        return None if value is None or pd.isna(value) else cast(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _probability(value):
+    if isinstance(value, str):
+        text = value.strip()
+        number = _number(text.rstrip("%"))
+        return number / 100 if number is not None and text.endswith("%") else number
+    return _number(value)
+
+
+_CODES = {column: {**{label: code for code, label in enumerate(labels)}, **{code: code for code in range(len(labels))}}
+          for column, labels in CATEGORIES.items()}
+
+
+def encode(record, now=None):
+    """
+    Record keyed by the CSV headers -> typed row for `predictions`.
+
+    Accepts what the app writes (datetimes, float probabilities, labels) as well as the
+    old CSV text ("2026-03-23 01:02", "47.6%"). Unknown labels become NULL, and a record
+    without a readable date is stamped with the time it is written.
+    """
+    get = record.get
+    ts  = _seconds(get("Date"))
+    return (ts if ts is not None else (now or _seconds(datetime.now())),
+            get("Patient Name"), get("Patient ID"), get("Doctor"),
+            _number(get("Age"), int), _CODES["sex"].get(get("Sex")),
+            _number(get("Cholesterol")), _number(get("BP")), _number(get("Max HR")),
+            _CODES["chest_pain"].get(get("Chest Pain")), _CODES["result"].get(get("Result")),
+            _probability(get("Probability")), _CODES["risk"].get(get("Risk")))
+
+
+def encode_frame(df):
+    now = _seconds(datetime.now())
+    df  = df.astype(object).where(df.notna(), None)
+    return [encode(record, now) for record in df.to_dict("records")]
+
+
+def decode(df):
+    """Typed columns back to CSV headers: datetimes, labels as pandas categoricals"""
+    if "ts" in df:
+        df["ts"] = pd.to_datetime(df["ts"], unit="s")
+    for column, labels in CATEGORIES.items():
+        if column in df:
+            df[column] = pd.Categorical.from_codes(df[column].fillna(-1).astype(int), labels)
+    return df.rename(columns={column: header for header, column in COLUMNS.items()})
+
+
+class HistoryStore:
+    """
+    Prediction history in SQLite (WAL), written by one background thread.
+
+    `append` only enqueues the record, so the UI never waits on disk. The writer drains
+    the queue in batches of up to FLUSH_ROWS rows, and each batch is one transaction, so
+    a crash loses at most the rows still queued and never leaves a partial row. Readers
+    use their own connections and WAL lets them run alongside the writer.
+
+    Dashboard counts come from the small `aggregates` table, which an insert trigger
+    updates inside each write transaction. Reading them costs the same at 1k or 1M rows.
+    """
+
+    def __init__(self, path=HISTORY_DB, legacy_csv=LEGACY_CSV):
+        self.path    = path
+        self._queue  = queue.Queue()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            exists  = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'predictions'").fetchone()
+            if exists and version < SCHEMA_VERSION:
+                self._migrate_text_columns(conn)
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            rows       = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            aggregated = conn.execute("SELECT COALESCE(SUM(count), 0) FROM aggregates").fetchone()[0]
+            if rows != aggregated:
+                self._rebuild_aggregates(conn)
+            empty = rows == 0
+        if empty and legacy_csv and os.path.exists(legacy_csv):
+            self.import_csv(legacy_csv)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="history-writer")
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _migrate_text_columns(self, conn):
+        """One transaction: copy a version 0/1 table (CSV text in every column) into the typed schema"""
+        conn.executescript("""
+            BEGIN;
+            DROP TRIGGER IF EXISTS predictions_aggregate;
+            DROP TABLE IF EXISTS aggregates;
+            DROP INDEX IF EXISTS idx_predictions_doctor_date;
+            DROP INDEX IF EXISTS idx_predictions_date;
+            DROP INDEX IF EXISTS idx_predictions_risk;
+            ALTER TABLE predictions RENAME TO predictions_text;
+        """ + SCHEMA + """
+            -- aggregates are rebuilt in one pass afterwards, and the trigger recreated
+            DROP TRIGGER predictions_aggregate;
+        """)
+        old = {column: header for header, column in COLUMNS.items() if column != "ts"}
+        old["date"] = "Date"
+        migrated = 0
+        for chunk in pd.read_sql_query(f"SELECT {', '.join(old)} FROM predictions_text ORDER BY id", conn,
+                                       chunksize=50_000):
+            rows = encode_frame(chunk.rename(columns=old))
+            self._insert(conn, rows)
+            migrated += len(rows)
+        conn.execute("DROP TABLE predictions_text")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        print(f"History: migrated {migrated:,} rows to typed columns")
+
+    def _rebuild_aggregates(self, conn):
+        with conn:
+            conn.execute("DELETE FROM aggregates")
+            conn.execute(f"""
+                INSERT INTO aggregates (doctor, result, risk, age_group, count)
+                SELECT COALESCE(doctor, ''), COALESCE(result, -1), COALESCE(risk, -1), {AGE_GROUP_SQL.format(age="age")}, COUNT(*)
+                FROM predictions GROUP BY 1, 2, 3, 4""")
+
+    # ── Writes ────────────────────────────────────────────────
+    def append(self, record):
+        """Queue one record keyed by the CSV headers (Date, Patient Name, ...); it is encoded by the writer"""
+        self._queue.put(record)
+
+    def _insert(self, conn, rows):
+        placeholders = ",".join("?" * len(COLUMNS))
+        conn.executemany(f"INSERT INTO predictions ({','.join(COLUMNS.values())}) VALUES ({placeholders})", rows)
+
+    def _write(self, conn, rows):
+        with conn:
+            self._insert(conn, rows)
+
+    def _run(self):
+        conn = self._connect()
+        while True:
+            records = [self._queue.get()]
+            try:
+                while len(records) < FLUSH_ROWS:
+                    records.append(self._queue.get(timeout=FLUSH_WAIT_S))
+            except queue.Empty:
+                pass
+            try:
+                now = _seconds(datetime.now())
+                self._write(conn, [encode(record, now) for record in records])
+            except (sqlite3.Error, ValueError, TypeError) as e:
+                print(f"History write failed ({len(records)} rows): {e}")
+            finally:
+                for _ in records:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued record is committed"""
+        self._queue.join()
+
+    def import_csv(self, csv_path):
+        """One-shot import of a prediction_history.csv (text dates, "47.6%" probabilities)"""
+        rows = encode_frame(pd.read_csv(csv_path))
+        with self._connect() as conn:
+            self._write(conn, rows)
+        return len(rows)
+
+    # ── Reads ─────────────────────────────────────────────────
+    def _read(self, sql, params=()):
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+
+    def query(self, doctor=None, risk=None, result=None, since=None, until=None, search=None, limit=None,
+              columns=None):
+        """
+        Records matching every given filter, newest first, with the CSV headers as columns.
+
+        Only `columns` (CSV headers; default all) are read. Date comes back as datetime64,
+        Probability as a 0-1 float, and Sex/Chest Pain/Result/Risk as categoricals.
+        """
+        where, params = [], []
+        for column, value in (("doctor", doctor), ("risk", risk), ("result", result)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(CATEGORIES[column].index(value) if column in CATEGORIES else value)
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(_seconds(since))
+        if until is not None:
+            where.append("ts < ?")
+            params.append(_seconds(until))
+        if search:
+            where.append("(patient_name LIKE ? OR patient_id LIKE ?)")
+            params += [f"%{search}%", f"%{search}%"]
+        sql = f"SELECT {', '.join(COLUMNS[header] for header in columns or COLUMNS)} FROM predictions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC, id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return decode(self._read(sql, params))
+
+    def summary(self, doctor=None):
+        """Counts for the History page header cards and risk chart, from the aggregates table"""
+        sql = ("SELECT COALESCE(SUM(count), 0) AS total,"
+               " COALESCE(SUM(CASE WHEN result = 1 THEN count END), 0) AS disease,"
+               " COALESCE(SUM(CASE WHEN result = 0 THEN count END), 0) AS no_disease,"
+               " COALESCE(SUM(CASE WHEN risk = 2 THEN count END), 0) AS high,"
+               " COALESCE(SUM(CASE WHEN risk = 1 THEN count END), 0) AS medium,"
+               " COALESCE(SUM(CASE WHEN risk = 0 THEN count END), 0) AS low"
+               " FROM aggregates" + (" WHERE doctor = ?" if doctor else ""))
+        row = self._read(sql, (doctor,) if doctor else ()).iloc[0]
+        return {k: int(v) for k, v in row.items()}
+
+    def age_groups(self, result="Heart Disease", doctor=None):
+        """Record counts per age group (AGE_GROUPS order) for one result"""
+        sql = "SELECT age_group, SUM(count) AS count FROM aggregates WHERE result = ?"
+        params = [CATEGORIES["result"].index(result)]
+        if doctor:
+            sql += " AND doctor = ?"
+            params.append(doctor)
+        counts = self._read(sql + " GROUP BY age_group", params).set_index("age_group")["count"]
+        return counts.reindex(AGE_GROUPS, fill_value=0).astype(int)
+
+    def doctors(self):
+        return self._read("SELECT DISTINCT doctor FROM aggregates WHERE doctor != '' ORDER BY doctor")["doctor"].tolist()
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+    from datetime import timedelta
+
+    # ── History page render cost at growing history sizes ─────
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 100_000, 1_000_000]
+    start_date = datetime(2026, 1, 1)
+
+    def record(i):
+        return {"Date": start_date + timedelta(minutes=i),
+                "Patient Name": f"patient {i}", "Patient ID": f"PT{i:07d}",
+                "Doctor": f"doctor{i % 20}", "Age": 30 + i % 50, "Sex": "Male",
+                "Cholesterol": 200, "BP": 120, "Max HR": 150, "Chest Pain": "Typical",
+                "Result": "Heart Disease" if i % 3 else "No Disease",
+                "Probability": 0.64, "Risk": ["High", "Medium", "Low"][i % 3]}
+
+    print(f"{'rows':>10} {'append µs':>10} {'rows/s':>9} {'render ms':>10} {'full scan ms':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store, written = HistoryStore(os.path.join(tmp, "history.db"), legacy_csv=None), 0
+        for n in sizes:
+            start = time.perf_counter()
+            for i in range(written, n):
+                store.append(record(i))
+            enqueue = time.perf_counter() - start
+            store.flush()
+            rate = (n - written) / (time.perf_counter() - start)
+            enqueue_us = enqueue / (n - written) * 1e6
+            written = n
+
+            # Header cards, risk chart, age chart and the doctor filter options
+            start = time.perf_counter()
+            store.summary(), store.age_groups(), store.doctors()
+            render_ms = (time.perf_counter() - start) * 1000
+
+            # What the page used to do: load every row, then count in pandas
+            start = time.perf_counter()
+            df = store.query()
+            df["Risk"].value_counts(), df["Doctor"].unique()
+            pd.cut(df.loc[df["Result"] == "Heart Disease", "Age"], bins=[0, 40, 50, 60, 70, 100]).value_counts()
+            full_ms = (time.perf_counter() - start) * 1000
+            print(f"{n:>10,} {enqueue_us:>10.2f} {rate:>9,.0f} {render_ms:>10.1f} {full_ms:>13.1f}")
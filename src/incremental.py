@@ -0,0 +1,253 @@
+# src/incremental.py
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import STD_COLS, MM_COLS, CATEGORICAL_COLS, FusedPreprocessor
+
+# ── Config ────────────────────────────────────────────────────
+STATE_PATH       = os.environ.get("TRAIN_STATE_PATH", "models/train_state.pkl")
+TREES_PER_UPDATE = int(os.environ.get("INCREMENTAL_TREES", "25"))    # trees added per update
+MAX_TREES        = int(os.environ.get("INCREMENTAL_MAX_TREES", "100"))  # oldest trees beyond this are dropped
+MIN_BATCH_ROWS   = 200     # new trees see at least this many rows, topped up with the latest seen ones
+# Updates between full refits. New trees see only recent rows, so the forest drifts toward
+# them; the default refits before the last tree from the previous full fit is dropped.
+MAX_UPDATES      = int(os.environ.get("INCREMENTAL_MAX_UPDATES", str(max(MAX_TREES // TREES_PER_UPDATE - 1, 0))))
+HOLDOUT_SHARE    = 0.2
+HOLDOUT_KEY      = "heart-holdout-01"   # 16-character salt for the row hash
+
+
+def holdout_mask(df):
+    """
+    Test rows, keyed on a hash of each row's values (target included).
+
+    A row's side depends only on its contents, so it stays put as the file grows and
+    new trees never train on an old test row; duplicate rows always land together.
+    Every class is held out at the same HOLDOUT_SHARE rate.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False, hash_key=HOLDOUT_KEY).to_numpy()
+    return hashes < np.uint64(HOLDOUT_SHARE * 2**64)
+
+
+def data_digest(df):
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def encode_categories(df, categories):
+    """LabelEncoder.transform for every categorical column; None if a column has an unseen value"""
+    df = df.copy()
+    for col, classes in categories.items():
+        values = df[col].astype(str).to_numpy()
+        codes  = np.searchsorted(classes, values)
+        if (codes >= len(classes)).any() or (classes[np.minimum(codes, len(classes) - 1)] != values).any():
+            return None
+        df[col] = codes
+    return df
+
+
+def fit_state(df, model, std_scaler, mm_scaler):
+    """State after a full fit on every row of df (raw, as read from the CSV)"""
+    return {
+        "model":      model,
+        "std_scaler": std_scaler,
+        "mm_scaler":  mm_scaler,
+        "categories": {col: np.unique(df[col].astype(str)) for col in CATEGORICAL_COLS if col in df.columns},
+        "columns":    list(df.columns),
+        "rows_seen":  len(df),
+        "digest":     data_digest(df),
+        "updates":    0,
+    }
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def pending_path(path=STATE_PATH):
+    """Where a run's state waits until its model has passed the promotion gate"""
+    return path + ".pending"
+
+
+def promote_state(path=STATE_PATH):
+    """Make the pending state the one the next incremental run builds on; False if there is none"""
+    if not os.path.exists(pending_path(path)):
+        return False
+    os.replace(pending_path(path), path)
+    return True
+
+
+def discard_pending_state(path=STATE_PATH):
+    if os.path.exists(pending_path(path)):
+        os.remove(pending_path(path))
+
+
+def new_rows(state, df):
+    """Rows appended since the state was saved, or None when the file was rewritten rather than grown"""
+    if state is None or list(df.columns) != state["columns"] or len(df) < state["rows_seen"]:
+        return None
+    if data_digest(df.iloc[:state["rows_seen"]]) != state["digest"]:
+        return None
+    return df.iloc[state["rows_seen"]:]
+
+
+def scale(df, std_scaler, mm_scaler):
+    df = df.copy()
+    df[STD_COLS] = std_scaler.transform(df[STD_COLS])
+    df[MM_COLS]  = mm_scaler.transform(df[MM_COLS])
+    return df
+
+
+def rescale_thresholds(model, before, after, seen):
+    """
+    Move every split threshold from the `before` to the `after` scaling.
+
+    Both scalings are per-column x * a + b with a > 0, so z' = a'/a * (z - b) + b' maps
+    an old threshold to the one that splits the same raw values. Trees compare float32
+    inputs and often split right on a training value, so the mapped threshold is then
+    clamped between the neighbouring `seen` raw values (encoded, in feature order) as
+    they round after rescaling. Every seen value keeps its side of every split.
+    """
+    ratio   = after.scale / before.scale
+    changed = np.flatnonzero((ratio != 1) | (after.offset != before.offset))
+    bounds  = {}
+    for j in changed:
+        values  = np.unique(seen[:, j])
+        old     = (values * before.scale[j] + before.offset[j]).astype(np.float32)
+        new     = (values * after.scale[j] + after.offset[j]).astype(np.float32)
+        bounds[j] = old, np.nextafter(new, np.float32(np.inf)), np.nextafter(new, np.float32(-np.inf))
+
+    for tree in model.estimators_:
+        nodes = tree.tree_
+        for j in changed:
+            split = np.flatnonzero(nodes.feature == j)
+            if len(split) == 0:
+                continue
+            old, above, below = bounds[j]
+            t     = nodes.threshold[split]
+            moved = ratio[j] * (t - before.offset[j]) + after.offset[j]
+            k     = np.searchsorted(old, t, side="right")      # seen values on the left
+            lo    = np.where(k > 0, above[np.maximum(k - 1, 0)], -np.inf)
+            hi    = np.where(k < len(old), below[np.minimum(k, len(old) - 1)], np.inf)
+            nodes.threshold[split] = np.clip(moved, lo, np.maximum(lo, hi))
+
+
+def update_forest(state, df, target="target"):
+    """
+    Grow the state's warm-start forest on the rows appended to df since the last fit.
+
+    Scalers take the new rows through partial_fit, and the existing trees' thresholds
+    are rescaled to match. TREES_PER_UPDATE trees are then fit on the new training rows,
+    topped up to MIN_BATCH_ROWS with the latest earlier ones. Trees beyond MAX_TREES are
+    dropped oldest first. Returns the updated state, or None when a full refit is needed:
+    the file was rewritten, a category is unseen, the batch lacks a class, or MAX_UPDATES
+    updates have run since the last full fit. All of these are checked before anything
+    in the state is changed.
+    """
+    if state.get("updates", 0) >= MAX_UPDATES:
+        return None
+    fresh = new_rows(state, df)
+    if fresh is None or len(fresh) == 0:
+        return None
+    encoded = encode_categories(df, state["categories"])
+    if encoded is None:
+        return None
+
+    # ── Pick the batch and check it before touching the state ──
+    model, std_scaler, mm_scaler = state["model"], state["std_scaler"], state["mm_scaler"]
+    features = list(model.feature_names_in_)
+    train    = ~holdout_mask(df)
+    new_idx  = np.flatnonzero(train[state["rows_seen"]:]) + state["rows_seen"]
+    old_idx  = np.flatnonzero(train[:state["rows_seen"]])
+    need     = MIN_BATCH_ROWS - len(new_idx)
+    batch    = np.concatenate([old_idx[-need:] if need > 0 else old_idx[:0], new_idx])
+    if set(np.unique(encoded[target].iloc[batch])) != set(model.classes_):
+        return None
+
+    # ── Running scaler statistics (all rows, as a full fit does) ─
+    before = FusedPreprocessor(std_scaler, mm_scaler, features)
+    std_scaler.partial_fit(fresh[STD_COLS])
+    mm_scaler.partial_fit(fresh[MM_COLS])
+    after  = FusedPreprocessor(std_scaler, mm_scaler, features)
+    seen   = encoded.iloc[:state["rows_seen"]][features].to_numpy(dtype=float)
+    rescale_thresholds(model, before, after, seen)
+
+    # ── New trees on the new rows (plus recent ones if too few) ─
+    rows = scale(encoded.iloc[batch], std_scaler, mm_scaler)
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + TREES_PER_UPDATE,
+                     random_state=state["rows_seen"] + len(fresh))
+    model.fit(rows[features], rows[target])
+    model.estimators_   = model.estimators_[-MAX_TREES:]
+    model.n_estimators  = len(model.estimators_)
+
+    return {**state, "rows_seen": len(df), "digest": data_digest(df), "updates": state.get("updates", 0) + 1}
+
+
+def holdout(df, state, target="target", test=True):
+    """Scaled holdout rows (X, y) for scoring a state's model; test=False gives the training rows"""
+    encoded = encode_categories(df, state["categories"])
+    rows    = scale(encoded[holdout_mask(df) == test], state["std_scaler"], state["mm_scaler"])
+    return rows[list(state["model"].feature_names_in_)], rows[target]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score
+    from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
+    # ── Data arriving in batches: incremental update vs full refit ──
+    # Rows are data/heart.csv resampled with small noise on the continuous columns
+    n_batches  = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    batch_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    base = pd.read_csv("data/heart.csv")
+    rng  = np.random.default_rng(0)
+    data = base.sample(n_batches * batch_rows, replace=True, random_state=0).reset_index(drop=True)
+    for col in STD_COLS + MM_COLS:
+        data[col] = data[col] + rng.normal(0, data[col].std() * 0.05, len(data))
+    params = {"n_estimators": 100, "max_depth": 5, "random_state": 42, "min_samples_split": 2}
+
+    def full_fit(df):
+        train = df[~holdout_mask(df)]
+        std   = StandardScaler().fit(df[STD_COLS])
+        mm    = MinMaxScaler().fit(df[MM_COLS])
+        state = fit_state(df, None, std, mm)
+        X     = scale(encode_categories(train, state["categories"]), std, mm)
+        state["model"] = RandomForestClassifier(**params).fit(X.drop(columns="target"), X["target"])
+        return state
+
+    print(f"{'rows':>8} {'full s':>7} {'incr s':>7} {'full acc':>9} {'incr acc':>9} {'trees':>6}")
+    state = None
+    for b in range(1, n_batches + 1):
+        df = data.iloc[:b * batch_rows]
+        start = time.perf_counter()
+        full  = full_fit(df)
+        full_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        state = update_forest(state, df) if state else None
+        if state is None:
+            state = full_fit(df)
+        incr_s = time.perf_counter() - start
+
+        scores = []
+        for s in (full, state):
+            X, y = holdout(df, s)
+            scores.append(accuracy_score(y, s["model"].predict(X)))
+        print(f"{len(df):>8,} {full_s:>7.2f} {incr_s:>7.2f} {scores[0]:>9.4f} {scores[1]:>9.4f} "
+              f"{len(state['model'].estimators_):>6}")
@@ -0,0 +1,91 @@
+# src/inference_client.py
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Base URL of a running src/api.py (e.g. http://localhost:8000); unset keeps scoring in-process
+INFERENCE_URL         = os.environ.get("INFERENCE_URL", "")
+INFERENCE_TIMEOUT     = float(os.environ.get("INFERENCE_TIMEOUT", "2"))
+# After a failed call, go straight to the fallback for this many seconds instead of waiting on timeouts
+INFERENCE_RETRY_AFTER = float(os.environ.get("INFERENCE_RETRY_AFTER", "30"))
+INFERENCE_POOL_SIZE   = int(os.environ.get("INFERENCE_POOL_SIZE", "10"))
+
+# /predict payload keys, in FEATURES order
+PAYLOAD_FIELDS = ["age", "sex", "chest_pain_type", "resting_bp", "cholesterol",
+                  "fasting_blood_sugar", "resting_ecg", "max_heart_rate",
+                  "exercise_angina", "oldpeak", "st_slope"]
+
+
+class InferenceClient:
+    """
+    Scores through the shared FastAPI service over one pooled keep-alive session.
+
+    `fallback(values)` is called when the service errors, times out or was failing
+    recently, so a UI keeps working (with an in-process model) while the service is down.
+    """
+
+    def __init__(self, base_url, timeout=INFERENCE_TIMEOUT, fallback=None,
+                 retry_after=INFERENCE_RETRY_AFTER, pool_size=INFERENCE_POOL_SIZE):
+        self.url         = base_url.rstrip("/") + "/predict"
+        self.timeout     = timeout
+        self.fallback    = fallback
+        self.retry_after = retry_after
+        self.session     = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._down_until = 0.0
+        self._lock       = threading.Lock()
+        self.stats       = {"remote": 0, "fallback": 0, "errors": 0}
+
+    @classmethod
+    def from_env(cls, fallback=None):
+        return cls(INFERENCE_URL, fallback=fallback) if INFERENCE_URL else None
+
+    def _remote(self, values):
+        response = self.session.post(self.url, json=dict(zip(PAYLOAD_FIELDS, values)), timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        # "probability" is rounded for display; score with the exact value, as the local fallback does
+        return int(data["prediction"]), float(data.get("probability_exact", data["probability"]))
+
+    @staticmethod
+    def _service_down(error):
+        """Errors that mean the service can't answer now, as opposed to a bad request"""
+        if isinstance(error, requests.HTTPError):
+            return error.response is not None and error.response.status_code >= 500
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def predict(self, values):
+        """
+        (prediction, probability of class 1, source) for one raw feature vector in FEATURES order.
+
+        Connection errors, timeouts and 5xx responses switch to the fallback; anything
+        else, such as a 422 for invalid input, is raised to the caller.
+        """
+        if time.monotonic() >= self._down_until:
+            try:
+                result = self._remote(values)
+                with self._lock:
+                    self.stats["remote"] += 1
+                return (*result, "remote")
+            except requests.RequestException as e:
+                if not self._service_down(e):
+                    raise
+                with self._lock:
+                    self.stats["errors"] += 1
+                    self._down_until = time.monotonic() + self.retry_after
+                print(f"⚠️  Inference service unavailable ({e}); scoring in-process for {self.retry_after:.0f}s")
+                if self.fallback is None:
+                    raise
+        elif self.fallback is None:
+            raise RuntimeError(f"Inference service at {self.url} is unavailable")
+        with self._lock:
+            self.stats["fallback"] += 1
+        return (*self.fallback(values), "local")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,213 @@
+# src/job_runner.py
+import contextlib
+import importlib
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+import uuid
+
+JOB_LOG_DIR  = os.environ.get("JOB_LOG_DIR", "logs/jobs")
+JOB_HISTORY  = 50     # finished jobs kept in memory (their logs stay on disk)
+POLL_S       = 0.5    # how often the monitor thread checks the worker for timeouts
+
+# kind -> entry point, timeout in seconds, and the log lines that mark progress
+JOBS = {
+    "drift": {
+        "target":  "src.drift_detector:main",
+        "timeout": 60,
+        "steps":   ["Creating simulated current data", "Reference data shape", "Drift report saved", "Drifted columns"],
+    },
+    "retrain": {
+        "target":  "src.retrain_pipeline:run_pipeline",
+        "timeout": 120,
+        "steps":   ["Step 1", "Step 2", "Step 3", "Step 4", "PIPELINE COMPLETE"],
+    },
+}
+# Imported once when the worker starts, so jobs skip the mlflow/evidently import cost
+WARM_IMPORTS = ["src.drift_detector", "src.retrain_pipeline", "evidently.report", "evidently.metric_preset"]
+
+
+def _worker(jobs, events, warm_imports):
+    """Worker process loop: warm the heavy imports, then run jobs one at a time"""
+    for name in warm_imports:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Job worker could not preload {name}: {e}", file=sys.stderr)
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        events.put(("running", job["id"], time.time(), None))
+        status, result = "succeeded", None
+        with open(job["log"], "a", buffering=1, encoding="utf-8") as log, \
+             contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            try:
+                module, func = job["target"].split(":")
+                result = getattr(importlib.import_module(module), func)()
+            except BaseException:
+                traceback.print_exc()
+                status = "failed"
+            finally:
+                if "mlflow" in sys.modules:
+                    sys.modules["mlflow"].end_run()   # don't leak a half-finished run into the next job
+        events.put((status, job["id"], time.time(), result if isinstance(result, (bool, int, float, str)) else None))
+
+
+class JobRunner:
+    """
+    Runs the drift and retrain jobs in one long-lived worker process.
+
+    The worker imports mlflow, evidently and the pipeline modules once, so a job pays
+    only for its own work. `submit` returns immediately; callers poll `status` and `log`,
+    which is written line by line while the job runs. A job of a kind that is already
+    queued or running is rejected. A job that outlives its timeout has its worker
+    killed and replaced.
+    """
+
+    def __init__(self, log_dir=JOB_LOG_DIR):
+        self.log_dir = log_dir
+        os.makedirs(log_dir, exist_ok=True)
+        # spawn: the parent (Streamlit, uvicorn) runs threads, which fork would copy mid-flight
+        self._ctx    = mp.get_context("spawn")
+        self._jobs   = self._ctx.Queue()
+        self._events = self._ctx.Queue()
+        self._lock   = threading.Lock()
+        self._state  = {}      # job id -> job record, in submission order
+        self._stop   = threading.Event()
+        self._process = None
+        self._start_worker()
+        self._monitor = threading.Thread(target=self._watch, daemon=True, name="job-monitor")
+        self._monitor.start()
+
+    def _start_worker(self):
+        self._process = self._ctx.Process(target=_worker, args=(self._jobs, self._events, WARM_IMPORTS),
+                                          daemon=True, name="job-worker")
+        self._process.start()
+
+    # ── Submission ────────────────────────────────────────────
+    def submit(self, kind):
+        """(job id, accepted). When a `kind` job is already active its id is returned with accepted=False."""
+        if kind not in JOBS:
+            raise ValueError(f"Unknown job {kind!r}; choose from {list(JOBS)}")
+        with self._lock:
+            for job in self._state.values():
+                if job["kind"] == kind and job["status"] in ("queued", "running"):
+                    return job["id"], False
+            job_id = f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            job = {"id": job_id, "kind": kind, "status": "queued", "submitted": time.time(),
+                   "started": None, "finished": None, "result": None,
+                   "log": os.path.join(self.log_dir, f"{job_id}.log")}
+            self._state[job_id] = job
+            self._trim()
+        open(job["log"], "w").close()
+        self._jobs.put({"id": job_id, "kind": kind, "target": JOBS[kind]["target"], "log": job["log"]})
+        return job_id, True
+
+    def _trim(self):
+        finished = [j for j in self._state.values() if j["status"] not in ("queued", "running")]
+        for job in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            del self._state[job["id"]]
+
+    # ── Monitoring ────────────────────────────────────────────
+    def _watch(self):
+        while not self._stop.is_set():
+            try:
+                status, job_id, at, result = self._events.get(timeout=POLL_S)
+                with self._lock:
+                    job = self._state.get(job_id)
+                    if job is not None and job["status"] in ("queued", "running"):
+                        if status == "running":
+                            job.update(status="running", started=at)
+                        else:
+                            job.update(status=status, finished=at, result=result)
+            except queue.Empty:
+                pass
+            self._check_worker()
+
+    def _check_worker(self):
+        with self._lock:
+            running = next((j for j in self._state.values() if j["status"] == "running"), None)
+            if running is not None and time.time() - running["started"] > JOBS[running["kind"]]["timeout"]:
+                running.update(status="timeout", finished=time.time())
+                self._append_log(running, f"\n⏱️ Job exceeded its {JOBS[running['kind']]['timeout']}s timeout and was stopped")
+            elif self._process.is_alive():
+                return
+            elif running is not None:
+                running.update(status="failed", finished=time.time())
+                self._append_log(running, f"\n❌ Job worker exited unexpectedly (code {self._process.exitcode})")
+            if self._stop.is_set():
+                return
+            self._process.kill()
+            self._process.join()
+            self._start_worker()
+
+    def _append_log(self, job, line):
+        with open(job["log"], "a", encoding="utf-8") as f:
+            print(line, file=f)
+
+    # ── Polling ───────────────────────────────────────────────
+    def log(self, job_id):
+        job = self._state.get(job_id)
+        if job is None or not os.path.exists(job["log"]):
+            return ""
+        with open(job["log"], encoding="utf-8", errors="replace") as f:
+            return f.read()
+
+    def status(self, job_id):
+        """Job record plus `progress` (0–1, from the step lines seen so far in its log), or None"""
+        with self._lock:
+            job = self._state.get(job_id)
+            job = dict(job) if job else None
+        if job is None:
+            return None
+        if job["status"] == "succeeded":
+            job["progress"] = 1.0
+        else:
+            output = self.log(job_id)
+            steps  = JOBS[job["kind"]]["steps"]
+            seen   = [i for i, marker in enumerate(steps) if marker in output]
+            job["progress"] = (max(seen) + 1) / (len(steps) + 1) if seen else 0.0
+        end = job["finished"] or time.time()
+        job["elapsed"] = round(end - job["started"], 1) if job["started"] else 0.0
+        return job
+
+    def latest(self, kind):
+        """Id of the most recently submitted job of `kind`, or None"""
+        with self._lock:
+            ids = [j["id"] for j in self._state.values() if j["kind"] == kind]
+        return ids[-1] if ids else None
+
+    def close(self):
+        self._stop.set()
+        self._jobs.put(None)
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.kill()
+
+
+if __name__ == "__main__":
+    import subprocess
+
+    # ── Cold subprocess vs warm worker, per job kind ──────────
+    kinds  = sys.argv[1:] or list(JOBS)
+    runner = JobRunner()
+    time.sleep(1)
+    print(f"{'job':<10} {'subprocess s':>13} {'warm worker s':>14} {'status':>10}")
+    for kind in kinds:
+        module = JOBS[kind]["target"].split(":")[0]
+        start  = time.perf_counter()
+        subprocess.run([sys.executable, "-m", module], capture_output=True, text=True, timeout=JOBS[kind]["timeout"])
+        cold   = time.perf_counter() - start
+
+        job_id, _ = runner.submit(kind)
+        while runner.status(job_id)["status"] in ("queued", "running"):
+            time.sleep(0.05)
+        job = runner.status(job_id)
+        print(f"{kind:<10} {cold:>13.2f} {job['elapsed']:>14.2f} {job['status']:>10}")
+    runner.close()
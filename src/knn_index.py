@@ -0,0 +1,207 @@
+# src/knn_index.py
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# ── Config ────────────────────────────────────────────────────
+INDEX_DIR    = os.environ.get("KNN_INDEX_DIR", "models/knn_index")
+KMEANS_ITERS = 10
+KMEANS_SAMPLE = 50000     # rows used to fit the coarse centroids
+ASSIGN_CHUNK = 20000      # rows per centroid-assignment block
+EXACT_BELOW  = 10000      # up to this many rows sklearn's vectorised exact scan is faster; no index
+
+
+def _sq_distances(X, centroids, centroid_norms):
+    """Squared euclidean distances, dropping the per-row ||x||² term (argmin is unchanged)"""
+    return centroid_norms - 2.0 * (X @ centroids.T)
+
+
+def _pairwise(X, q, metric):
+    diff = X - q
+    if metric == "manhattan":
+        return np.abs(diff).sum(axis=1)
+    return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+
+def fit_hash(X):
+    return hashlib.sha256(np.ascontiguousarray(X, dtype=np.float32).tobytes()).hexdigest()
+
+
+class IVFIndex:
+    """
+    Inverted-file index: k-means splits the reference rows into `n_lists` cells, and
+    rows are stored sorted by cell so each cell is one contiguous slice.
+
+    A query ranks the centroids, scans only the rows of its `n_probe` nearest cells
+    and re-ranks them exactly in the model's metric. Saved as .npy files that `load`
+    memory-maps, so opening an index costs next to nothing regardless of its size.
+    """
+
+    def __init__(self, centroids, offsets, X, y, metric="euclidean", meta=None):
+        self.centroids = centroids
+        self.centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+        self.offsets   = offsets      # cell c holds rows offsets[c]:offsets[c + 1]
+        self.X         = X
+        self.y         = y
+        self.metric    = metric
+        self.meta      = meta or {}
+
+    @classmethod
+    def build(cls, X, y, metric="euclidean", n_lists=None, seed=42, meta=None):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n = len(X)
+        n_lists = n_lists or int(np.clip(4 * np.sqrt(n), 1, 4096))
+        rng = np.random.default_rng(seed)
+
+        sample    = X[rng.choice(n, min(n, KMEANS_SAMPLE), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERS):
+            norms  = np.einsum("ij,ij->i", centroids, centroids)
+            labels = _sq_distances(sample, centroids, norms).argmin(axis=1)
+            sums   = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+
+        norms  = np.einsum("ij,ij->i", centroids, centroids)
+        labels = np.concatenate([_sq_distances(X[i:i + ASSIGN_CHUNK], centroids, norms).argmin(axis=1)
+                                 for i in range(0, n, ASSIGN_CHUNK)])
+        order   = np.argsort(labels, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+        return cls(centroids, offsets, X[order], np.asarray(y)[order], metric, meta)
+
+    def save(self, directory=INDEX_DIR):
+        os.makedirs(directory, exist_ok=True)
+        for name in ("centroids", "offsets", "X", "y"):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        # meta.json last: an index without it is incomplete
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({**self.meta, "metric": self.metric, "n_rows": len(self.X), "n_lists": len(self.centroids)}, f)
+
+    @classmethod
+    def load(cls, directory=INDEX_DIR, mmap=True):
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+                  for name in ("centroids", "offsets", "X", "y")}
+        return cls(np.asarray(arrays["centroids"]), np.asarray(arrays["offsets"]),
+                   arrays["X"], arrays["y"], meta["metric"], meta)
+
+    def search(self, q, k, n_probe=8):
+        """
+        Indices into self.X and distances of (approximately) the k nearest rows to q.
+
+        Probes the `n_probe` nearest cells, and further ones in order when those hold
+        fewer than k rows, so k rows come back whenever the index has them.
+        """
+        q      = np.asarray(q, dtype=np.float32)
+        ranked = np.argsort(self.centroid_norms - 2.0 * (self.centroids @ q))
+        held   = np.cumsum(np.diff(self.offsets)[ranked])
+        cells  = ranked[:max(n_probe, int(np.searchsorted(held, k)) + 1)]
+        spans = [(self.offsets[c], self.offsets[c + 1]) for c in cells]
+        idx   = np.concatenate([np.arange(a, b) for a, b in spans])
+        dist  = _pairwise(np.concatenate([self.X[a:b] for a, b in spans]), q, self.metric)
+        if len(idx) > k:
+            top = np.argpartition(dist, k)[:k]
+            idx, dist = idx[top], dist[top]
+        order = np.argsort(dist)
+        return idx[order], dist[order]
+
+
+class IVFKNeighborsClassifier:
+    """KNeighborsClassifier.predict_proba over an IVFIndex, for the API scorers"""
+
+    def __init__(self, index, classes, n_neighbors=5, weights="uniform", n_probe=8):
+        self.index       = index
+        self.classes_    = np.asarray(classes)
+        self.n_neighbors = n_neighbors
+        self.weights     = weights
+        self.n_probe     = n_probe
+
+    def predict_proba(self, X):
+        X     = np.asarray(X, dtype=np.float32)
+        proba = np.zeros((len(X), len(self.classes_)))
+        for i, q in enumerate(X):
+            idx, dist = self.index.search(q, self.n_neighbors, self.n_probe)
+            if self.weights == "distance":
+                w = 1.0 / np.maximum(dist, 1e-12)
+            else:
+                w = np.ones(len(idx))
+            np.add.at(proba[i], self.index.y[idx], w)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def build_knn_index(model, directory=INDEX_DIR, n_lists=None):
+    """Index the reference rows of a fitted KNeighborsClassifier (labels as class positions)"""
+    index = IVFIndex.build(model._fit_X, model._y, model.effective_metric_, n_lists,
+                           meta={"fit_hash": fit_hash(model._fit_X)})
+    index.save(directory)
+    return index
+
+
+def compile_knn(model, directory=INDEX_DIR, n_probe=None):
+    """
+    IVFKNeighborsClassifier for a fitted KNeighborsClassifier when an index built from
+    the same reference rows exists in `directory` and holds more than EXACT_BELOW rows,
+    otherwise None. Queries are searched one at a time, which only pays off once a full
+    scan per row is expensive.
+    """
+    from sklearn.neighbors import KNeighborsClassifier
+    if not isinstance(model, KNeighborsClassifier) or not os.path.exists(os.path.join(directory, "meta.json")):
+        return None
+    index = IVFIndex.load(directory)
+    if len(index.X) <= EXACT_BELOW:
+        return None
+    if index.meta.get("fit_hash") != fit_hash(model._fit_X) or index.metric != model.effective_metric_:
+        return None
+    if callable(model.weights) or model.weights not in ("uniform", "distance"):
+        return None
+    n_probe = n_probe or int(os.environ.get("KNN_N_PROBE", max(8, len(index.centroids) // 32)))
+    return IVFKNeighborsClassifier(index, model.classes_, model.n_neighbors, model.weights, n_probe)
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    # ── Latency and recall@k vs exact search ──────────────────
+    # Reference rows are resampled from data/cleaned_heart_statlog.csv with small noise
+    import pandas as pd
+    base = pd.read_csv("data/cleaned_heart_statlog.csv").drop(columns="target").to_numpy(dtype=np.float32)
+    sizes   = [int(s) for s in sys.argv[1:]] or [1_000, 100_000, 1_000_000]
+    k       = 15
+    metric  = "manhattan"
+    rng     = np.random.default_rng(0)
+    queries = base[rng.choice(len(base), 200)] + rng.normal(0, 0.05, (200, base.shape[1])).astype(np.float32)
+
+    print(f"{'rows':>10} {'lists':>6} {'probe':>6} {'build s':>8} {'exact ms':>9} {'ivf ms':>7} {'recall@15':>10}")
+    for n in sizes:
+        X = base[rng.choice(len(base), n)] + rng.normal(0, 0.05, (n, base.shape[1])).astype(np.float32)
+        y = rng.integers(0, 2, n)
+        start = time.perf_counter()
+        built = IVFIndex.build(X, y, metric)
+        build_s = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as tmp:
+            built.save(tmp)
+            index = IVFIndex.load(tmp)
+            for n_probe in sorted({max(1, len(index.centroids) // 128), max(8, len(index.centroids) // 32)}):
+                start = time.perf_counter()
+                exact = [np.argpartition(_pairwise(X, q, metric), k)[:k] for q in queries]
+                exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+                start = time.perf_counter()
+                approx = [index.search(q, k, n_probe)[0] for q in queries]
+                ivf_ms = (time.perf_counter() - start) / len(queries) * 1000
+                # index rows are stored in cell order; compare on the underlying vectors
+                recall = np.mean([len({tuple(r) for r in X[e]} & {tuple(r) for r in index.X[a]}) / k
+                                  for e, a in zip(exact, approx)])
+                print(f"{n:>10,} {len(index.centroids):>6} {n_probe:>6} {build_s:>8.2f} {exact_ms:>9.3f} "
+                      f"{ivf_ms:>7.3f} {recall:>10.3f}")
+            del index
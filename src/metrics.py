@@ -0,0 +1,119 @@
+# src/metrics.py
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; tuned for sub-millisecond stages up to multi-second batch requests
+LATENCY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = [(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self._values = {}
+        self._lock   = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self._values = {}
+        self._lock   = threading.Lock()
+
+    def set(self, value, **labels):
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        with self._lock:
+            self._values[key] = value
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; bucket i counts observations <= buckets[i], the last one is +Inf.
+
+    `render` gives the Prometheus exposition, `snapshot` a JSON-friendly summary of one series.
+    """
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self.buckets = list(buckets)
+        self._series = {}   # label values -> [bucket counts..., sum, count]
+        self._lock   = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        i   = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels):
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        with self._lock:
+            series = self._series.get(key) or [0] * (len(self.buckets) + 1) + [0.0, 0]
+            names  = [str(b) for b in self.buckets] + ["+Inf"]
+            return {
+                "buckets": dict(zip(names, series[:-2])),
+                "count":   series[-1],
+                "mean":    round(series[-2] / series[-1], 3) if series[-1] else 0.0
+            }
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ["+Inf"], series[:-2]):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, [('le', bound)])} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {series[-2]}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series[-1]}")
+        return lines
+
+
+def render(metrics):
+    """Prometheus text exposition format (version 0.0.4) for a list of metrics"""
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
@@ -0,0 +1,152 @@
+# src/model_cache.py
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from src.model_watcher import latest_version, load_model_artifact, load_scalers, model_metrics
+
+# ── Config ────────────────────────────────────────────────────
+CACHE_DIR    = os.environ.get("MODEL_CACHE_DIR", "model_cache")
+SCALER_FILES = {
+    "standard_scaler.pkl": "models/standard_scaler.pkl",
+    "minmax_scaler.pkl":   "models/minmax_scaler.pkl"
+}
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_cache(model, version, source, cache_dir=CACHE_DIR, metrics=None):
+    """
+    Write model + scalers + manifest into a new versioned directory, then point
+    `<cache_dir>/CURRENT` at it. Both steps are atomic renames, so a concurrent
+    reader sees either the old entry or the new one, never a partial write.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=cache_dir)
+    try:
+        with open(os.path.join(staging, "model.pkl"), "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        for name, src in SCALER_FILES.items():
+            shutil.copyfile(src, os.path.join(staging, name))
+
+        files    = {name: _sha256(os.path.join(staging, name)) for name in ["model.pkl", *SCALER_FILES]}
+        combined = hashlib.sha256("".join(files[n] for n in sorted(files)).encode()).hexdigest()
+        manifest = {
+            "version":    version,
+            "source":     source,
+            "hash":       combined,
+            "files":      files,
+            "metrics":    metrics or {},
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        }
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        entry  = f"{re.sub(r'[^A-Za-z0-9._-]+', '_', str(version))[-60:]}-{combined[:12]}"
+        target = os.path.join(cache_dir, entry)
+        if os.path.exists(target):
+            shutil.rmtree(staging)
+        else:
+            os.replace(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    pointer = os.path.join(cache_dir, "CURRENT.tmp")
+    with open(pointer, "w") as f:
+        f.write(entry)
+    os.replace(pointer, os.path.join(cache_dir, "CURRENT"))
+    return target, manifest
+
+
+def load_cached(cache_dir=CACHE_DIR, verify=True):
+    """Load (model, std_scaler, mm_scaler, manifest) from the cache without touching mlflow"""
+    with open(os.path.join(cache_dir, "CURRENT")) as f:
+        entry = os.path.join(cache_dir, f.read().strip())
+    with open(os.path.join(entry, "manifest.json")) as f:
+        manifest = json.load(f)
+
+    if verify:
+        for name, expected in manifest["files"].items():
+            if _sha256(os.path.join(entry, name)) != expected:
+                raise ValueError(f"Cached {name} does not match its manifest hash")
+
+    artifacts = []
+    for name in ["model.pkl", *SCALER_FILES]:
+        with open(os.path.join(entry, name), "rb") as f:
+            artifacts.append(pickle.load(f))
+    return (*artifacts, manifest)
+
+
+def resolve(cache_dir=CACHE_DIR):
+    """Resolve the production model (registry, then mlruns/) and, if cache_dir is set, cache it"""
+    version, source = latest_version()
+    if version is None:
+        raise FileNotFoundError("No production model found in the registry or mlruns/")
+    model    = load_model_artifact(version, source)
+    metrics  = model_metrics(version, source)
+    manifest = {"version": version, "source": source, "metrics": metrics}
+    if cache_dir:
+        _, manifest = write_cache(model, version, source, cache_dir, metrics)
+        print(f"✅ Cached model {version} ({source}) in {cache_dir}/")
+    std, mm = load_scalers()
+    return model, std, mm, manifest
+
+
+def load_production(cache_dir=CACHE_DIR):
+    """Cache first; on a miss or a corrupt entry, resolve the model and populate the cache"""
+    if cache_dir:
+        try:
+            return load_cached(cache_dir)
+        except FileNotFoundError:
+            print(f"Model cache {cache_dir}/ is empty — resolving production model")
+        except Exception as e:
+            print(f"Model cache unusable ({e}) — resolving production model")
+    return resolve(cache_dir)
+
+
+# ── Cold-start benchmark ──────────────────────────────────────
+_COLD_START = """
+import os, sys, time
+start = time.perf_counter()
+os.environ["MODEL_CACHE_DIR"] = {cache_dir!r}
+from src.model_cache import load_production
+from src.model_watcher import ServingModel
+model, std, mm, manifest = load_production(os.environ["MODEL_CACHE_DIR"])
+ServingModel(model, manifest["version"], manifest["source"], std, mm).warm_up()
+print(time.perf_counter() - start, "mlflow" in sys.modules)
+"""
+
+
+def benchmark(runs=5, cache_dir=CACHE_DIR):
+    import subprocess
+    resolve(cache_dir)
+    for label, target in [("uncached", ""), ("cached", cache_dir)]:
+        timings, imported = [], False
+        for _ in range(runs):
+            out = subprocess.run([sys.executable, "-c", _COLD_START.format(cache_dir=target)],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            timings.append(float(out[-2]))
+            imported = imported or out[-1] == "True"
+        timings.sort()
+        print(f"{label:9s}: median {timings[len(timings)//2]*1000:8.1f} ms | "
+              f"min {timings[0]*1000:8.1f} ms | max {timings[-1]*1000:8.1f} ms | mlflow imported: {imported}")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        resolve()
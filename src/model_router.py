@@ -0,0 +1,231 @@
+# src/model_router.py
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.forest_scorer import compile_forest
+from src.knn_index import compile_knn
+from src.metrics import Histogram
+from src.preprocessing import FEATURES, STD_COLS, MM_COLS, FusedPreprocessor
+
+# ── Models trained by scripts/train_*.py ──────────────────────
+MODELS_DIR    = "models"
+RAW_DATA_PATH = "data/heart_statlog_cleveland_hungary_final.csv"
+MODEL_FILES   = {
+    "knn":                 "knn_model.pkl",
+    "naive_bayes":         "naive_bayes_model.pkl",
+    "logistic_regression": "logistic_regression_model.pkl",
+    "decision_tree":       "decision_tree_model.pkl",
+    "random_forest":       "random_forest_model.pkl",
+    "ann":                 "ann_model.pkl",
+    "svm":                 "svm_model.pkl",
+}
+# Seconds; per-model predict latency
+LATENCY_BOUNDS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1]
+
+
+def _iqr_bounds(values):
+    q1, q3 = values.quantile(0.25), values.quantile(0.75)
+    return q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+
+
+def fit_statlog_scalers(raw_path=RAW_DATA_PATH):
+    """
+    Refit the scalers of notebooks/feature_engineering.ipynb, which were never saved.
+
+    Repeats the notebook's cleaning (duplicates, zero blood pressure, zero cholesterol,
+    IQR outliers) on the raw file, so the fitted parameters reproduce
+    data/cleaned_heart_statlog.csv exactly. Returns the scalers and the cholesterol mean
+    used to impute zeros.
+    """
+    from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
+    df = pd.read_csv(raw_path).drop_duplicates()
+    df = df[df["resting bp s"] != 0].copy()
+    cholesterol_mean  = df[df["cholesterol"] != 0]["cholesterol"].mean()
+    df["cholesterol"] = df["cholesterol"].replace(0, cholesterol_mean)
+
+    outliers = set()
+    for col in ["resting bp s", "max heart rate", "oldpeak"]:
+        low, high = _iqr_bounds(df[col])
+        outliers.update(df[(df[col] < low) | (df[col] > high)].index)
+    df = df.drop(index=outliers)
+    low, high = _iqr_bounds(df["cholesterol"])
+    df.loc[(df["cholesterol"] < low) | (df["cholesterol"] > high), "cholesterol"] = df["cholesterol"].median()
+
+    return StandardScaler().fit(df[STD_COLS]), MinMaxScaler().fit(df[MM_COLS]), cholesterol_mean
+
+
+class FeatureAdapter:
+    """
+    Maps raw FEATURES rows onto a model's feature_names_in_.
+
+    Columns found in FEATURES are copied over after scaling. One-hot columns such as
+    `sex_1` become `X[:, "sex"] == 1`. Returns a plain array in the model's column order.
+    """
+
+    def __init__(self, columns, preprocessor, cholesterol_mean):
+        self.columns = list(columns)
+        self.preprocessor = preprocessor
+        self.cholesterol_mean = cholesterol_mean
+        self._chol = FEATURES.index("cholesterol")
+        self._take, self._onehot = [], []
+        for j, name in enumerate(self.columns):
+            if name in FEATURES:
+                self._take.append((j, FEATURES.index(name)))
+            else:
+                base, _, value = name.rpartition("_")
+                if base not in FEATURES:
+                    raise ValueError(f"Cannot derive model feature {name!r} from {FEATURES}")
+                self._onehot.append((j, FEATURES.index(base), float(value)))
+
+    def transform(self, X_raw):
+        X_raw = np.array(X_raw, dtype=np.float64)
+        raw   = X_raw.copy()
+        X_raw[X_raw[:, self._chol] == 0, self._chol] = self.cholesterol_mean
+        scaled = self.preprocessor.transform(X_raw)
+
+        out = np.empty((len(X_raw), len(self.columns)))
+        for j, i in self._take:
+            out[:, j] = scaled[:, i]
+        for j, i, value in self._onehot:
+            out[:, j] = raw[:, i] == value
+        return out
+
+
+class RoutedModel:
+    def __init__(self, name, path, adapter_factory, fast=True):
+        start = time.perf_counter()
+        self.model = joblib.load(path)
+        self.load_seconds = time.perf_counter() - start
+
+        self.name    = name
+        self.path    = path
+        self.adapter = adapter_factory(getattr(self.model, "feature_names_in_", FEATURES))
+        compiled     = (compile_forest(self.model) or compile_knn(self.model)) if fast else None
+        self.scorer  = compiled or self.model
+        self.latency = Histogram("heart_router_predict_seconds", f"predict_proba latency of {name}",
+                                 buckets=LATENCY_BOUNDS)
+        # Pickled state size approximates the fitted arrays (tree nodes live outside tracemalloc's view)
+        self.memory_bytes = len(pickle.dumps(self.model))
+        if compiled is not None:
+            arrays = vars(getattr(compiled, "index", compiled)).values()
+            self.memory_bytes += sum(a.nbytes for a in arrays if isinstance(a, np.ndarray))
+
+    def score(self, X):
+        """Positive-class probabilities for rows already mapped by self.adapter"""
+        if hasattr(self.scorer, "feature_names_in_"):
+            X = pd.DataFrame(X, columns=self.adapter.columns)
+        start = time.perf_counter()
+        proba = self.scorer.predict_proba(X)
+        self.latency.observe(time.perf_counter() - start)
+        return proba[:, list(self.scorer.classes_).index(1)]
+
+    def predict_proba(self, X_raw):
+        return self.score(self.adapter.transform(X_raw))
+
+    def info(self):
+        return {
+            "model_type":   type(self.model).__name__,
+            "scorer":       type(self.scorer).__name__,
+            "memory_mb":    round(self.memory_bytes / 1e6, 3),
+            "file_mb":      round(os.path.getsize(self.path) / 1e6, 3),
+            "load_seconds": round(self.load_seconds, 4),
+            "predict_latency": self.latency.snapshot()
+        }
+
+
+class ModelRouter:
+    """
+    The scripts/ models loaded side by side, scored by name, all at once, or as a
+    soft-voting ensemble.
+
+    Fan-out runs each model in its own thread. The sklearn/NumPy predict calls release
+    the GIL for most of their work, so the models genuinely overlap.
+    """
+
+    def __init__(self, names=None, models_dir=MODELS_DIR, raw_path=RAW_DATA_PATH, fast=True, max_workers=None):
+        std, mm, cholesterol_mean = fit_statlog_scalers(raw_path)
+        preprocessor = FusedPreprocessor(std, mm)
+
+        adapters = {}
+        def adapter_factory(columns):
+            key = tuple(columns)
+            if key not in adapters:
+                adapters[key] = FeatureAdapter(columns, preprocessor, cholesterol_mean)
+            return adapters[key]
+
+        self.models = {}
+        for name in names or MODEL_FILES:
+            if name not in MODEL_FILES:
+                raise ValueError(f"Unknown model {name!r}; choose from {list(MODEL_FILES)}")
+            self.models[name] = RoutedModel(name, os.path.join(models_dir, MODEL_FILES[name]), adapter_factory, fast)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or len(self.models), thread_name_prefix="router")
+
+    def _select(self, names):
+        names = list(names or self.models)
+        unknown = [n for n in names if n not in self.models]
+        if unknown:
+            raise KeyError(f"Models not served: {unknown}; available: {list(self.models)}")
+        return names
+
+    def predict_proba(self, name, X_raw):
+        return self.models[self._select([name])[0]].predict_proba(X_raw)
+
+    def fan_out(self, X_raw, names=None):
+        """Positive-class probabilities from every selected model, scored concurrently"""
+        names   = self._select(names)
+        # Models sharing a feature layout share one adapted matrix
+        adapted = {}
+        for name in names:
+            adapter = self.models[name].adapter
+            if id(adapter) not in adapted:
+                adapted[id(adapter)] = adapter.transform(X_raw)
+        futures = {name: self._pool.submit(self.models[name].score, adapted[id(self.models[name].adapter)])
+                   for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+    def ensemble(self, X_raw, names=None, outputs=None):
+        """Soft voting: mean positive-class probability across the selected models"""
+        outputs = outputs or self.fan_out(X_raw, names)
+        return np.mean(list(outputs.values()), axis=0)
+
+    def stats(self):
+        return {name: model.info() for name, model in self.models.items()}
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # ── Per-model latency on data/heart.csv rows ──────────────
+    router = ModelRouter()
+    X = pd.read_csv("data/heart.csv")[FEATURES].to_numpy(dtype=np.float64)
+    y = pd.read_csv("data/heart.csv")["target"].to_numpy()
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{'model':<20} {'memory MB':>10} {'ms/row':>8} {'batch ms':>9} {'accuracy':>9}")
+    for name, model in router.models.items():
+        start = time.perf_counter()
+        for i in range(n_rows):
+            model.predict_proba(X[i:i + 1])
+        per_row = (time.perf_counter() - start) / n_rows * 1000
+        start = time.perf_counter()
+        proba = model.predict_proba(X)
+        batch = (time.perf_counter() - start) * 1000
+        print(f"{name:<20} {model.memory_bytes / 1e6:>10.3f} {per_row:>8.3f} {batch:>9.2f} "
+              f"{((proba >= 0.5) == y).mean():>9.2%}")
+
+    start   = time.perf_counter()
+    outputs = router.fan_out(X)
+    fan_out = (time.perf_counter() - start) * 1000
+    print(f"Fan-out, all models : {fan_out:.2f} ms for {len(X)} rows")
+    print(f"Soft-voting ensemble: {((router.ensemble(X, outputs=outputs) >= 0.5) == y).mean():.2%} accuracy")
+    router.close()
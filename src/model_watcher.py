@@ -0,0 +1,244 @@
+# src/model_watcher.py
+import contextlib
+import glob
+import os
+import pickle
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.forest_scorer import compile_forest
+from src.preprocessing import FEATURES, FusedPreprocessor
+
+MODEL_NAME   = "HeartDiseaseModel"
+METRIC_NAMES = ["accuracy", "roc_auc", "f1_score"]   # run metrics reported by /model/info
+TRACKING_URI = os.environ.get("MLFLOW_TRACKING_URI", "http://localhost:5000")
+# Bound registry polls instead of relying on mlflow's default retry/backoff
+REGISTRY_HTTP_ENV = {
+    "MLFLOW_HTTP_REQUEST_TIMEOUT":     os.environ.get("MODEL_REGISTRY_TIMEOUT", "5"),
+    "MLFLOW_HTTP_REQUEST_MAX_RETRIES": "0",
+}
+_registry_env_lock = threading.Lock()
+
+
+class ServingModel:
+    """One model version plus everything needed to score with it, swapped as a unit"""
+
+    def __init__(self, model, version, source, std_scaler=None, mm_scaler=None, fast=True, metrics=None):
+        self.model        = model
+        self.scorer       = (compile_forest(model) or model) if fast else model
+        self.preprocessor = FusedPreprocessor(std_scaler, mm_scaler)
+        self.scalers_loaded = std_scaler is not None
+        self.load_seconds = None
+        self.version      = version
+        self.source       = source
+        self.metrics      = metrics or {}
+        self.loaded_at    = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    def warm_up(self):
+        """Run one prediction so the first real request doesn't pay for lazy initialisation"""
+        X = self.preprocessor.transform(np.zeros((1, len(FEATURES))))
+        if hasattr(self.scorer, "feature_names_in_"):
+            import pandas as pd
+            X = pd.DataFrame(X, columns=FEATURES)
+        self.scorer.predict_proba(X)
+
+    def info(self):
+        return {
+            "version":    self.version,
+            "source":     self.source,
+            "loaded_at":  self.loaded_at,
+            "model_type": type(self.model).__name__,
+            "scorer":     type(self.scorer).__name__,
+            "metrics":    self.metrics
+        }
+
+
+class ModelHolder:
+    """Holds the active ServingModel; readers grab `.current` once per request"""
+
+    def __init__(self, serving=None):
+        self.current = serving
+        self._lock   = threading.Lock()
+
+    def swap(self, serving):
+        with self._lock:
+            previous, self.current = self.current, serving
+        return previous
+
+
+def load_scalers():
+    try:
+        std = pickle.load(open("models/standard_scaler.pkl", "rb"))
+        mm  = pickle.load(open("models/minmax_scaler.pkl",  "rb"))
+        return std, mm
+    except Exception:
+        return None, None
+
+
+@contextlib.contextmanager
+def _registry_http_limits():
+    """
+    Apply REGISTRY_HTTP_ENV (where the user hasn't set the variable) for one registry
+    call only. mlflow reads these per request, so the rest of the process keeps its defaults.
+    """
+    with _registry_env_lock:
+        added = [k for k in REGISTRY_HTTP_ENV if k not in os.environ]
+        os.environ.update({k: REGISTRY_HTTP_ENV[k] for k in added})
+        try:
+            yield
+        finally:
+            for k in added:
+                os.environ.pop(k, None)
+
+
+def latest_version():
+    """
+    Newest Production version as (version, source).
+
+    Asks the MLflow registry first; without a reachable registry, the newest
+    model.pkl under mlruns/ (by modification time) stands in for it.
+    """
+    try:
+        from mlflow.tracking import MlflowClient
+        client   = MlflowClient(tracking_uri=TRACKING_URI)
+        with _registry_http_limits():
+            versions = client.get_latest_versions(MODEL_NAME, stages=["Production"])
+        if versions:
+            return str(versions[0].version), "registry"
+        print(f"No Production version of {MODEL_NAME} in the registry — falling back to mlruns/")
+    except Exception as e:
+        print(f"Model registry unavailable ({type(e).__name__}) — falling back to mlruns/")
+    pkl_files = glob.glob("mlruns/**/model.pkl", recursive=True)
+    if pkl_files:
+        newest = max(pkl_files, key=os.path.getmtime)
+        return f"local:{newest}@{int(os.path.getmtime(newest))}", "mlruns"
+    return None, None
+
+
+def _source_run_id(path):
+    """
+    Run that logged the model.pkl at `path`: meta.yaml's `source_run_id` beside an MLflow 3
+    logged model (mlruns/<experiment>/models/m-*/), else the `run_id` in its MLmodel file
+    """
+    artifacts_dir = os.path.dirname(path)
+    for meta_file, key in [(os.path.join(os.path.dirname(artifacts_dir), "meta.yaml"), "source_run_id"),
+                           (os.path.join(artifacts_dir, "MLmodel"), "run_id")]:
+        if os.path.exists(meta_file):
+            with open(meta_file) as f:
+                for line in f:
+                    name, _, value = line.partition(":")
+                    if name == key and value.strip() not in ("", "null"):
+                        return value.strip().strip("'\"")
+    return None
+
+
+def model_metrics(version, source):
+    """Evaluation metrics logged with the run behind `version`; {} when they can't be found"""
+    try:
+        from mlflow.tracking import MlflowClient
+        client = MlflowClient(tracking_uri=TRACKING_URI)
+        if source == "registry":
+            with _registry_http_limits():
+                run_id = client.get_model_version(MODEL_NAME, version).run_id
+                logged = client.get_run(run_id).data.metrics
+        else:
+            # File store: one file per metric in mlruns/<experiment>/<run>/metrics/, read
+            # from the tracking server instead when the run's files aren't on disk
+            path   = version[len("local:"):].rsplit("@", 1)[0]
+            run_id = _source_run_id(path)
+            if run_id is None:
+                return {}
+            parts       = os.path.normpath(path).split(os.sep)
+            metrics_dir = os.path.join(os.sep.join(parts[:parts.index("mlruns") + 2]), run_id, "metrics")
+            if os.path.isdir(metrics_dir):
+                logged = {}
+                for name in METRIC_NAMES:
+                    metric_file = os.path.join(metrics_dir, name)
+                    if os.path.exists(metric_file):
+                        with open(metric_file) as f:
+                            fields = f.read().split()
+                        logged[name] = float(fields[-2])   # latest "<timestamp> <value> <step>" line
+            else:
+                with _registry_http_limits():
+                    logged = client.get_run(run_id).data.metrics
+    except Exception as e:
+        print(f"Metrics for model {version} unavailable ({type(e).__name__})")
+        return {}
+    return {name: float(logged[name]) for name in METRIC_NAMES if name in logged}
+
+
+def load_model_artifact(version, source):
+    if source == "registry":
+        import mlflow.sklearn
+        mlflow.set_tracking_uri(TRACKING_URI)
+        return mlflow.sklearn.load_model(f"models:/{MODEL_NAME}/{version}")
+    path = version[len("local:"):].rsplit("@", 1)[0]
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_version(version, source, fast=True):
+    start   = time.perf_counter()
+    model   = load_model_artifact(version, source)
+    std, mm = load_scalers()
+    serving = ServingModel(model, version, source, std, mm, fast=fast, metrics=model_metrics(version, source))
+    serving.warm_up()
+    serving.load_seconds = time.perf_counter() - start
+    return serving
+
+
+class ModelWatcher(threading.Thread):
+    """
+    Background poller that hot-swaps a newly promoted model into a ModelHolder.
+
+    The new version is loaded and warmed up on this thread; only then is the
+    holder's reference replaced. Requests that already took the old ServingModel
+    finish on it.
+    """
+
+    def __init__(self, holder, interval=30.0, fast=True, on_swap=None):
+        super().__init__(daemon=True, name="model-watcher")
+        self.holder     = holder
+        self.interval   = interval
+        self.fast       = fast
+        self.on_swap    = on_swap
+        self.last_check = None
+        self.last_error = None
+        self.swaps      = 0
+        self._stopped   = threading.Event()
+
+    def check_once(self):
+        self.last_check = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        version, source = latest_version()
+        current = self.holder.current
+        if version is None or (current is not None and current.version == version):
+            return False
+        serving = load_version(version, source, fast=self.fast)
+        previous = self.holder.swap(serving)
+        self.swaps += 1
+        print(f"✅ Model swapped: {previous.version if previous else None} → {serving.version}")
+        if self.on_swap:
+            self.on_swap(serving)
+        return True
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+
+    def stop(self):
+        self._stopped.set()
+
+    def status(self):
+        return {
+            "interval_seconds": self.interval,
+            "last_check": self.last_check,
+            "last_error": self.last_error,
+            "swaps":      self.swaps
+        }
@@ -0,0 +1,221 @@
+# src/pdf_reports.py
+import copy
+import multiprocessing as mp
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from fpdf import FPDF
+
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", "0")) or None   # None: one per CPU
+EXPORT_CHUNK   = 64      # reports per task handed to a bulk-export worker
+
+# (y, label) of each value line; values are written at the end of their label
+PATIENT_LINES = [(41, "Patient Name : "), (48, "Patient ID   : "), (55, "Age          : "),
+                 (62, "Sex          : "), (69, "Doctor       : "), (76, "Date         : ")]
+VITAL_LINES   = [(96, "Cholesterol  : "), (103, "Resting BP   : "), (110, "Max Heart Rate: "), (117, "Oldpeak      : ")]
+RESULT_Y      = 129
+SCORE_LINES   = [(144, "Probability  : "), (151, "Risk Level   : ")]
+FOOTER_Y      = 166
+# History columns a report shows
+REPORT_FIELDS = ["Date", "Patient Name", "Patient ID", "Doctor", "Age", "Sex", "Cholesterol", "BP",
+                 "Max HR", "Result", "Probability", "Risk"]
+
+
+def build_template():
+    """One report page with everything that doesn't depend on the patient already drawn"""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_fill_color(230, 57, 70)
+    pdf.rect(0, 0, 210, 25, 'F')
+    pdf.set_font("Arial", "B", 16)
+    pdf.set_text_color(255, 255, 255)
+    pdf.cell(0, 15, "Heart Disease Prediction Report", ln=True, align="C")
+    pdf.set_text_color(0, 0, 0)
+
+    pdf.set_font("Arial", "B", 11)
+    for y, heading in [(33, "PATIENT INFORMATION"), (88, "CLINICAL VITALS")]:
+        pdf.set_xy(10, y)
+        pdf.cell(0, 8, heading)
+    pdf.set_font("Arial", size=10)
+    for y, label in PATIENT_LINES + VITAL_LINES + SCORE_LINES:
+        pdf.set_xy(10, y)
+        pdf.cell(pdf.get_string_width(label), 7, label)
+
+    pdf.set_font("Arial", "I", 8)
+    pdf.set_text_color(128, 128, 128)
+    pdf.set_xy(10, FOOTER_Y)
+    pdf.cell(0, 6, "Generated by ModelOps Framework for Heart Disease Prediction", align="C")
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font("Arial", size=10)
+    return pdf
+
+
+_template = None
+
+
+def _clone(template):
+    """Copy of a template FPDF that can be drawn on without touching the original.
+
+    Much cheaper than deepcopy: the font width tables, the bulk of the object, are
+    read-only and stay shared.
+    """
+    pdf = copy.copy(template)
+    for name, value in vars(template).items():
+        if isinstance(value, dict) and name != "current_font":
+            setattr(pdf, name, {k: dict(v) if isinstance(v, dict) else v for k, v in value.items()})
+    pdf.current_font = pdf.fonts[pdf.font_family + pdf.font_style]
+    return pdf
+
+
+def _text(value):
+    if isinstance(value, datetime):
+        value = f"{value:%Y-%m-%d %H:%M}"
+    elif isinstance(value, float) and value != value:
+        value = ""
+    # Core fonts are latin-1 only
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+
+def _whole(value):
+    # Vitals come back from the typed history as REAL; 212.0 prints as 212
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def _percent(value):
+    return f"{value:.1%}" if isinstance(value, float) else value
+
+
+def render_report(record, template=None):
+    """PDF bytes for one prediction, keyed by the history CSV headers plus an optional "Oldpeak" """
+    global _template
+    if template is None:
+        if _template is None:
+            _template = build_template()
+        template = _template
+    pdf = _clone(template)
+
+    values = [record.get("Patient Name", ""), record.get("Patient ID", ""), f"{_whole(record.get('Age', ''))} years",
+              record.get("Sex", ""), record.get("Doctor", ""), record.get("Date", ""),
+              f"{_whole(record.get('Cholesterol', ''))} mg/dl", f"{_whole(record.get('BP', ''))} mmHg",
+              f"{_whole(record.get('Max HR', ''))} bpm", record.get("Oldpeak", "n/a"),
+              _percent(record.get("Probability", "")), record.get("Risk", "")]
+    for (y, label), value in zip(PATIENT_LINES + VITAL_LINES + SCORE_LINES, values):
+        pdf.set_xy(10 + pdf.get_string_width(label), y)
+        pdf.cell(0, 7, _text(value))
+
+    positive = record.get("Result") == "Heart Disease"
+    pdf.set_xy(10, RESULT_Y)
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_fill_color(*((230, 57, 70) if positive else (63, 185, 80)))
+    pdf.set_text_color(255, 255, 255)
+    pdf.cell(0, 12, f"RESULT: {'HEART DISEASE DETECTED' if positive else 'NO HEART DISEASE'}", fill=True, align="C")
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def _render_chunk(records):
+    return [render_report(r) for r in records]
+
+
+def report_name(record):
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(record.get("Patient ID", "")))
+    date = _text(record.get("Date", "")).replace(" ", "_").replace(":", "")
+    return f"report_{safe}_{date}.pdf"
+
+
+class ReportRenderer:
+    """
+    Renders report PDFs in a small process pool.
+
+    Each worker builds the page template once (header, headings, labels, footer) and
+    every report starts from a copy of it, so a report only draws its own values.
+    `render` returns a future; `export_zip` renders many records in parallel and
+    streams them into one zip.
+    """
+
+    def __init__(self, workers=REPORT_WORKERS):
+        # spawn: the UI process runs background threads that fork would copy mid-flight
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+
+    def render(self, record):
+        return self._pool.submit(render_report, dict(record))
+
+    def export_zip(self, records, out):
+        """Write one PDF per record into the zip at `out` (path or file object); returns timing stats"""
+        records = [dict(r) for r in records]
+        chunks  = [records[i:i + EXPORT_CHUNK] for i in range(0, len(records), EXPORT_CHUNK)]
+        start   = time.perf_counter()
+        names   = set()
+        # PDFs are already deflated; storing them keeps the zip step out of the way
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+            for chunk, pdfs in zip(chunks, self._pool.map(_render_chunk, chunks)):
+                for record, pdf in zip(chunk, pdfs):
+                    name, n = report_name(record), 1
+                    while name in names:
+                        n += 1
+                        name = report_name(record).replace(".pdf", f"_{n}.pdf")
+                    names.add(name)
+                    zf.writestr(name, pdf)
+        seconds = time.perf_counter() - start
+        return {"pages": len(records), "seconds": round(seconds, 3),
+                "pages_per_sec": round(len(records) / seconds, 1) if seconds else 0.0}
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    import io
+
+    from src.history_store import HistoryStore
+
+    parser = argparse.ArgumentParser(description="Export prediction reports for a slice of the history as a zip")
+    parser.add_argument("--out", default="reports/prediction_reports.zip")
+    parser.add_argument("--doctor")
+    parser.add_argument("--risk", choices=["High", "Medium", "Low"])
+    parser.add_argument("--result", choices=["Heart Disease", "No Disease"])
+    parser.add_argument("--since", help="YYYY-MM-DD")
+    parser.add_argument("--until", help="YYYY-MM-DD (exclusive)")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--workers", type=int, default=REPORT_WORKERS)
+    parser.add_argument("--csv", help="Read a prediction_history.csv instead of the history database")
+    parser.add_argument("--compare", action="store_true", help="Also time serial from-scratch rendering")
+    args = parser.parse_args()
+
+    if args.csv:
+        import pandas as pd
+        df = pd.read_csv(args.csv)
+        for column, value in (("Doctor", args.doctor), ("Risk", args.risk), ("Result", args.result)):
+            if value is not None:
+                df = df[df[column] == value]
+        if args.since:
+            df = df[df["Date"] >= args.since]
+        if args.until:
+            df = df[df["Date"] < args.until]
+        df = df.head(args.limit) if args.limit else df
+    else:
+        df = HistoryStore(legacy_csv=None).query(doctor=args.doctor, risk=args.risk, result=args.result,
+                                                  since=args.since, until=args.until, limit=args.limit,
+                                                  columns=REPORT_FIELDS)
+    records = df.astype(object).where(df.notna(), "").to_dict("records")
+    print(f"{len(records):,} records selected")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    renderer = ReportRenderer(args.workers)
+    renderer.export_zip(records[:1], io.BytesIO())     # start the workers outside the timing
+    stats = renderer.export_zip(records, args.out)
+    renderer.close()
+    print(f"Parallel, template : {stats['pages']:,} pages in {stats['seconds']:.2f}s "
+          f"({stats['pages_per_sec']:,.0f} pages/sec) → {args.out}")
+
+    if args.compare:
+        # What the UI did: draw the whole page from scratch per report, one at a time
+        start = time.perf_counter()
+        with zipfile.ZipFile(io.BytesIO(), "w", zipfile.ZIP_STORED) as zf:
+            for i, record in enumerate(records):
+                zf.writestr(f"{i}.pdf", render_report(record, build_template()))
+        seconds = time.perf_counter() - start
+        print(f"Serial, scratch    : {len(records):,} pages in {seconds:.2f}s ({len(records) / seconds:,.0f} pages/sec)")
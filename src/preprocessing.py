@@ -0,0 +1,74 @@
+# src/preprocessing.py
+import pickle
+import threading
+import numpy as np
+
+# ── Feature layout (same order as data/heart.csv) ─────────────
+FEATURES = ["age", "sex", "chest pain type", "resting bp s", "cholesterol",
+            "fasting blood sugar", "resting ecg", "max heart rate",
+            "exercise angina", "oldpeak", "ST slope"]
+STD_COLS = ["resting bp s", "cholesterol", "max heart rate", "age"]
+MM_COLS  = ["oldpeak"]
+CATEGORICAL_COLS = ["sex", "chest pain type", "fasting blood sugar",
+                    "resting ecg", "exercise angina", "ST slope"]
+
+
+class FusedPreprocessor:
+    """
+    StandardScaler + MinMaxScaler folded into one affine transform over FEATURES.
+
+    Both scalers are per-column `x * a + b`, so they collapse into a single scale
+    vector and offset vector (identity for the untouched categorical columns).
+    `transform` applies them in place; `row` fills a per-thread preallocated buffer,
+    so single predictions allocate nothing.
+    """
+
+    def __init__(self, std_scaler=None, mm_scaler=None, features=FEATURES):
+        self.features = list(features)
+        self.scale    = np.ones(len(self.features))
+        self.offset   = np.zeros(len(self.features))
+        self._local   = threading.local()
+
+        if std_scaler is not None:
+            cols  = list(getattr(std_scaler, "feature_names_in_", STD_COLS))
+            mean  = std_scaler.mean_  if std_scaler.mean_  is not None else np.zeros(len(cols))
+            scale = std_scaler.scale_ if std_scaler.scale_ is not None else np.ones(len(cols))
+            for j, col in enumerate(cols):
+                i = self.features.index(col)
+                self.scale[i]  = 1.0 / scale[j]
+                self.offset[i] = -mean[j] / scale[j]
+
+        if mm_scaler is not None:
+            cols = list(getattr(mm_scaler, "feature_names_in_", MM_COLS))
+            for j, col in enumerate(cols):
+                i = self.features.index(col)
+                self.scale[i]  = mm_scaler.scale_[j]
+                self.offset[i] = mm_scaler.min_[j]
+
+    def buffer(self, n_rows):
+        """Per-thread scratch array with room for n_rows, reused across calls"""
+        buf = getattr(self._local, "buf", None)
+        if buf is None or buf.shape[0] < n_rows:
+            buf = np.empty((max(n_rows, 1), len(self.features)))
+            self._local.buf = buf
+        return buf[:n_rows]
+
+    def transform(self, X):
+        """Scale a float64 (n_rows, n_features) array in place and return it"""
+        np.multiply(X, self.scale, out=X)
+        np.add(X, self.offset, out=X)
+        return X
+
+    def row(self, values):
+        """Scale one raw feature vector; the result is only valid until this thread's next call"""
+        X = self.buffer(1)
+        X[0] = values
+        return self.transform(X)
+
+
+def load_preprocessor(std_path="models/standard_scaler.pkl", mm_path="models/minmax_scaler.pkl"):
+    with open(std_path, "rb") as f:
+        std_scaler = pickle.load(f)
+    with open(mm_path, "rb") as f:
+        mm_scaler = pickle.load(f)
+    return FusedPreprocessor(std_scaler, mm_scaler)
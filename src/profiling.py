@@ -0,0 +1,15 @@
+# src/profiling.py
+import sys
+
+
+def peak_rss_mb():
+    """Peak resident memory in MB as (this process, its reaped children); None without `resource`"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    own  = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return own / 1e6, kids / 1e6
@@ -0,0 +1,155 @@
+# src/result_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SQLiteResultBackend:
+    """
+    Result store shared by several uvicorn workers on one host.
+
+    A single SQLite file in WAL mode; each thread keeps its own connection. Any
+    SQLite error is treated as a miss, so the cache can never fail a request.
+    """
+
+    def __init__(self, path, ttl=300.0):
+        self.path   = path
+        self.ttl    = ttl
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        try:
+            row = self._conn().execute(
+                "SELECT value FROM results WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, value):
+        try:
+            conn = self._conn()
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                         (key, json.dumps(value), time.time() + self.ttl))
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def purge(self):
+        try:
+            conn = self._conn()
+            conn.execute("DELETE FROM results WHERE expires <= ?", (time.time(),))
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+
+class ResultCache:
+    """
+    Bounded LRU + TTL cache of prediction results.
+
+    Keys combine the active model version with the canonical feature tuple, so a
+    model swap never serves a stale result. An optional shared backend is checked
+    on a local miss and filled on every put.
+    """
+
+    def __init__(self, max_size=10000, ttl=300.0, backend=None):
+        self.max_size  = max_size
+        self.ttl       = ttl
+        self.backend   = backend
+        self._entries  = OrderedDict()
+        self._lock     = threading.Lock()
+        self.hits      = 0
+        self.misses    = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.expired   = 0
+        self._puts     = 0
+
+    @staticmethod
+    def make_key(version, values):
+        return json.dumps([version, *(float(v) for v in values)])
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expired += 1
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._store(key, value)
+                with self._lock:
+                    self.shared_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._store(key, value)
+        if self.backend is not None:
+            self.backend.put(key, value)
+            self._puts += 1
+            if self._puts % 1000 == 0:
+                self.backend.purge()
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size":        len(self._entries),
+                "max_size":    self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits":        self.hits,
+                "shared_hits": self.shared_hits,
+                "misses":      self.misses,
+                "evictions":   self.evictions,
+                "expired":     self.expired,
+                "hit_rate":    round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                "shared_backend": self.backend.path if self.backend is not None else None
+            }
+
+
+def cache_from_env():
+    """RESULT_CACHE_SIZE (0 disables), RESULT_CACHE_TTL seconds, RESULT_CACHE_SHARED SQLite path"""
+    size = int(os.environ.get("RESULT_CACHE_SIZE", "10000"))
+    if size <= 0:
+        return None
+    ttl    = float(os.environ.get("RESULT_CACHE_TTL", "300"))
+    shared = os.environ.get("RESULT_CACHE_SHARED", "")
+    return ResultCache(size, ttl, SQLiteResultBackend(shared, ttl) if shared else None)
@@ -1,14 +1,12 @@
 # src/retrain_pipeline.py
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from drift_detector import check_drift
-from train import train_model
+from src import incremental
+from src.drift_detector import check_drift
+from src.train import train_model
 from mlflow.tracking import MlflowClient
 
 # ── Config ────────────────────────────────────────────────────
 ACCURACY_THRESHOLD = 0.85
+MAX_ACCURACY_STD   = 0.05     # CV fold-to-fold spread above this is too unstable to promote
 MODEL_NAME         = "HeartDiseaseModel"
 
 def get_current_production_accuracy():
@@ -61,14 +59,20 @@ def run_pipeline():
 
     # ── Step 2: Retrain model ─────────────────────────────────
     print("\n🔁 Step 2: Drift detected — starting retraining...")
-    _, new_accuracy = train_model(data_path="data/current_data.csv")
+    _, new_accuracy, cv = train_model(data_path="data/current_data.csv")
+    # The trained model itself must clear the threshold on its holdout. Full refits also
+    # report CV (incremental updates don't), whose mean and spread must pass too
+    cv_accuracy = cv["mean"] if cv else new_accuracy
+    cv_std      = cv["std"] if cv else 0.0
 
     # ── Step 3: Compare with threshold ───────────────────────
     print(f"\n📈 Step 3: Evaluating new model...")
     print(f"New model accuracy  : {new_accuracy:.4f}")
-    print(f"Required threshold  : {ACCURACY_THRESHOLD}")
+    if cv:
+        print(f"CV accuracy         : {cv_accuracy:.4f} ± {cv_std:.4f}")
+    print(f"Required threshold  : {ACCURACY_THRESHOLD}" + (f" (CV std ≤ {MAX_ACCURACY_STD})" if cv else ""))
 
-    if new_accuracy >= ACCURACY_THRESHOLD:
+    if min(new_accuracy, cv_accuracy) >= ACCURACY_THRESHOLD and cv_std <= MAX_ACCURACY_STD:
         # ── Step 4: Promote to production ────────────────────
         print(f"\n🚀 Step 4: New model meets threshold — promoting...")
         try:
@@ -77,11 +81,19 @@ def run_pipeline():
             if versions:
                 latest_version = versions[-1].version
                 promote_model(latest_version)
+                # Incremental runs build on the promoted model's forest, never a rejected one
+                if incremental.promote_state():
+                    print("✅ Incremental training state updated")
         except Exception as e:
             print(f"Promotion error: {e}")
+    elif min(new_accuracy, cv_accuracy) < ACCURACY_THRESHOLD:
+        print(f"\n❌ New model accuracy {min(new_accuracy, cv_accuracy):.4f} below threshold {ACCURACY_THRESHOLD}")
+        print("Keeping existing production model — retraining rejected")
+        incremental.discard_pending_state()
     else:
-        print(f"\n❌ New model accuracy {new_accuracy:.4f} below threshold {ACCURACY_THRESHOLD}")
+        print(f"\n❌ Fold accuracy std {cv_std:.4f} above {MAX_ACCURACY_STD} — results too unstable")
         print("Keeping existing production model — retraining rejected")
+        incremental.discard_pending_state()
 
     print("\n" + "=" * 50)
     print("   PIPELINE COMPLETE")
@@ -0,0 +1,150 @@
+# src/score.py
+"""
+Offline bulk scoring for files in the data/heart.csv schema.
+
+    python -m src.score data/heart.csv predictions.csv
+    python -m src.score big.parquet predictions.parquet --chunksize 100000 --workers 4
+
+Input is streamed in chunks and each chunk is scaled and scored independently, so
+memory stays flat regardless of file size. Output keeps the input columns and adds
+prediction, probability and risk_level.
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.forest_scorer import compile_forest
+from src.preprocessing import FEATURES, FusedPreprocessor
+from src.profiling import peak_rss_mb
+
+_scorer       = None
+_preprocessor = None
+
+
+def _load(cache_dir):
+    """Load the production model + scalers once per process"""
+    global _scorer, _preprocessor
+    if _scorer is None:
+        from src.model_cache import load_production
+        model, std, mm, _ = load_production(cache_dir)
+        _scorer       = compile_forest(model) or model
+        _preprocessor = FusedPreprocessor(std, mm)
+
+
+def score_chunk(chunk, cache_dir=None):
+    _load(cache_dir)
+    missing = [c for c in FEATURES if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {missing}")
+
+    X = _preprocessor.transform(chunk[FEATURES].to_numpy(dtype=np.float64, copy=True))
+    if hasattr(_scorer, "feature_names_in_"):
+        X = pd.DataFrame(X, columns=FEATURES)
+    proba       = _scorer.predict_proba(X)
+    probability = proba[:, list(_scorer.classes_).index(1)]
+
+    out = chunk.copy()
+    out["prediction"]  = _scorer.classes_[proba.argmax(axis=1)]
+    out["probability"] = probability.round(4)
+    out["risk_level"]  = np.select([probability > 0.7, probability > 0.4], ["High", "Medium"], "Low")
+    return out
+
+
+def require_pyarrow(*paths):
+    """Parquet goes through pyarrow; fail before any scoring when it's needed but missing"""
+    if not any(path.endswith(".parquet") for path in paths):
+        return
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Reading or writing .parquet files needs pyarrow (pip install pyarrow)") from None
+
+
+def read_chunks(path, chunksize):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """Appends scored chunks to CSV or Parquet without holding earlier chunks"""
+
+    def __init__(self, path):
+        self.path    = path
+        self._writer = None
+        self._first  = True
+
+    def write(self, df):
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(input_path, output_path, chunksize=50000, workers=1, cache_dir=None):
+    from src.model_cache import CACHE_DIR
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    require_pyarrow(input_path, output_path)
+    writer = ChunkWriter(output_path)
+    rows   = 0
+    start  = time.perf_counter()
+    try:
+        if workers <= 1:
+            for chunk in read_chunks(input_path, chunksize):
+                scored = score_chunk(chunk, cache_dir)
+                writer.write(scored)
+                rows += len(scored)
+        else:
+            # At most 2 chunks per worker in flight keeps memory bounded; results are written in input order
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in read_chunks(input_path, chunksize):
+                    pending.append(pool.submit(score_chunk, chunk, cache_dir))
+                    if len(pending) >= workers * 2:
+                        scored = pending.popleft().result()
+                        writer.write(scored)
+                        rows += len(scored)
+                while pending:
+                    scored = pending.popleft().result()
+                    writer.write(scored)
+                    rows += len(scored)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {rows:,} rows → {output_path}")
+    print(f"Elapsed   : {elapsed:.2f} s")
+    print(f"Throughput: {rows / elapsed:,.0f} rows/sec" if elapsed > 0 else "Throughput: n/a")
+    rss = peak_rss_mb()
+    if rss:
+        print(f"Peak RSS  : {rss[0]:.1f} MB (main)" + (f", {rss[1]:.1f} MB (largest worker)" if workers > 1 else ""))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-score a CSV/Parquet file with the production model")
+    parser.add_argument("input",  help="CSV or .parquet file in the data/heart.csv schema")
+    parser.add_argument("output", help="Output path; .parquet writes Parquet, anything else CSV")
+    parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk (default 50000)")
+    parser.add_argument("--workers",   type=int, default=1,     help="Processes scoring chunks in parallel")
+    parser.add_argument("--cache-dir", default=None, help="Model cache directory (default MODEL_CACHE_DIR)")
+    args = parser.parse_args()
+    run(args.input, args.output, args.chunksize, args.workers, args.cache_dir)
@@ -4,13 +4,26 @@ import pandas as pd
 import numpy as np
 import os
 import pickle
+import time
 import mlflow
 import mlflow.sklearn
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedKFold, train_test_split
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
 from sklearn.metrics import accuracy_score, roc_auc_score, f1_score
 
+from src.preprocessing import STD_COLS, MM_COLS, CATEGORICAL_COLS
+from src import incremental
+from src.profiling import peak_rss_mb
+
+# "full": refit everything from scratch; "incremental" (opt-in): grow the saved forest on
+# rows appended since the last run, falling back to a full refit when there is no usable state
+RETRAIN_MODE = os.environ.get("RETRAIN_MODE", "full")
+# Cores a retrain may use for fitting and cross-validation (-1: all of them; 0 is rejected by train_model)
+RETRAIN_N_JOBS = int(os.environ.get("RETRAIN_N_JOBS", "-1"))
+CV_FOLDS       = int(os.environ.get("RETRAIN_CV_FOLDS", "5"))   # below 2 skips CV
+
 # ── MLflow setup ──────────────────────────────────────────────
 _tracking_uri = os.environ.get("MLFLOW_TRACKING_URI", "sqlite:///mlflow.db")
 if not _tracking_uri.startswith("sqlite:///") and not _tracking_uri.startswith("http"):
@@ -23,45 +36,87 @@ def preprocess(df):
     df = df.copy()
 
     # Encode categorical columns
-    categorical_cols = ["sex", "chest pain type", "fasting blood sugar",
-                        "resting ecg", "exercise angina", "ST slope"]
-    
     le = LabelEncoder()
-    for col in categorical_cols:
+    for col in CATEGORICAL_COLS:
         if col in df.columns:
             df[col] = le.fit_transform(df[col].astype(str))
 
     # StandardScaler — same 4 columns as notebook
     standard_scaler = StandardScaler()
-    df[["resting bp s", "cholesterol", "max heart rate", "age"]] = \
-        standard_scaler.fit_transform(
-            df[["resting bp s", "cholesterol", "max heart rate", "age"]]
-        )
+    df[STD_COLS] = standard_scaler.fit_transform(df[STD_COLS])
 
     # MinMaxScaler — oldpeak only
     min_max_scaler = MinMaxScaler()
-    df[["oldpeak"]] = min_max_scaler.fit_transform(df[["oldpeak"]])
+    df[MM_COLS] = min_max_scaler.fit_transform(df[MM_COLS])
 
     return df, standard_scaler, min_max_scaler
 
 
-def train_model(data_path="data/heart.csv"):
+def full_fit(df, params, n_jobs=RETRAIN_N_JOBS):
+    """Incremental mode's refit: encoders, scalers and a new forest on the hash-keyed training rows"""
+    df_processed, std_scaler, mm_scaler = preprocess(df)
+    train = df_processed[~incremental.holdout_mask(df)]
+    model = RandomForestClassifier(**params, n_jobs=n_jobs)
+    model.fit(train.drop("target", axis=1), train["target"])
+    return incremental.fit_state(df, model, std_scaler, mm_scaler)
+
+
+def cross_validate(X, y, params, folds=CV_FOLDS, n_jobs=RETRAIN_N_JOBS):
+    """
+    Stratified k-fold accuracy of a fresh forest with `params`, folds fitted in parallel.
+
+    Folds run on threads (tree building releases the GIL); cores left over once every
+    fold has one are handed to the trees inside each fold.
+    """
+    cores    = effective_n_jobs(n_jobs)
+    workers  = min(folds, cores)
+    per_fold = max(1, cores // workers)
+
+    def fit_fold(train_idx, test_idx):
+        model = RandomForestClassifier(**params, n_jobs=per_fold)
+        start = time.perf_counter()
+        model.fit(X.iloc[train_idx], y.iloc[train_idx])
+        fit_seconds = time.perf_counter() - start
+        return fit_seconds, accuracy_score(y.iloc[test_idx], model.predict(X.iloc[test_idx]))
+
+    splits  = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42).split(X, y)
+    results = Parallel(n_jobs=workers, prefer="threads")(delayed(fit_fold)(tr, te) for tr, te in splits)
+    fit_seconds, accuracy = map(np.array, zip(*results))
+    return {"fold_fit_seconds": fit_seconds, "fold_accuracy": accuracy,
+            "mean": float(accuracy.mean()), "std": float(accuracy.std())}
+
+
+def train_model(data_path="data/heart.csv", mode=None, n_jobs=None):
+    """Train (from scratch or incrementally) and register a model; returns (model, holdout accuracy, cv or None)"""
+    mode   = mode or RETRAIN_MODE
+    n_jobs = RETRAIN_N_JOBS if n_jobs is None else n_jobs
+    if mode not in ("full", "incremental"):
+        raise ValueError(f"Unknown retrain mode {mode!r}; use 'full' or 'incremental'")
+    if n_jobs == 0:
+        raise ValueError("n_jobs (RETRAIN_N_JOBS) must be a positive core count or negative (-1: all cores), not 0")
+
     # ── Load data ─────────────────────────────────────────────
     df = pd.read_csv(data_path)
+    incremental.discard_pending_state()   # left by an earlier run that was never promoted
     print(f"Dataset loaded: {df.shape}")
 
-    # ── Preprocess ────────────────────────────────────────────
-    df_processed, std_scaler, mm_scaler = preprocess(df)
-
-    # ── Split features and target ─────────────────────────────
-    X = df_processed.drop("target", axis=1)
-    y = df_processed["target"]
+    if mode == "full":
+        # ── Preprocess ────────────────────────────────────────
+        df_processed, std_scaler, mm_scaler = preprocess(df)
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+        # ── Split features and target ─────────────────────────
+        X = df_processed.drop("target", axis=1)
+        y = df_processed["target"]
 
-    print(f"Train size: {X_train.shape} | Test size: {X_test.shape}")
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+        print(f"Train size: {X_train.shape} | Test size: {X_test.shape}")
+    else:
+        # Incremental runs hold out rows by a hash of their values (see incremental.holdout_mask),
+        # so a row keeps its side as the file grows and updates never train on test rows
+        n_test = int(incremental.holdout_mask(df).sum())
+        print(f"Train size: {len(df) - n_test} rows | Test size: {n_test} rows")
 
     # ── MLflow run ────────────────────────────────────────────
     with mlflow.start_run():
@@ -74,10 +129,34 @@ def train_model(data_path="data/heart.csv"):
             "min_samples_split": 2
         }
         mlflow.log_params(params)
+        mlflow.log_param("n_jobs", effective_n_jobs(n_jobs))
 
         # Train
-        model = RandomForestClassifier(**params)
-        model.fit(X_train, y_train)
+        start = time.perf_counter()
+        rows_new = len(df)
+        if mode == "full":
+            model = RandomForestClassifier(**params, n_jobs=n_jobs)
+            model.fit(X_train, y_train)
+        else:
+            previous = incremental.load_state()
+            if previous:
+                previous["model"].set_params(n_jobs=n_jobs)
+            state = incremental.update_forest(previous, df) if previous else None
+            if state is not None:
+                rows_new = len(df) - previous["rows_seen"]
+                print(f"Incremental update: {rows_new} new rows, "
+                      f"{len(state['model'].estimators_)} trees")
+            else:
+                print("No usable incremental state or update limit reached — full refit")
+                state = full_fit(df, params, n_jobs)
+            model, std_scaler, mm_scaler = state["model"], state["std_scaler"], state["mm_scaler"]
+            X_test, y_test = incremental.holdout(df, state)
+        train_seconds = time.perf_counter() - start
+        # Serving predicts one row at a time; a thread pool per call would only add overhead
+        model.set_params(n_jobs=None)
+        # The state only becomes the base for the next update once the pipeline promotes this model
+        if mode == "incremental":
+            incremental.save_state(state, incremental.pending_path())
 
         # Evaluate
         preds      = model.predict(X_test)
@@ -87,14 +166,42 @@ def train_model(data_path="data/heart.csv"):
         auc        = roc_auc_score(y_test, proba)
         f1         = f1_score(y_test, preds)
 
+        # Full refits also cross-validate the configuration on the training rows, and promotion
+        # checks its mean and spread. Incremental updates skip it: CV refits fresh forests, which
+        # would cost more than the update and says nothing about the grown forest being promoted
+        cv = None
+        if mode == "full" and CV_FOLDS >= 2:
+            start = time.perf_counter()
+            cv    = cross_validate(X_train, y_train, params, CV_FOLDS, n_jobs)
+            mlflow.log_metric("cv_seconds", time.perf_counter() - start)
+            for fold, (seconds, fold_accuracy) in enumerate(zip(cv["fold_fit_seconds"], cv["fold_accuracy"])):
+                mlflow.log_metric("cv_fold_fit_seconds", seconds, step=fold)
+                mlflow.log_metric("cv_fold_accuracy", fold_accuracy, step=fold)
+
         # Log metrics
+        mlflow.log_param("retrain_mode", mode)
         mlflow.log_metric("accuracy", accuracy)
         mlflow.log_metric("roc_auc",  auc)
         mlflow.log_metric("f1_score", f1)
-
-        print(f"\n✅ Accuracy : {accuracy:.4f}")
+        mlflow.log_metric("train_seconds", train_seconds)
+        mlflow.log_metric("rows_total", len(df))
+        mlflow.log_metric("rows_new", rows_new)
+        mlflow.log_metric("n_trees", len(model.estimators_))
+        if mode == "incremental":
+            mlflow.log_metric("updates_since_full", state["updates"])
+        if cv is not None:
+            mlflow.log_metric("cv_accuracy_mean", cv["mean"])
+            mlflow.log_metric("cv_accuracy_std", cv["std"])
+        rss = peak_rss_mb()
+        if rss is not None:
+            mlflow.log_metric("peak_rss_mb", rss[0])
+
+        print(f"\n✅ Mode     : {mode} ({train_seconds:.2f}s)")
+        print(f"✅ Accuracy : {accuracy:.4f}")
         print(f"✅ ROC-AUC  : {auc:.4f}")
         print(f"✅ F1 Score : {f1:.4f}")
+        if cv is not None:
+            print(f"✅ CV ({len(cv['fold_accuracy'])} folds): {cv['mean']:.4f} ± {cv['std']:.4f}")
 
         # Log model to MLflow registry
         mlflow.sklearn.log_model(
@@ -111,7 +218,7 @@ def train_model(data_path="data/heart.csv"):
         print("\n✅ Model registered in MLflow")
         print("✅ Scalers saved to models/")
 
-        return model, accuracy
+        return model, accuracy, cv
 
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+# src/user_store.py
+import contextlib
+import copy
+import hmac
+import json
+import os
+import tempfile
+import threading
+
+import bcrypt
+
+USERS_FILE    = os.environ.get("USERS_FILE", "users.json")
+# bcrypt cost factor: each +1 doubles the time per hash (12 is ~0.3 s per login on one core)
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def hash_password(password, rounds=None):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds or BCRYPT_ROUNDS)).decode()
+
+
+def _is_hash(stored):
+    return stored.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def _rounds(stored):
+    return int(stored.split("$")[2])
+
+
+class UserStore:
+    """
+    users.json behind an in-memory index.
+
+    Lookups use the cached dict and re-read the file only when its mtime or size
+    changes. Writes hold `<file>.lock` across the read-modify-write, so concurrent
+    signups from other sessions or processes can't drop each other's accounts. The new
+    file is written to a temp file and moved into place, so readers never see a
+    partial one.
+
+    Passwords are bcrypt hashes. Plaintext entries and hashes below BCRYPT_ROUNDS are
+    rehashed the first time their user logs in successfully.
+    """
+
+    def __init__(self, path=USERS_FILE, rounds=None):
+        self.path   = path
+        self.rounds = rounds or BCRYPT_ROUNDS
+        self._users = {}
+        self._stamp = None
+        self._lock  = threading.Lock()
+        # Unknown usernames are checked against this so they take as long as a wrong password
+        self._dummy = hash_password("not a password", self.rounds)
+
+    # ── Index ─────────────────────────────────────────────────
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def _refresh(self):
+        stamp = self._stat()
+        if stamp != self._stamp:
+            with self._lock:
+                self._users, self._stamp = self._read(), stamp
+        return self._users
+
+    def get(self, username):
+        return self._refresh().get(username)
+
+    def __len__(self):
+        return len(self._refresh())
+
+    # ── Writes ────────────────────────────────────────────────
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Exclusive lock across threads and processes; yields the current file contents to
+        modify. The file is rewritten only if they changed, so a rejected signup costs no write.
+        """
+        with self._lock, open(self.path + ".lock", "a+") as lock_file:
+            _lock(lock_file)
+            try:
+                users  = self._read()
+                before = copy.deepcopy(users)
+                yield users
+                if users != before:
+                    self._write(users)
+            finally:
+                _unlock(lock_file)
+
+    def _write(self, users):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".users-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(users, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._users, self._stamp = users, self._stat()
+
+    def register(self, username, name, password):
+        with self._locked() as users:
+            if username in users:
+                return False, "Username already exists"
+            users[username] = {"name": name, "password": hash_password(password, self.rounds)}
+        return True, "Account created successfully"
+
+    def hash_plaintext(self):
+        """Hash every plaintext password in place; returns how many were converted"""
+        with self._locked() as users:
+            plain = [u for u in users.values() if not _is_hash(u["password"])]
+            for user in plain:
+                user["password"] = hash_password(user["password"], self.rounds)
+        return len(plain)
+
+    # ── Login ─────────────────────────────────────────────────
+    def authenticate(self, username, password):
+        """The user's record when the password matches, otherwise None"""
+        user = self.get(username)
+        if user is None:
+            bcrypt.checkpw(password.encode(), self._dummy.encode())
+            return None
+        stored = user["password"]
+        if _is_hash(stored):
+            ok = bcrypt.checkpw(password.encode(), stored.encode())
+            stale = ok and _rounds(stored) < self.rounds
+        else:
+            ok = stale = hmac.compare_digest(stored.encode(), password.encode())
+        if stale:
+            self._upgrade(username, password, stored)
+        return user if ok else None
+
+    def _upgrade(self, username, password, stored):
+        with self._locked() as users:
+            # Skip if the password changed since we read it
+            if username in users and users[username]["password"] == stored:
+                users[username]["password"] = hash_password(password, self.rounds)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # ── Login latency at 10k users: reparse-per-login vs cached index ──
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    logins  = 200
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.json")
+        hashes = [hash_password(f"pw{i}", 4) for i in range(100)]   # cost 4: only the lookup is timed
+        users = {f"user{i}": {"name": f"User {i}", "password": hashes[i % 100]} for i in range(n_users)}
+        with open(path, "w") as f:
+            json.dump(users, f, indent=2)
+        print(f"users.json: {n_users:,} users, {os.path.getsize(path) / 1e6:.2f} MB")
+
+        # What appui did per login: parse the whole file, then look the user up
+        start = time.perf_counter()
+        for i in range(logins):
+            with open(path) as f:
+                json.load(f).get(f"user{i * 37 % n_users}")
+        reparse_ms = (time.perf_counter() - start) / logins * 1000
+
+        store = UserStore(path, rounds=4)
+        store.get("user0")
+        start = time.perf_counter()
+        for i in range(logins):
+            store.get(f"user{i * 37 % n_users}")
+        cached_ms = (time.perf_counter() - start) / logins * 1000
+        print(f"user lookup     : {reparse_ms:8.3f} ms reparsing  → {cached_ms:8.4f} ms cached")
+
+        for rounds in (10, 12):
+            stored = hash_password("secret", rounds)
+            start  = time.perf_counter()
+            for _ in range(5):
+                bcrypt.checkpw(b"secret", stored.encode())
+            print(f"bcrypt verify   : {(time.perf_counter() - start) / 5 * 1000:8.1f} ms at cost {rounds}")
+
+        start = time.perf_counter()
+        store.register("new_user", "New User", "secret")
+        print(f"signup (write)  : {(time.perf_counter() - start) * 1000:8.1f} ms including one cost-4 hash")
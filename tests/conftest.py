@@ -0,0 +1,16 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# No tracking server runs under test; let registry lookups fail at once instead of retrying
+os.environ.setdefault("MLFLOW_HTTP_REQUEST_MAX_RETRIES", "0")
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture(scope="session")
+def heart():
+    """data/heart.csv as read by the training code"""
+    return pd.read_csv(DATA_DIR / "heart.csv")
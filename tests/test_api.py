@@ -0,0 +1,102 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src import api
+
+PATIENT = {"age": 54, "sex": 1, "chest_pain_type": 2, "resting_bp": 130, "cholesterol": 246,
+           "fasting_blood_sugar": 0, "resting_ecg": 1, "max_heart_rate": 150,
+           "exercise_angina": 0, "oldpeak": 1.0, "st_slope": 2}
+
+
+@pytest.fixture(scope="module")
+def client():
+    if api.holder.current is None:
+        pytest.skip("no trained model available to serve")
+    return TestClient(api.app)
+
+
+# ── Batch body parsing ────────────────────────────────────────
+
+def test_parse_json_array():
+    patients = api.parse_batch(json.dumps([PATIENT, PATIENT]).encode(), "application/json")
+    assert [p.age for p in patients] == [54, 54]
+
+
+def test_parse_ndjson_skips_blank_lines():
+    body = f"{json.dumps(PATIENT)}\n\n{json.dumps({**PATIENT, 'age': 60})}\n".encode()
+    assert [p.age for p in api.parse_batch(body, "application/x-ndjson")] == [54, 60]
+
+
+@pytest.mark.parametrize("body, content_type", [
+    (b"[{", "application/json"),
+    (json.dumps(PATIENT).encode(), "application/json"),
+    (b"{\"age\": 1}\nnot json\n", "application/x-ndjson"),
+])
+def test_malformed_bodies_are_400(body, content_type):
+    with pytest.raises(HTTPException) as e:
+        api.parse_batch(body, content_type)
+    assert e.value.status_code == 400
+
+
+def test_invalid_row_is_422_with_its_index():
+    body = json.dumps([PATIENT, {**PATIENT, "sex": "male"}]).encode()
+    with pytest.raises(HTTPException) as e:
+        api.parse_batch(body, "application/json")
+    assert e.value.status_code == 422
+    assert e.value.detail.startswith("Row 1:")
+
+
+# ── Endpoints ─────────────────────────────────────────────────
+
+def test_batch_matches_single_predictions(client):
+    rows   = [PATIENT, {**PATIENT, "age": 67, "oldpeak": 3.1, "exercise_angina": 1}]
+    single = [client.post("/predict", json=row).json() for row in rows]
+    batch  = client.post("/predict/batch", json=rows)
+    assert batch.status_code == 200
+    assert batch.headers["X-Batch-Size"] == "2"
+    assert batch.json() == {"count": 2, "results": single}
+
+
+def test_batch_accepts_ndjson(client):
+    body = "\n".join(json.dumps(row) for row in [PATIENT] * 3)
+    response = client.post("/predict/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.json()["count"] == 3
+
+
+def test_batch_error_statuses(client):
+    assert client.post("/predict/batch", content=b"[", headers={"content-type": "application/json"}).status_code == 400
+    assert client.post("/predict/batch", json=[{**PATIENT, "age": None}]).status_code == 422
+    assert client.post("/predict/batch", json=[]).json() == {"count": 0, "results": []}
+
+
+def test_metrics_exposition(client):
+    client.post("/predict", json=PATIENT)
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert "# TYPE heart_api_stage_seconds histogram" in text
+    assert 'heart_api_stage_seconds_count{stage="predict_proba"}' in text
+    assert 'heart_api_requests_total{route="/predict",method="POST",status="200"}' in text
+    assert f'heart_api_model_info{{version="{api.holder.current.version}"' in text
+
+
+def test_compare_scores_each_model_and_their_ensemble(client):
+    if api.router is None:
+        pytest.skip("no comparison models loaded")
+    names = ["logistic_regression", "random_forest"]
+    body  = client.post(f"/models/compare?models={','.join(names)}", json=[PATIENT] * 2).json()
+    assert body["count"] == 2 and list(body["models"]) == names
+    mean  = sum(body["models"][n][0]["probability"] for n in names) / 2
+    assert body["ensemble"][0]["probability"] == pytest.approx(mean, abs=1e-4)
+    assert client.post("/models/compare?models=xgboost", json=[PATIENT]).status_code == 404
+    assert client.post("/models/xgboost/predict", json=PATIENT).status_code == 404
+
+
+def test_model_info_leaves_out_unknown_metrics(client):
+    info = client.get("/model/info").json()
+    assert info["version"] == api.holder.current.version
+    assert None not in info.values()
+    assert set(info) - {"model_type", "scorer", "version"} == set(api.holder.current.metrics)
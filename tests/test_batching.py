@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.batching import MicroBatcher
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_submits_share_one_call():
+    calls = []
+
+    def score(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def main():
+        batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        finally:
+            await batcher.stop()
+
+    assert run(main()) == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+
+
+def test_batches_are_capped_at_max_size():
+    calls = []
+
+    def score(items):
+        calls.append(len(items))
+        return items
+
+    async def main():
+        batcher = MicroBatcher(score, max_batch_size=3, max_wait_ms=50)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+        finally:
+            await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = run(main())
+    assert results == list(range(7))
+    assert calls == [3, 3, 1]
+    assert stats["batch_size"]["count"] == 3
+
+
+def test_lone_request_waits_at_most_max_wait():
+    async def main():
+        batcher = MicroBatcher(lambda items: items, max_batch_size=32, max_wait_ms=5)
+        await batcher.start()
+        try:
+            return await asyncio.wait_for(batcher.submit("only"), timeout=1)
+        finally:
+            await batcher.stop()
+
+    assert run(main()) == "only"
+
+
+def test_scoring_error_reaches_every_caller_and_the_loop_survives():
+    fail = threading.Event()
+    fail.set()
+
+    def score(items):
+        if fail.is_set():
+            fail.clear()
+            raise RuntimeError("model exploded")
+        return items
+
+    async def main():
+        batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+        try:
+            first = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+            return first, await batcher.submit("after")
+        finally:
+            await batcher.stop()
+
+    first, after = run(main())
+    assert all(isinstance(r, RuntimeError) for r in first)
+    assert after == "after"
@@ -0,0 +1,46 @@
+from src.drift_engine import ReferenceSketch, load_reference_sketch, share_of_drifted_columns
+
+
+def test_reference_against_itself_does_not_drift(heart):
+    results = ReferenceSketch.build(heart).compare(heart)
+    assert set(results) == set(heart.columns)
+    assert share_of_drifted_columns(results) == 0.0
+
+
+def test_shifted_column_drifts(heart):
+    current = heart.sample(5000, replace=True, random_state=0).reset_index(drop=True)
+    current["age"] = current["age"] + 20
+    results = ReferenceSketch.build(heart).compare(current)
+    assert results["age"]["drifted"]
+    assert not results["cholesterol"]["drifted"]
+
+
+def test_float_categories_match_integer_reference(heart):
+    sketch = ReferenceSketch.build(heart)
+    assert sketch.columns["sex"]["kind"] == "categorical"
+    as_float = heart.astype({"sex": float})
+    assert sketch.compare(as_float)["sex"] == sketch.compare(heart)["sex"]
+
+
+def test_sketch_round_trips_through_json(heart, tmp_path):
+    sketch = ReferenceSketch.build(heart, source_hash="abc")
+    sketch.save(tmp_path / "sketch.json")
+    loaded = ReferenceSketch.load(tmp_path / "sketch.json")
+    assert loaded.source_hash == "abc"
+    assert loaded.compare(heart.iloc[:300]) == sketch.compare(heart.iloc[:300])
+
+
+def test_sketch_is_rebuilt_only_when_the_reference_changes(heart, tmp_path):
+    reference, sketch_path = tmp_path / "reference.csv", tmp_path / "sketch.json"
+    heart.to_csv(reference, index=False)
+    first = load_reference_sketch(reference, sketch_path)
+    assert load_reference_sketch(reference, sketch_path).source_hash == first.source_hash
+
+    heart.iloc[:500].to_csv(reference, index=False)
+    rebuilt = load_reference_sketch(reference, sketch_path)
+    assert rebuilt.source_hash != first.source_hash
+    assert rebuilt.n_rows == 500
+
+
+def test_no_results_means_no_drift():
+    assert share_of_drifted_columns({}) == 0.0
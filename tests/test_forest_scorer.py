@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from src.forest_scorer import compile_forest
+
+
+@pytest.fixture(scope="module")
+def fitted(heart):
+    X = heart.drop("target", axis=1)
+    forest = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42, min_samples_split=2)
+    return forest.fit(X, heart["target"]), X
+
+
+def test_predict_proba_matches_sklearn(fitted):
+    forest, X = fitted
+    compiled  = compile_forest(forest)
+    np.testing.assert_allclose(compiled.predict_proba(X.to_numpy()), forest.predict_proba(X), atol=1e-9)
+    assert (compiled.predict(X.to_numpy()) == forest.predict(X)).all()
+
+
+def test_blocked_scoring_matches_single_block(fitted):
+    forest, X = fitted
+    compiled  = compile_forest(forest)
+    X = X.to_numpy()
+    np.testing.assert_array_equal(compiled.predict_proba(X, block_size=97), compiled.predict_proba(X))
+
+
+def test_unbounded_depth(heart):
+    X = heart.drop("target", axis=1)
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, heart["target"])
+    np.testing.assert_allclose(compile_forest(forest).predict_proba(X.to_numpy()), forest.predict_proba(X), atol=1e-9)
+
+
+def test_only_forests_compile(heart):
+    X = heart.drop("target", axis=1)
+    assert compile_forest(LogisticRegression(max_iter=1000).fit(X, heart["target"])) is None
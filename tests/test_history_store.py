@@ -0,0 +1,152 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.history_store import HistoryStore
+
+START = datetime(2026, 1, 1)
+
+
+def record(i, **overrides):
+    return {"Date": START + timedelta(hours=i), "Patient Name": f"patient {i}", "Patient ID": f"PT{i:04d}",
+            "Doctor": f"doctor{i % 3}", "Age": 35 + i % 40, "Sex": "Male", "Cholesterol": 200.0,
+            "BP": 120.0, "Max HR": 150.0, "Chest Pain": "Typical",
+            "Result": "Heart Disease" if i % 2 else "No Disease",
+            "Probability": 0.64, "Risk": ["Low", "Medium", "High"][i % 3], **overrides}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.db"), legacy_csv=None)
+
+
+# ── Writer ────────────────────────────────────────────────────
+def test_appended_records_are_committed_after_flush(store):
+    for i in range(600):                  # more than one write batch
+        store.append(record(i))
+    store.flush()
+    df = store.query()
+    assert len(df) == 600
+    assert df["Patient ID"].iloc[0] == "PT0599"    # newest first
+
+
+def test_concurrent_appends_are_all_written(store):
+    def worker(offset):
+        for i in range(offset, offset + 200):
+            store.append(record(i))
+
+    threads = [threading.Thread(target=worker, args=(n * 200,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    store.flush()
+    assert store.query(columns=["Patient ID"])["Patient ID"].nunique() == 800
+
+
+def test_unwritable_record_does_not_stop_the_writer(store):
+    store.append(record(0, **{"Patient Name": object()}))
+    store.flush()                         # its batch is rolled back as a whole
+    store.append(record(1))
+    store.flush()
+    assert store.query()["Patient ID"].tolist() == ["PT0001"]
+
+
+def test_query_filters(store):
+    for i in range(30):
+        store.append(record(i))
+    store.flush()
+    assert set(store.query(doctor="doctor1")["Doctor"]) == {"doctor1"}
+    assert set(store.query(risk="High")["Risk"]) == {"High"}
+    assert len(store.query(since=START + timedelta(hours=10), until=START + timedelta(hours=20))) == 10
+    assert store.query(search="PT0007")["Patient Name"].tolist() == ["patient 7"]
+    assert len(store.query(limit=5)) == 5
+    assert list(store.query(columns=["Doctor", "Risk"]).columns) == ["Doctor", "Risk"]
+
+
+def test_legacy_csv_is_imported_into_an_empty_database(tmp_path):
+    csv = tmp_path / "prediction_history.csv"
+    csv.write_text("Date,Patient Name,Patient ID,Doctor,Age,Sex,Cholesterol,BP,Max HR,Chest Pain,Result,Probability,Risk\n"
+                   "2026-03-23 01:02,Ann,PT1,doctor,54,Female,230,130,140,Atypical,Heart Disease,47.6%,Medium\n")
+    store = HistoryStore(str(tmp_path / "history.db"), legacy_csv=str(csv))
+    assert store.query()["Patient Name"].tolist() == ["Ann"]
+    # Not imported a second time on the next start
+    assert len(HistoryStore(str(tmp_path / "history.db"), legacy_csv=str(csv)).query()) == 1
+
+
+# ── Aggregates ────────────────────────────────────────────────
+def expected_counts(df):
+    return {"total": len(df),
+            "disease": int((df["Result"] == "Heart Disease").sum()),
+            "no_disease": int((df["Result"] == "No Disease").sum()),
+            "high": int((df["Risk"] == "High").sum()),
+            "medium": int((df["Risk"] == "Medium").sum()),
+            "low": int((df["Risk"] == "Low").sum())}
+
+
+def test_summary_matches_a_full_recount(store):
+    for i in range(90):
+        store.append(record(i))
+    store.append(record(90, Result=None, Risk=None, Doctor=None))
+    store.flush()
+    df = store.query()
+    assert store.summary() == expected_counts(df)
+    assert store.summary("doctor2") == expected_counts(df[df["Doctor"] == "doctor2"])
+    assert store.doctors() == ["doctor0", "doctor1", "doctor2"]
+
+
+def test_age_groups_use_the_history_page_bins(store):
+    for i, age in enumerate([30, 40, 41, 50, 55, 60, 65, 70, 71, 100, 101]):
+        store.append(record(i, Age=age, Result="Heart Disease"))
+    store.flush()
+    assert store.age_groups().tolist() == [2, 2, 2, 2, 2]
+    assert store.age_groups("No Disease").sum() == 0
+
+
+def test_aggregates_are_rebuilt_when_out_of_step(store):
+    for i in range(20):
+        store.append(record(i))
+    store.flush()
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("DELETE FROM aggregates")
+    assert HistoryStore(store.path, legacy_csv=None).summary() == expected_counts(store.query())
+
+
+# ── Typed columns ─────────────────────────────────────────────
+def test_values_come_back_typed(store):
+    store.append(record(0))
+    store.append(record(1, Date="2026-03-23 01:02", Probability="47.6%", Sex="Female", Risk="Unknown"))
+    store.flush()
+    df = store.query().set_index("Patient ID")
+    assert df.loc["PT0001", "Date"] == datetime(2026, 3, 23, 1, 2)
+    assert df.loc["PT0001", "Probability"] == pytest.approx(0.476)
+    assert df.loc["PT0000", "Probability"] == pytest.approx(0.64)
+    assert df.loc["PT0001", "Sex"] == "Female"
+    assert df["Risk"].isna().tolist() == [True, False]     # unknown label -> NULL
+    assert str(df["Date"].dtype).startswith("datetime64")
+    assert df["Result"].dtype == "category"
+
+
+def test_text_columns_are_migrated_in_place(tmp_path):
+    path = str(tmp_path / "history.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, "
+                     "patient_name TEXT, patient_id TEXT, doctor TEXT, age INTEGER, sex TEXT, cholesterol REAL, "
+                     "bp REAL, max_hr REAL, chest_pain TEXT, result TEXT, probability TEXT, risk TEXT)")
+        conn.executemany("INSERT INTO predictions (date, patient_name, patient_id, doctor, age, sex, cholesterol, "
+                         "bp, max_hr, chest_pain, result, probability, risk) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                         [("2026-03-23 01:02", "Ann", "PT1", "doctor", 54, "Female", 230, 130, 140,
+                           "Atypical", "Heart Disease", "47.6%", "Medium"),
+                          ("2026-03-24 09:30", "Bob", "PT2", "doctor", 61, "Male", 250, 140, 120,
+                           "Asymptomatic", "No Disease", "12.0%", "Low")])
+
+    store = HistoryStore(path, legacy_csv=None)
+    df = store.query()
+    assert df["Patient Name"].tolist() == ["Bob", "Ann"]
+    assert df["Probability"].tolist() == pytest.approx([0.12, 0.476])
+    assert store.summary() == {"total": 2, "disease": 1, "no_disease": 1, "high": 0, "medium": 1, "low": 1}
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        assert conn.execute("SELECT typeof(ts), typeof(sex) FROM predictions LIMIT 1").fetchone() == ("integer", "integer")
@@ -0,0 +1,120 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from src import incremental
+from src.incremental import STD_COLS, MM_COLS
+
+
+@pytest.fixture(scope="module")
+def data(heart):
+    """data/heart.csv resampled with small noise on the continuous columns, as in the benchmark"""
+    rng  = np.random.default_rng(0)
+    rows = heart.sample(3000, replace=True, random_state=0).reset_index(drop=True)
+    for col in STD_COLS + MM_COLS:
+        rows[col] = rows[col] + rng.normal(0, rows[col].std() * 0.05, len(rows))
+    return rows
+
+
+def full_fit(df):
+    std   = StandardScaler().fit(df[STD_COLS])
+    mm    = MinMaxScaler().fit(df[MM_COLS])
+    state = incremental.fit_state(df, None, std, mm)
+    train = df[~incremental.holdout_mask(df)]
+    train = incremental.scale(incremental.encode_categories(train, state["categories"]), std, mm)
+    state["model"] = RandomForestClassifier(n_estimators=50, max_depth=5, random_state=42).fit(
+        train.drop(columns="target"), train["target"])
+    return state
+
+
+def leaves(trees, state, df):
+    X, _ = incremental.holdout(df, state, test=False)
+    X = X.to_numpy(dtype=np.float32)
+    return np.stack([tree.apply(X) for tree in trees])
+
+
+def test_holdout_is_stable_and_stratified(data):
+    mask = incremental.holdout_mask(data)
+    assert (incremental.holdout_mask(data.iloc[:1000]) == mask[:1000]).all()
+    for label in (0, 1):
+        assert mask[data["target"] == label].mean() == pytest.approx(incremental.HOLDOUT_SHARE, abs=0.03)
+
+
+def test_update_grows_the_forest_on_new_rows(data):
+    state   = full_fit(data.iloc[:2000])
+    updated = incremental.update_forest(state, data)
+    assert updated["rows_seen"] == len(data)
+    assert updated["updates"] == 1
+    assert len(updated["model"].estimators_) == 50 + incremental.TREES_PER_UPDATE
+    X, y = incremental.holdout(data, updated)
+    assert (updated["model"].predict(X) == y).mean() > 0.8
+
+
+def test_existing_trees_keep_their_splits_after_rescaling(data):
+    state  = full_fit(data.iloc[:2000])
+    trees  = list(state["model"].estimators_)
+    before = leaves(trees, state, data.iloc[:2000])
+    updated = incremental.update_forest(state, data)
+    assert updated["std_scaler"].n_samples_seen_ == len(data)
+    np.testing.assert_array_equal(leaves(trees, updated, data.iloc[:2000]), before)
+
+
+def test_old_trees_are_dropped_past_max_trees(data, monkeypatch):
+    monkeypatch.setattr(incremental, "MAX_TREES", 60)
+    state   = full_fit(data.iloc[:2000])
+    oldest  = state["model"].estimators_[0]
+    updated = incremental.update_forest(state, data)
+    assert len(updated["model"].estimators_) == updated["model"].n_estimators == 60
+    assert oldest not in updated["model"].estimators_
+
+
+def test_rejected_batch_leaves_the_state_untouched(data, monkeypatch):
+    monkeypatch.setattr(incremental, "MIN_BATCH_ROWS", 10)
+    base     = data.iloc[:2000]
+    state    = full_fit(base)
+    snapshot = pickle.dumps(state)
+    one_class = pd.concat([base, data.iloc[2000:][data["target"].iloc[2000:] == 1]], ignore_index=True)
+    assert incremental.update_forest(state, one_class) is None
+    assert pickle.dumps(state) == snapshot
+
+
+def test_full_refit_needed(data, monkeypatch):
+    state = full_fit(data.iloc[:2000])
+    assert incremental.update_forest(state, data.iloc[:2000]) is None              # nothing new
+    assert incremental.update_forest(state, data.iloc[1:2500]) is None             # file rewritten
+    unseen = data.copy()
+    unseen.loc[2500, "ST slope"] = 9
+    assert incremental.update_forest(state, unseen) is None                        # unseen category
+    monkeypatch.setattr(incremental, "MAX_UPDATES", 1)
+    updated = incremental.update_forest(state, data.iloc[:2500])
+    assert updated is not None
+    assert incremental.update_forest(updated, data) is None                        # refit due
+
+
+def test_state_round_trips(data, tmp_path):
+    state = full_fit(data.iloc[:500])
+    incremental.save_state(state, str(tmp_path / "state.pkl"))
+    loaded = incremental.load_state(str(tmp_path / "state.pkl"))
+    assert loaded["digest"] == state["digest"]
+    assert incremental.load_state(str(tmp_path / "missing.pkl")) is None
+
+
+def test_pending_state_waits_for_promotion(data, tmp_path):
+    path  = str(tmp_path / "state.pkl")
+    first = full_fit(data.iloc[:500])
+    incremental.save_state(first, path)
+    incremental.save_state(full_fit(data.iloc[:600]), incremental.pending_path(path))
+    assert incremental.load_state(path)["rows_seen"] == 500
+
+    incremental.discard_pending_state(path)
+    assert not incremental.promote_state(path)
+    assert incremental.load_state(path)["rows_seen"] == 500
+
+    incremental.save_state(full_fit(data.iloc[:600]), incremental.pending_path(path))
+    assert incremental.promote_state(path)
+    assert incremental.load_state(path)["rows_seen"] == 600
+    assert incremental.load_state(incremental.pending_path(path)) is None
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+import requests
+
+from src import inference_client
+from src.inference_client import PAYLOAD_FIELDS, InferenceClient
+
+VALUES = [54, 1, 2, 130, 246, 0, 1, 150, 0, 1.0, 2]
+
+
+def response(status, body):
+    r = requests.Response()
+    r.status_code, r._content, r.url = status, json.dumps(body).encode(), "http://api/predict"
+    return r
+
+
+class Service:
+    """Replaces the client's session.post; `reply` is a Response or an exception to raise"""
+
+    def __init__(self, reply):
+        self.reply, self.calls = reply, []
+
+    def __call__(self, url, json, timeout):
+        self.calls.append(json)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+@pytest.fixture
+def client():
+    client = InferenceClient("http://api/", timeout=0.5, fallback=lambda values: (0, 0.25), retry_after=60)
+    yield client
+    client.close()
+
+
+def test_scores_remotely(client, monkeypatch):
+    service = Service(response(200, {"prediction": 1, "probability": 0.8123, "probability_exact": 0.81234567}))
+    monkeypatch.setattr(client.session, "post", service)
+    assert client.predict(VALUES) == (1, 0.81234567, "remote")
+    assert service.calls == [dict(zip(PAYLOAD_FIELDS, VALUES))]
+    assert client.stats == {"remote": 1, "fallback": 0, "errors": 0}
+
+
+@pytest.mark.parametrize("failure", [requests.ConnectionError("refused"), requests.Timeout("slow"),
+                                     response(503, {"detail": "Model not loaded"})])
+def test_falls_back_while_the_service_is_down(client, monkeypatch, failure):
+    service = Service(failure)
+    monkeypatch.setattr(client.session, "post", service)
+    assert client.predict(VALUES) == (0, 0.25, "local")
+    # Within retry_after the service isn't asked again
+    assert client.predict(VALUES) == (0, 0.25, "local")
+    assert len(service.calls) == 1
+    assert client.stats == {"remote": 0, "fallback": 2, "errors": 1}
+
+
+def test_retries_the_service_after_the_backoff(client, monkeypatch):
+    monkeypatch.setattr(client.session, "post", Service(requests.ConnectionError("refused")))
+    client.predict(VALUES)
+    monkeypatch.setattr(client.session, "post", Service(response(200, {"prediction": 0, "probability": 0.1})))
+    monkeypatch.setattr(inference_client.time, "monotonic", lambda: client._down_until + 1)
+    assert client.predict(VALUES) == (0, 0.1, "remote")
+
+
+def test_bad_requests_are_raised_not_masked(client, monkeypatch):
+    monkeypatch.setattr(client.session, "post", Service(response(422, {"detail": "bad row"})))
+    with pytest.raises(requests.HTTPError):
+        client.predict(VALUES)
+    assert client.stats["fallback"] == 0
+
+
+def test_without_fallback_the_error_surfaces(monkeypatch):
+    client = InferenceClient("http://api", retry_after=60)
+    monkeypatch.setattr(client.session, "post", Service(requests.ConnectionError("refused")))
+    with pytest.raises(requests.ConnectionError):
+        client.predict(VALUES)
+    with pytest.raises(RuntimeError):
+        client.predict(VALUES)
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setattr(inference_client, "INFERENCE_URL", "")
+    assert InferenceClient.from_env() is None
+    monkeypatch.setattr(inference_client, "INFERENCE_URL", "http://api:8000")
+    assert InferenceClient.from_env().url == "http://api:8000/predict"
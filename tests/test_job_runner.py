@@ -0,0 +1,78 @@
+import os
+import time
+
+import pytest
+
+from src import job_runner
+from src.job_runner import JobRunner
+
+# Stand-in jobs: entry points the spawned worker can import without any arguments
+JOBS = {
+    "pid":   {"target": "os:getpid",    "timeout": 30, "steps": []},
+    "hang":  {"target": "signal:pause", "timeout": 1,  "steps": []},
+    "wait":  {"target": "signal:pause", "timeout": 30, "steps": []},
+    "error": {"target": "os:no_such_function", "timeout": 30, "steps": []},
+}
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_runner, "JOBS", JOBS)
+    monkeypatch.setattr(job_runner, "WARM_IMPORTS", [])
+    runner = JobRunner(str(tmp_path))
+    yield runner
+    runner.close()
+
+
+def wait(runner, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while runner.status(job_id)["status"] in ("queued", "running"):
+        assert time.time() < deadline, f"{job_id} still {runner.status(job_id)['status']}"
+        time.sleep(0.05)
+    return runner.status(job_id)
+
+
+def test_job_runs_in_the_worker_process(runner):
+    job_id, accepted = runner.submit("pid")
+    assert accepted
+    job = wait(runner, job_id)
+    assert (job["status"], job["progress"]) == ("succeeded", 1.0)
+    assert job["result"] not in (None, os.getpid())
+    assert runner.latest("pid") == job_id
+
+
+def test_active_job_of_the_same_kind_is_not_queued_twice(runner):
+    first, _ = runner.submit("hang")
+    assert runner.submit("hang") == (first, False)
+    with pytest.raises(ValueError):
+        runner.submit("backup")
+
+
+def test_timeout_kills_and_replaces_the_worker(runner):
+    worker  = runner._process
+    job_id, _ = runner.submit("hang")
+    job = wait(runner, job_id)
+    assert job["status"] == "timeout"
+    assert "exceeded its 1s timeout" in runner.log(job_id)
+    assert not worker.is_alive()
+    # The replacement worker picks up the next job
+    assert wait(runner, runner.submit("pid")[0])["result"] == runner._process.pid
+
+
+def test_killed_worker_fails_its_job_and_is_replaced(runner):
+    job_id, _ = runner.submit("wait")
+    while runner.status(job_id)["status"] == "queued":
+        time.sleep(0.05)
+    runner._process.kill()
+    job = wait(runner, job_id)
+    assert job["status"] == "failed"
+    assert "exited unexpectedly" in runner.log(job_id)
+    assert wait(runner, runner.submit("pid")[0])["status"] == "succeeded"
+
+
+def test_exception_is_logged_and_the_worker_survives(runner):
+    worker = runner._process
+    job = wait(runner, runner.submit("error")[0])
+    assert job["status"] == "failed"
+    assert "AttributeError" in runner.log(job["id"])
+    assert runner._process is worker and worker.is_alive()
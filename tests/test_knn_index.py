@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+
+from src import knn_index
+from src.knn_index import IVFIndex, build_knn_index, compile_knn
+
+
+@pytest.fixture
+def no_exact_cutoff(monkeypatch):
+    """Let compile_knn use indexes as small as the test data"""
+    monkeypatch.setattr(knn_index, "EXACT_BELOW", 0)
+
+
+@pytest.fixture(scope="module")
+def reference(heart):
+    # Duplicate rows would make the k-th neighbour a tie; keep one of each
+    rows = heart.drop_duplicates(subset=[c for c in heart.columns if c != "target"])
+    X = rows.drop("target", axis=1).to_numpy(dtype=np.float32)
+    X = (X - X.mean(axis=0)) / X.std(axis=0)
+    rng = np.random.default_rng(0)
+    queries = X[rng.choice(len(X), 50)] + rng.normal(0, 0.05, (50, X.shape[1])).astype(np.float32)
+    return X, rows["target"].to_numpy(), queries
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "manhattan"])
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+def test_probing_every_cell_matches_sklearn(reference, tmp_path, no_exact_cutoff, metric, weights):
+    X, y, queries = reference
+    model = KNeighborsClassifier(n_neighbors=7, metric=metric, weights=weights).fit(X, y)
+    index = build_knn_index(model, tmp_path)
+    compiled = compile_knn(model, tmp_path, n_probe=len(index.centroids))
+    np.testing.assert_allclose(compiled.predict_proba(queries), model.predict_proba(queries), atol=1e-9)
+
+
+def test_search_widens_until_k_rows(reference):
+    X, y, queries = reference
+    index = IVFIndex.build(X, y, n_lists=len(X) // 2)   # about two rows per cell
+    for q in queries:
+        idx, dist = index.search(q, 15, n_probe=1)
+        assert len(idx) == 15
+        assert (np.diff(dist) >= 0).all()
+
+
+def test_saved_index_loads_memory_mapped(reference, tmp_path):
+    X, y, queries = reference
+    built = IVFIndex.build(X, y, "manhattan", n_lists=16)
+    built.save(tmp_path)
+    loaded = IVFIndex.load(tmp_path)
+    assert isinstance(loaded.X, np.memmap)
+    assert loaded.metric == "manhattan"
+    for q in queries[:10]:
+        np.testing.assert_array_equal(loaded.search(q, 5)[0], built.search(q, 5)[0])
+
+
+def test_stale_or_missing_index_is_not_used(reference, tmp_path, no_exact_cutoff):
+    X, y, _ = reference
+    assert compile_knn(KNeighborsClassifier().fit(X, y), tmp_path) is None
+    build_knn_index(KNeighborsClassifier().fit(X, y), tmp_path)
+    assert compile_knn(KNeighborsClassifier().fit(X[:-1], y[:-1]), tmp_path) is None
+    assert compile_knn(KNeighborsClassifier(metric="manhattan").fit(X, y), tmp_path) is None
+
+
+def test_small_index_is_left_to_sklearn(reference, tmp_path):
+    X, y, _ = reference
+    model = KNeighborsClassifier().fit(X, y)
+    build_knn_index(model, tmp_path)
+    assert compile_knn(model, tmp_path) is None
@@ -0,0 +1,49 @@
+from src.metrics import Counter, Gauge, Histogram, render
+
+
+def test_counter_and_gauge_exposition():
+    requests = Counter("requests_total", "Requests", ["route", "status"])
+    requests.inc(route="/predict", status=200)
+    requests.inc(2, route="/predict", status=200)
+    loaded = Gauge("model_info", "Served model", ["version"])
+    loaded.set(1, version='v"1"\n')
+    assert render([requests, loaded]).splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/predict",status="200"} 3',
+        "# HELP model_info Served model",
+        "# TYPE model_info gauge",
+        'model_info{version="v\\"1\\"\\n"} 1',
+    ]
+    loaded.reset()
+    assert loaded.render() == ["# HELP model_info Served model", "# TYPE model_info gauge"]
+
+
+def test_histogram_buckets_are_cumulative():
+    latency = Histogram("stage_seconds", "Stage latency", ["stage"], buckets=[0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, stage="scale")
+    lines = latency.render()
+    assert lines[1] == "# TYPE stage_seconds histogram"
+    assert lines[2:] == [
+        'stage_seconds_bucket{stage="scale",le="0.1"} 2',
+        'stage_seconds_bucket{stage="scale",le="1.0"} 3',
+        'stage_seconds_bucket{stage="scale",le="+Inf"} 4',
+        'stage_seconds_sum{stage="scale"} 3.65',
+        'stage_seconds_count{stage="scale"} 4',
+    ]
+
+
+def test_histogram_snapshot_and_timer():
+    batch = Histogram("batch_size", "Batch size", buckets=[1, 4])
+    assert batch.snapshot() == {"buckets": {"1": 0, "4": 0, "+Inf": 0}, "count": 0, "mean": 0.0}
+    for size in (1, 3, 8):
+        batch.observe(size)
+    assert batch.snapshot() == {"buckets": {"1": 1, "4": 1, "+Inf": 1}, "count": 3, "mean": 4.0}
+    with batch.time():
+        pass
+    assert batch.snapshot()["count"] == 4
+
+
+def test_render_ends_with_newline():
+    assert render([Counter("empty_total", "Nothing yet")]).endswith("counter\n")
@@ -0,0 +1,70 @@
+import os
+import pickle
+
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from src import model_cache
+
+
+@pytest.fixture
+def scalers(tmp_path, monkeypatch):
+    """Scaler pickles in a temporary models/ directory, as train.py writes them"""
+    files = {}
+    for name, scaler in [("standard_scaler.pkl", StandardScaler()), ("minmax_scaler.pkl", MinMaxScaler())]:
+        files[name] = str(tmp_path / name)
+        with open(files[name], "wb") as f:
+            pickle.dump(scaler.fit([[0.0], [1.0]]), f)
+    monkeypatch.setattr(model_cache, "SCALER_FILES", files)
+    return files
+
+
+@pytest.fixture(scope="module")
+def model(heart):
+    return LogisticRegression(max_iter=1000).fit(heart.drop("target", axis=1), heart["target"])
+
+
+def test_round_trip(tmp_path, scalers, model):
+    cache_dir = str(tmp_path / "cache")
+    target, manifest = model_cache.write_cache(model, "3", "registry", cache_dir, {"accuracy": 0.9})
+    assert open(os.path.join(cache_dir, "CURRENT")).read() == os.path.basename(target)
+    assert os.path.basename(target) == f"3-{manifest['hash'][:12]}"
+
+    cached, std, mm, loaded = model_cache.load_cached(cache_dir)
+    assert loaded == manifest
+    assert loaded["metrics"] == {"accuracy": 0.9}
+    assert (cached.coef_ == model.coef_).all()
+    assert isinstance(std, StandardScaler) and isinstance(mm, MinMaxScaler)
+
+
+def test_new_version_moves_the_pointer(tmp_path, scalers, model):
+    cache_dir = str(tmp_path / "cache")
+    model_cache.write_cache(model, "local:mlruns/1/model.pkl@17", "mlruns", cache_dir)
+    target, _ = model_cache.write_cache(model, "4", "registry", cache_dir)
+    assert model_cache.load_cached(cache_dir)[-1]["version"] == "4"
+    assert open(os.path.join(cache_dir, "CURRENT")).read() == os.path.basename(target)
+    assert len([e for e in os.listdir(cache_dir) if e != "CURRENT"]) == 2
+
+
+def test_tampered_entry_fails_verification(tmp_path, scalers, model):
+    cache_dir = str(tmp_path / "cache")
+    target, _ = model_cache.write_cache(model, "3", "registry", cache_dir)
+    with open(os.path.join(target, "minmax_scaler.pkl"), "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError, match="minmax_scaler.pkl"):
+        model_cache.load_cached(cache_dir)
+
+
+def test_corrupt_cache_is_re_resolved(tmp_path, scalers, model, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    target, _ = model_cache.write_cache(model, "3", "registry", cache_dir)
+    with open(os.path.join(target, "model.pkl"), "wb") as f:
+        f.write(b"not a pickle")
+    monkeypatch.setattr(model_cache, "resolve", lambda cache_dir: ("resolved", None, None, {"version": "4"}))
+    assert model_cache.load_production(cache_dir)[0] == "resolved"
+
+
+def test_empty_cache_is_resolved(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_cache, "resolve", lambda cache_dir: ("resolved", None, None, {"version": "4"}))
+    assert model_cache.load_production(str(tmp_path / "missing"))[0] == "resolved"
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from src.model_router import MODEL_FILES, FeatureAdapter, ModelRouter
+from src.preprocessing import FEATURES, MM_COLS, STD_COLS, FusedPreprocessor
+
+
+@pytest.fixture(scope="module")
+def router():
+    router = ModelRouter()
+    yield router
+    router.close()
+
+
+@pytest.fixture(scope="module")
+def X(heart):
+    return heart[FEATURES].to_numpy(dtype=np.float64)[:200]
+
+
+def test_fan_out_matches_each_model(router, X):
+    outputs = router.fan_out(X)
+    assert list(outputs) == list(MODEL_FILES)
+    for name, proba in outputs.items():
+        np.testing.assert_allclose(proba, router.predict_proba(name, X))
+        assert ((proba >= 0) & (proba <= 1)).all()
+
+
+def test_ensemble_is_the_mean_probability(router, X):
+    names   = ["logistic_regression", "random_forest"]
+    outputs = router.fan_out(X, names)
+    np.testing.assert_allclose(router.ensemble(X, names), (outputs[names[0]] + outputs[names[1]]) / 2)
+    np.testing.assert_allclose(router.ensemble(None, outputs=outputs), router.ensemble(X, names))
+
+
+def test_compiled_scorers_match_sklearn(X):
+    fast, slow = ModelRouter(fast=True), ModelRouter(fast=False)
+    try:
+        for name in MODEL_FILES:
+            np.testing.assert_allclose(fast.predict_proba(name, X), slow.predict_proba(name, X), atol=1e-9)
+    finally:
+        fast.close()
+        slow.close()
+
+
+def test_unknown_models(router, X):
+    with pytest.raises(KeyError):
+        router.predict_proba("xgboost", X)
+    with pytest.raises(KeyError):
+        router.fan_out(X, ["svm", "xgboost"])
+    with pytest.raises(ValueError):
+        ModelRouter(["xgboost"])
+
+
+def test_adapter_one_hot_and_cholesterol_imputation(heart):
+    std, mm = StandardScaler().fit(heart[STD_COLS]), MinMaxScaler().fit(heart[MM_COLS])
+    adapter = FeatureAdapter(["cholesterol", "chest pain type_4", "sex_1"], FusedPreprocessor(std, mm), 240.0)
+    rows    = np.array([[54, 1, 4, 130, 0, 0, 1, 150, 0, 1.0, 2],
+                        [54, 0, 2, 130, 200, 0, 1, 150, 0, 1.0, 2]], dtype=np.float64)
+    out = adapter.transform(rows)
+    np.testing.assert_allclose(out[:, 0], std.transform(
+        np.array([[130, 240, 150, 54], [130, 200, 150, 54]], dtype=np.float64))[:, 1])
+    np.testing.assert_array_equal(out[:, 1:], [[1, 1], [0, 0]])
+    with pytest.raises(ValueError):
+        FeatureAdapter(["thal_3"], FusedPreprocessor(), 240.0)
@@ -0,0 +1,107 @@
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src import model_watcher
+from src.model_watcher import ModelHolder, ModelWatcher, ServingModel
+
+
+@pytest.fixture(scope="module")
+def model(heart):
+    return LogisticRegression(max_iter=1000).fit(heart.drop("target", axis=1), heart["target"])
+
+
+@pytest.fixture
+def registry(monkeypatch, model):
+    """Stand-in registry: tests set `latest`, every load is recorded"""
+    state = {"latest": ("1", "registry"), "loads": []}
+
+    def load_version(version, source, fast=True):
+        state["loads"].append(version)
+        return ServingModel(model, version, source, fast=fast)
+
+    monkeypatch.setattr(model_watcher, "latest_version", lambda: state["latest"])
+    monkeypatch.setattr(model_watcher, "load_version", load_version)
+    return state
+
+
+def test_swaps_in_a_newly_promoted_version(registry, model):
+    holder  = ModelHolder(ServingModel(model, "1", "registry"))
+    swapped = []
+    watcher = ModelWatcher(holder, on_swap=swapped.append)
+
+    assert not watcher.check_once()
+    assert registry["loads"] == []
+
+    registry["latest"] = ("2", "registry")
+    assert watcher.check_once()
+    assert holder.current.version == "2"
+    assert [s.version for s in swapped] == ["2"]
+    assert watcher.status()["swaps"] == 1
+
+
+def test_loads_the_first_version_into_an_empty_holder(registry):
+    holder = ModelHolder()
+    assert ModelWatcher(holder).check_once()
+    assert holder.current.version == "1"
+
+
+def test_nothing_promoted_keeps_the_current_model(registry, model):
+    registry["latest"] = (None, None)
+    serving = ServingModel(model, "1", "registry")
+    holder  = ModelHolder(serving)
+    assert not ModelWatcher(holder).check_once()
+    assert holder.current is serving
+
+
+def test_swap_returns_the_previous_model(model):
+    old, new = ServingModel(model, "1", "registry"), ServingModel(model, "2", "registry")
+    holder   = ModelHolder(old)
+    assert holder.swap(new) is old
+    assert holder.current is new
+
+
+def test_failed_poll_is_reported_and_retried(monkeypatch, model):
+    def unreachable():
+        raise RuntimeError("registry down")
+
+    monkeypatch.setattr(model_watcher, "latest_version", unreachable)
+    watcher = ModelWatcher(ModelHolder(ServingModel(model, "1", "registry")), interval=0.01)
+    watcher.start()
+    try:
+        for _ in range(200):
+            if watcher.last_error:
+                break
+            watcher._stopped.wait(0.01)
+        assert watcher.status()["last_error"] == "registry down"
+    finally:
+        watcher.stop()
+
+
+def _logged_model(root, meta=None, mlmodel=None):
+    artifacts = root / "mlruns" / "1" / "models" / "m-abc" / "artifacts"
+    artifacts.mkdir(parents=True)
+    (artifacts / "model.pkl").write_bytes(b"")
+    if meta:
+        (artifacts.parent / "meta.yaml").write_text(meta)
+    if mlmodel:
+        (artifacts / "MLmodel").write_text(mlmodel)
+    return f"local:{artifacts.relative_to(root) / 'model.pkl'}@1"
+
+
+@pytest.mark.parametrize("meta, mlmodel", [
+    ("model_id: m-abc\nsource_run_id: r1\n", "run_id: stale\n"),
+    (None, "flavors: {}\nrun_id: r1\n"),
+])
+def test_mlruns_metrics_come_from_the_source_run(tmp_path, monkeypatch, meta, mlmodel):
+    monkeypatch.chdir(tmp_path)
+    version = _logged_model(tmp_path, meta, mlmodel)
+    metrics = tmp_path / "mlruns" / "1" / "r1" / "metrics"
+    metrics.mkdir(parents=True)
+    (metrics / "accuracy").write_text("1700000000 0.8 0\n1700000001 0.85 0\n")
+    (metrics / "f1_score").write_text("1700000000 0.9 0\n")
+    assert model_watcher.model_metrics(version, "mlruns") == {"accuracy": 0.85, "f1_score": 0.9}
+
+
+def test_mlruns_model_without_a_run_has_no_metrics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert model_watcher.model_metrics(_logged_model(tmp_path, mlmodel="flavors: {}\n"), "mlruns") == {}
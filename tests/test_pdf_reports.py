@@ -0,0 +1,65 @@
+import io
+import re
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from src.pdf_reports import ReportRenderer, build_template, render_report, report_name
+
+RECORD = {"Date": "2026-03-01 09:30", "Patient Name": "Ana Lima", "Patient ID": "P-17", "Doctor": "Dr. Rao",
+          "Age": 54, "Sex": "Male", "Cholesterol": 246, "BP": 130, "Max HR": 150,
+          "Result": "Heart Disease", "Probability": 0.8123, "Risk": "High"}
+
+
+def stable(pdf):
+    """PDF bytes without the creation timestamp"""
+    return re.sub(rb"/CreationDate \(D:\d+\)", b"", pdf)
+
+
+def test_rendering_leaves_the_template_untouched():
+    template = build_template()
+    before   = (dict(template.pages), template.page, template.x, template.y, template.font_style)
+    first    = render_report(RECORD, template)
+    render_report({**RECORD, "Patient Name": "Someone Else", "Result": "No Disease"}, template)
+    assert (dict(template.pages), template.page, template.x, template.y, template.font_style) == before
+    assert stable(render_report(RECORD, template)) == stable(first)
+
+
+def test_template_copy_matches_a_fresh_page():
+    assert stable(render_report(RECORD)) == stable(render_report(RECORD, build_template()))
+
+
+def test_report_name_is_file_safe():
+    assert report_name(RECORD) == "report_P-17_2026-03-01_0930.pdf"
+    assert report_name({"Patient ID": "a/b c", "Date": ""}) == "report_a_b_c_.pdf"
+
+
+@pytest.fixture(scope="module")
+def renderer():
+    renderer = ReportRenderer(workers=2)
+    yield renderer
+    renderer.close()
+
+
+def test_worker_render_matches_in_process(renderer):
+    assert stable(renderer.render(RECORD).result(timeout=60)) == stable(render_report(RECORD))
+
+
+def test_export_zip_keeps_every_report(renderer):
+    records = [RECORD, RECORD, {**RECORD, "Patient ID": "P-18"}]
+    out     = io.BytesIO()
+    stats   = renderer.export_zip(records, out)
+    assert stats["pages"] == 3
+    with zipfile.ZipFile(out) as zf:
+        assert sorted(zf.namelist()) == ["report_P-17_2026-03-01_0930.pdf", "report_P-17_2026-03-01_0930_2.pdf",
+                                         "report_P-18_2026-03-01_0930.pdf"]
+        assert all(zf.read(name).startswith(b"%PDF") for name in zf.namelist())
+
+
+def test_typed_history_values_print_like_the_csv_ones():
+    typed = {**RECORD, "Date": datetime(2026, 3, 1, 9, 30), "Age": 54.0, "Cholesterol": 246.0, "BP": 130.0,
+             "Max HR": 150.0, "Probability": 0.8123, "Risk": float("nan")}
+    as_text = {**RECORD, "Probability": "81.2%", "Risk": ""}
+    assert stable(render_report(typed)) == stable(render_report(as_text))
+    assert report_name(typed) == report_name(RECORD)
@@ -0,0 +1,28 @@
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from src.preprocessing import FEATURES, MM_COLS, STD_COLS, FusedPreprocessor
+
+
+def test_matches_the_two_scalers(heart):
+    std  = StandardScaler().fit(heart[STD_COLS])
+    mm   = MinMaxScaler().fit(heart[MM_COLS])
+    X    = heart[FEATURES].copy()
+    X[STD_COLS] = std.transform(heart[STD_COLS])
+    X[MM_COLS]  = mm.transform(heart[MM_COLS])
+
+    fused = FusedPreprocessor(std, mm).transform(heart[FEATURES].to_numpy(dtype=np.float64, copy=True))
+    np.testing.assert_allclose(fused, X.to_numpy(), atol=1e-12)
+
+
+def test_row_matches_transform_and_reuses_the_buffer(heart):
+    pre  = FusedPreprocessor(StandardScaler().fit(heart[STD_COLS]), MinMaxScaler().fit(heart[MM_COLS]))
+    X    = heart[FEATURES].to_numpy(dtype=np.float64)
+    full = pre.transform(X[:2].copy())
+    np.testing.assert_array_equal(pre.row(X[1])[0], full[1])
+    assert np.shares_memory(pre.row(X[0]), pre.row(X[1]))
+
+
+def test_without_scalers_is_identity(heart):
+    X = heart[FEATURES].to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(FusedPreprocessor().transform(X.copy()), X)
@@ -0,0 +1,86 @@
+import pytest
+
+from src import result_cache
+from src.result_cache import ResultCache, SQLiteResultBackend
+
+
+class Clock:
+    """Stands in for time.monotonic/time.time so TTLs can expire without sleeping"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "monotonic", clock)
+    monkeypatch.setattr(result_cache.time, "time", clock)
+    return clock
+
+
+def test_keys_separate_model_versions():
+    values = [54, 1, 2, 130, 246, 0, 1, 150, 0, 1.0, 2]
+    assert ResultCache.make_key("1", values) == ResultCache.make_key("1", [float(v) for v in values])
+    assert ResultCache.make_key("1", values) != ResultCache.make_key("2", values)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResultCache(max_size=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(max_size=10, ttl=60)
+    cache.put("a", 1)
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_shared_backend_fills_other_workers(tmp_path, clock):
+    path    = str(tmp_path / "results.db")
+    writer  = ResultCache(ttl=60, backend=SQLiteResultBackend(path, ttl=60))
+    reader  = ResultCache(ttl=60, backend=SQLiteResultBackend(path, ttl=60))
+    writer.put("a", {"prediction": 1})
+    assert reader.get("a") == {"prediction": 1}
+    assert reader.get("a") == {"prediction": 1}
+    assert (reader.stats()["shared_hits"], reader.stats()["hits"]) == (1, 1)
+
+
+def test_backend_expiry_and_purge(tmp_path, clock):
+    backend = SQLiteResultBackend(str(tmp_path / "results.db"), ttl=60)
+    backend.put("a", 1)
+    clock.now += 61
+    assert backend.get("a") is None
+    backend.purge()
+    assert backend._conn().execute("SELECT COUNT(*) FROM results").fetchone() == (0,)
+
+
+def test_backend_errors_are_misses(tmp_path):
+    backend = SQLiteResultBackend(str(tmp_path / "results.db"))
+    backend._conn().execute("DROP TABLE results")
+    backend.put("a", 1)
+    assert backend.get("a") is None
+
+
+def test_cache_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("RESULT_CACHE_SIZE", "0")
+    assert result_cache.cache_from_env() is None
+    monkeypatch.setenv("RESULT_CACHE_SIZE", "5")
+    monkeypatch.setenv("RESULT_CACHE_SHARED", str(tmp_path / "shared.db"))
+    cache = result_cache.cache_from_env()
+    assert cache.max_size == 5
+    assert cache.stats()["shared_backend"] == str(tmp_path / "shared.db")
@@ -0,0 +1,64 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from src import score
+from src.forest_scorer import compile_forest
+from src.preprocessing import FEATURES, MM_COLS, STD_COLS, FusedPreprocessor
+
+
+@pytest.fixture(autouse=True)
+def model(heart, monkeypatch):
+    """Score with a forest fitted here instead of loading the production model"""
+    std, mm = StandardScaler().fit(heart[STD_COLS]), MinMaxScaler().fit(heart[MM_COLS])
+    X = heart[FEATURES].copy()
+    X[STD_COLS], X[MM_COLS] = std.transform(heart[STD_COLS]), mm.transform(heart[MM_COLS])
+    forest = RandomForestClassifier(n_estimators=20, max_depth=5, random_state=0).fit(X, heart["target"])
+    monkeypatch.setattr(score, "_scorer", compile_forest(forest))
+    monkeypatch.setattr(score, "_preprocessor", FusedPreprocessor(std, mm))
+    return forest, X
+
+
+def test_score_chunk_adds_prediction_columns(heart, model):
+    forest, X = model
+    scored    = score.score_chunk(heart)
+    assert list(scored.columns) == list(heart.columns) + ["prediction", "probability", "risk_level"]
+    assert (scored["prediction"] == forest.predict(X)).all()
+    np.testing.assert_allclose(scored["probability"], forest.predict_proba(X)[:, 1].round(4), atol=1e-4)
+    assert set(scored["risk_level"]) <= {"Low", "Medium", "High"}
+
+
+def test_missing_columns_are_rejected(heart):
+    with pytest.raises(ValueError, match="oldpeak"):
+        score.score_chunk(heart.drop(columns="oldpeak"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunked_csv_matches_one_pass(heart, tmp_path, workers):
+    source, output = tmp_path / "in.csv", tmp_path / "out.csv"
+    heart.to_csv(source, index=False)
+    assert score.run(str(source), str(output), chunksize=100, workers=workers) == len(heart)
+    expected = score.score_chunk(heart)
+    scored   = pd.read_csv(output)
+    assert (scored["prediction"] == expected["prediction"]).all()
+    np.testing.assert_allclose(scored["probability"], expected["probability"])
+
+
+def test_parquet_round_trip(heart, tmp_path):
+    pytest.importorskip("pyarrow")
+    source, output = tmp_path / "in.parquet", tmp_path / "out.parquet"
+    heart.to_parquet(source, index=False)
+    assert score.run(str(source), str(output), chunksize=250) == len(heart)
+    scored = pd.read_parquet(output)
+    assert (scored["prediction"].to_numpy() == score.score_chunk(heart)["prediction"].to_numpy()).all()
+
+
+def test_parquet_without_pyarrow_fails_up_front(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)   # import pyarrow now raises ImportError
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        score.run(str(tmp_path / "in.csv"), str(tmp_path / "out.parquet"))
+    assert not (tmp_path / "out.parquet").exists()
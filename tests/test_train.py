@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src import incremental, retrain_pipeline
+from src.train import cross_validate, train_model
+
+PARAMS = {"n_estimators": 20, "max_depth": 5, "random_state": 42}
+
+
+def test_cross_validate_reports_every_fold(heart):
+    X, y = heart.drop(columns="target"), heart["target"]
+    cv   = cross_validate(X, y, PARAMS, folds=4, n_jobs=2)
+    assert len(cv["fold_accuracy"]) == len(cv["fold_fit_seconds"]) == 4
+    assert cv["mean"] == pytest.approx(np.mean(cv["fold_accuracy"]))
+    assert cv["std"] == pytest.approx(np.std(cv["fold_accuracy"]))
+    assert 0.7 < cv["mean"] <= 1.0
+
+
+def test_folds_do_not_depend_on_core_count(heart):
+    X, y = heart.drop(columns="target"), heart["target"]
+    np.testing.assert_array_equal(cross_validate(X, y, PARAMS, folds=3, n_jobs=1)["fold_accuracy"],
+                                  cross_validate(X, y, PARAMS, folds=3, n_jobs=3)["fold_accuracy"])
+
+
+@pytest.mark.parametrize("kwargs", [{"n_jobs": 0}, {"mode": "partial"}])
+def test_bad_settings_fail_before_any_work(kwargs):
+    with pytest.raises(ValueError):
+        train_model(data_path="does/not/exist.csv", **kwargs)
+
+
+def test_zero_cores_from_the_environment_fails_in_train_model(monkeypatch):
+    from src import train
+    monkeypatch.setattr(train, "RETRAIN_N_JOBS", 0)   # what RETRAIN_N_JOBS=0 sets at import
+    with pytest.raises(ValueError, match="RETRAIN_N_JOBS"):
+        train.train_model(data_path="does/not/exist.csv")
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """run_pipeline with drift forced on and train_model returning `result`; records promotions"""
+    state = {"result": None, "promoted": [], "train_state": []}
+
+    class Client:
+        def get_latest_versions(self, name, stages):
+            return [SimpleNamespace(version="7")]
+
+    monkeypatch.setattr(retrain_pipeline, "check_drift", lambda **kwargs: True)
+    monkeypatch.setattr(retrain_pipeline, "train_model", lambda **kwargs: state["result"])
+    monkeypatch.setattr(retrain_pipeline, "MlflowClient", Client)
+    monkeypatch.setattr(retrain_pipeline, "promote_model", state["promoted"].append)
+    monkeypatch.setattr(incremental, "promote_state", lambda: state["train_state"].append("promoted") or True)
+    monkeypatch.setattr(incremental, "discard_pending_state", lambda: state["train_state"].append("discarded"))
+    return state
+
+
+@pytest.mark.parametrize("holdout, cv, promoted", [
+    (0.90, {"mean": 0.88, "std": 0.02}, True),
+    (0.90, {"mean": 0.84, "std": 0.02}, False),    # CV mean below the threshold
+    (0.84, {"mean": 0.90, "std": 0.02}, False),    # holdout below the threshold
+    (0.90, {"mean": 0.90, "std": 0.06}, False),    # folds too far apart
+    (0.85, {"mean": 0.85, "std": 0.05}, True),     # both bounds inclusive
+    (0.90, None, True),                            # incremental updates: holdout only
+    (0.84, None, False),
+])
+def test_promotion_gate(pipeline, holdout, cv, promoted):
+    pipeline["result"] = (None, holdout, cv)
+    retrain_pipeline.run_pipeline()
+    assert pipeline["promoted"] == (["7"] if promoted else [])
+    assert pipeline["train_state"] == (["promoted"] if promoted else ["discarded"])
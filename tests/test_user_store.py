@@ -0,0 +1,90 @@
+import json
+import threading
+
+import pytest
+
+from src.user_store import UserStore, hash_password
+
+ROUNDS = 4     # cheapest bcrypt cost; the tests only need real hashes
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "users.json")
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_register_and_authenticate(path):
+    store = UserStore(path, rounds=ROUNDS)
+    assert store.register("ann", "Ann", "secret") == (True, "Account created successfully")
+    assert store.register("ann", "Other", "x") == (False, "Username already exists")
+    assert store.authenticate("ann", "secret")["name"] == "Ann"
+    assert store.authenticate("ann", "wrong") is None
+    assert store.authenticate("nobody", "secret") is None
+    assert read(path)["ann"]["password"].startswith("$2b$04$")
+
+
+def test_plaintext_and_low_cost_passwords_are_rehashed_on_login(path):
+    with open(path, "w") as f:
+        json.dump({"ann": {"name": "Ann", "password": "secret"},
+                   "bob": {"name": "Bob", "password": hash_password("pw", ROUNDS)}}, f)
+    store = UserStore(path, rounds=5)
+    assert store.authenticate("ann", "wrong") is None
+    assert read(path)["ann"]["password"] == "secret"        # only a successful login upgrades
+
+    assert store.authenticate("ann", "secret") is not None
+    assert store.authenticate("bob", "pw") is not None
+    users = read(path)
+    assert users["ann"]["password"].startswith("$2b$05$")
+    assert users["bob"]["password"].startswith("$2b$05$")
+    assert store.authenticate("ann", "secret") is not None
+
+
+def test_hash_plaintext(path):
+    with open(path, "w") as f:
+        json.dump({"ann": {"name": "Ann", "password": "secret"},
+                   "bob": {"name": "Bob", "password": hash_password("pw", ROUNDS)}}, f)
+    store = UserStore(path, rounds=ROUNDS)
+    assert store.hash_plaintext() == 1
+    assert store.hash_plaintext() == 0
+    assert store.authenticate("ann", "secret") is not None
+
+
+def test_unchanged_users_are_not_rewritten(path, monkeypatch):
+    store = UserStore(path, rounds=ROUNDS)
+    store.register("ann", "Ann", "secret")
+    writes = []
+    monkeypatch.setattr(store, "_write", writes.append)
+    assert store.register("ann", "Other", "x")[0] is False
+    assert store.hash_plaintext() == 0
+    assert writes == []
+    store.register("bob", "Bob", "pw")
+    assert list(writes[0]) == ["ann", "bob"]
+
+
+def test_index_follows_changes_made_elsewhere(path):
+    store, other = UserStore(path, rounds=ROUNDS), UserStore(path, rounds=ROUNDS)
+    assert store.get("ann") is None
+    other.register("ann", "Ann", "secret")
+    assert store.get("ann")["name"] == "Ann"
+    assert len(store) == 1
+
+
+def test_concurrent_signups_are_all_kept(path):
+    stores = [UserStore(path, rounds=ROUNDS) for _ in range(4)]    # separate instances, like separate sessions
+
+    def signup(store, offset):
+        for i in range(offset, offset + 10):
+            store.register(f"user{i}", f"User {i}", "pw")
+
+    threads = [threading.Thread(target=signup, args=(store, n * 10)) for n, store in enumerate(stores)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(read(path)) == 40
+    assert len(UserStore(path, rounds=ROUNDS)) == 40